@@ -0,0 +1,280 @@
+'''
+各爬虫与报告加载阶段的离线基准测试。
+所有请求都打到本地回放服务器（benchmarks.fixture_server），不访问外网。
+每个用例在独立子进程、独立临时目录中运行，输出：
+    吞吐（条/秒）、峰值内存（RSS）、各阶段耗时（来自 crawler.metrics）
+并按 1× / 10× / 100× 合成放大条目数。
+
+用例：
+    arxiv / qbitai / 36kr / leiphone   RSS 抓取 -> 解析 -> 写 CSV 与列式存储
+    github                             三个时间维度的 Trending 抓取、解析、AI 过滤与写出
+    arxiv_export                       arXiv export API 分页抓取（cs.*，一个提交日期窗口）、去重与写出
+    x                                  推文分页拉取与输出（依赖 tweepy / wordcloud / matplotlib，缺失时跳过）
+    classify                           generate_daily_report.classify_entries_by_type 读取当天全部 CSV
+
+用法（在仓库根目录执行）：
+    python -m benchmarks.bench_crawlers                      # 全部用例，与基线比较
+    python -m benchmarks.bench_crawlers --scales 1,10 --only arxiv,github
+    python -m benchmarks.bench_crawlers --save-baseline      # 把本次结果保存为基线
+吞吐低于基线或峰值内存高于基线超过 --tolerance（默认 25%）时视为退化，退出码为 1。
+基线 benchmarks/baseline.json 随仓库提交，数值与录制的机器有关，换机器后先用 --save-baseline 重新录制。
+'''
+
+import argparse
+import json
+import os
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.fixture_server import start_server
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+FEEDS = ["arxiv", "qbitai", "36kr", "leiphone"]
+BENCHES = FEEDS + ["github", "arxiv_export", "x", "classify"]
+DEFAULT_SCALES = [1, 10, 100]
+TOLERANCE = 0.25
+
+ERROR_LINE_RE = re.compile(r"^[\w.]+(Error|Exception)\b")
+
+
+class Skipped(Exception):
+    """用例依赖缺失，跳过"""
+
+
+# === 子进程：运行单个用例 ===
+
+def run_feed(name, scale, base):
+    from crawler.pipeline import crawl_feeds
+    from crawler.sources import FEED_SOURCES
+
+    FEED_SOURCES[name]["url"] = f"{base}/feed/{name}?scale={scale}"
+    result = crawl_feeds([name], incremental=False)[name]
+    if isinstance(result, BaseException):
+        raise result
+    return result[1]
+
+
+def run_github(scale, base):
+    from crawler import github_trends, metrics
+
+    github_trends.trending_url = lambda since="daily", language="", spoken_language="en": \
+        f"{base}/trending?since={since}&scale={scale}"
+    data_by_trend = {since: github_trends.fetch_ai_trending(since) for since in github_trends.TRENDS}
+    github_trends.save_to_csv_md(data_by_trend, incremental=False)
+    return sum(item["value"] for item in metrics.summary()["counters"] if item["name"] == "items.parsed")
+
+
+def run_arxiv_export(scale, base):
+    from crawler import arxiv_export
+
+    arxiv_export.EXPORT_API_URL = f"{base}/api/query?scale={scale}"
+    # 回放服务器不需要遵守 arXiv 的请求间隔
+    arxiv_export.REQUEST_DELAY = 0.001
+    return arxiv_export.crawl(["cs.*"], "20250610", "20250610", incremental=False)
+
+
+def run_tweets(scale, base):
+    import requests
+
+    try:
+        import tweepy, wordcloud, matplotlib  # noqa: F401
+    except ImportError as e:
+        raise Skipped(f"缺少依赖：{e.name}")
+    from crawler import metrics, tweet
+
+    # tweepy 的请求地址写死为 api.twitter.com，这里改写到回放服务器
+    original = requests.Session.request
+
+    def request(self, method, url, *args, **kwargs):
+        if url.startswith("https://api.twitter.com"):
+            url = base + url[len("https://api.twitter.com"):]
+            kwargs["params"] = dict(kwargs.get("params") or {}, scale=scale)
+        return original(self, method, url, *args, **kwargs)
+
+    requests.Session.request = request
+    os.environ.setdefault("TWITTER_BEARER_TOKEN", "benchmark")
+    # 回放服务器每页 50 条，共 2N 页
+    tweet.MAX_TWEETS = 100 * scale
+    tweet.main()
+    return sum(item["value"] for item in metrics.summary()["counters"]
+               if item["name"] == "items.written" and item["source"] == "x")
+
+
+def prepare_inputs(scale, base):
+    """为 classify 用例准备当天的全部 CSV（不计时）"""
+    for name in FEEDS:
+        run_feed(name, scale, base)
+    run_github(scale, base)
+
+
+def run_classify():
+    from crawler import metrics
+    import generate_daily_report as report
+
+    files = report.find_csv_files(report.GENERATE_DOCS_DIR, report.today_str)
+    start = time.perf_counter()
+    with metrics.span("classify"):
+        entries = report.classify_entries_by_type(files)
+    # 只计 classify_entries_by_type 本身，不含导入 generate_daily_report 的耗时
+    return sum(len(rows) for rows in entries), time.perf_counter() - start
+
+
+def worker(bench, scale, base):
+    from crawler import metrics
+
+    if bench == "classify":
+        # 准备数据放在单独的子进程中，避免计入本进程的峰值内存
+        subprocess.run([sys.executable, "-m", "benchmarks.bench_crawlers", "--prepare",
+                        "--scales", str(scale), "--base", base], check=True, stdout=subprocess.DEVNULL)
+    metrics.reset()
+    start = time.perf_counter()
+    if bench in FEEDS:
+        items = run_feed(bench, scale, base)
+    elif bench == "github":
+        items = run_github(scale, base)
+    elif bench == "arxiv_export":
+        items = run_arxiv_export(scale, base)
+    elif bench == "x":
+        items = run_tweets(scale, base)
+    else:
+        items, seconds = run_classify()
+    if bench != "classify":
+        seconds = time.perf_counter() - start
+
+    stages = {}
+    for span in metrics.summary()["spans"]:
+        key = f"{span['stage']}[{span['source']}]" if span["source"] else span["stage"]
+        stages[key] = span["total_seconds"]
+    return {
+        "items": items,
+        "seconds": round(seconds, 4),
+        "items_per_sec": round(items / seconds, 1) if seconds else 0.0,
+        # Linux 上 ru_maxrss 的单位为 KB
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "stages": stages,
+    }
+
+
+# === 主进程：调度、汇总与基线比较 ===
+
+def run_case(bench, scale, base):
+    """在独立的临时目录和子进程中运行一个用例，返回结果字典"""
+    with tempfile.TemporaryDirectory(prefix=f"bench_{bench}_") as workdir:
+        env = dict(os.environ, PYTHONPATH=REPO_ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+        proc = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_crawlers", "--worker", bench,
+             "--scales", str(scale), "--base", base],
+            cwd=workdir, env=env, capture_output=True, text=True,
+        )
+    lines = proc.stdout.strip().splitlines()
+    if proc.returncode != 0 or not lines:
+        errors = [line for line in proc.stderr.splitlines() if ERROR_LINE_RE.match(line)]
+        return {"error": (errors or proc.stderr.strip().splitlines() or ["未知错误"])[-1]}
+    return json.loads(lines[-1])
+
+
+def compare(results, baseline, tolerance):
+    """返回 {用例: 退化说明列表}"""
+    regressions = {}
+    for key, result in results.items():
+        base = baseline.get(key)
+        if not base or "items_per_sec" not in result or "items_per_sec" not in base:
+            continue
+        problems = []
+        if base["items_per_sec"] and result["items_per_sec"] < base["items_per_sec"] * (1 - tolerance):
+            problems.append(f"吞吐 {result['items_per_sec']:.0f} < 基线 {base['items_per_sec']:.0f} 条/s")
+        if base["peak_rss_mb"] and result["peak_rss_mb"] > base["peak_rss_mb"] * (1 + tolerance):
+            problems.append(f"峰值内存 {result['peak_rss_mb']:.0f} > 基线 {base['peak_rss_mb']:.0f} MB")
+        if problems:
+            regressions[key] = problems
+    return regressions
+
+
+def print_result(key, result, regressions, baseline):
+    if "error" in result:
+        print(f"  ❌ {key:<16} 失败：{result['error']}")
+        return
+    if "skipped" in result:
+        print(f"  ⏭️ {key:<16} 跳过：{result['skipped']}")
+        return
+    mark = "❌" if key in regressions else ("✅" if key in baseline else "🆕")
+    slowest = sorted(result["stages"].items(), key=lambda item: item[1], reverse=True)[:3]
+    stages = "，".join(f"{stage} {seconds * 1000:.0f}ms" for stage, seconds in slowest)
+    print(f"  {mark} {key:<16} {result['items']:>7} 条 {result['seconds']:7.2f}s "
+          f"{result['items_per_sec']:9.0f} 条/s {result['peak_rss_mb']:7.1f} MB  {stages}")
+    for problem in regressions.get(key, []):
+        print(f"       ↳ {problem}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", default=",".join(map(str, DEFAULT_SCALES)))
+    parser.add_argument("--only", default="", help=f"逗号分隔的用例名，可选：{','.join(BENCHES)}")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--output", help="把本次结果另存为 JSON")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--prepare", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--base", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    scales = [int(s) for s in args.scales.split(",") if s]
+
+    if args.prepare:
+        prepare_inputs(scales[0], args.base)
+        return 0
+    if args.worker:
+        try:
+            result = worker(args.worker, scales[0], args.base)
+        except Skipped as e:
+            result = {"skipped": str(e)}
+        print(json.dumps(result, ensure_ascii=False))
+        return 0
+
+    benches = [b for b in args.only.split(",") if b] or BENCHES
+    unknown = set(benches) - set(BENCHES)
+    if unknown:
+        parser.error(f"未知用例：{','.join(sorted(unknown))}")
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    server, base = start_server()
+    print(f"🧪 回放服务器 {base}，用例 {','.join(benches)}，放大倍数 {','.join(map(str, scales))}")
+    results = {}
+    try:
+        for scale in scales:
+            for bench in benches:
+                key = f"{bench}@{scale}x"
+                results[key] = run_case(bench, scale, base)
+                print_result(key, results[key], {}, {})
+    finally:
+        server.shutdown()
+
+    regressions = compare(results, baseline, args.tolerance)
+    if baseline:
+        print(f"\n📊 与基线 {args.baseline} 比较（容差 {args.tolerance:.0%}）：")
+        for key, result in results.items():
+            print_result(key, result, regressions, baseline)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    if args.save_baseline:
+        measured = {key: result for key, result in results.items() if "items_per_sec" in result}
+        baseline.update(measured)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=2, sort_keys=True)
+        print(f"💾 已更新基线：{args.baseline}（{len(measured)} 个用例）")
+    failed = [key for key, result in results.items() if "error" in result]
+    return 1 if regressions or failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,89 @@
+'''
+命令行启动耗时基准。
+每条命令在新的解释器中重复执行，取最短耗时，并扣除空解释器（python -c pass）的耗时：
+    python -m crawler --help 等命令的额外耗时必须不超过 STARTUP_TARGET_MS
+另外检查导入各入口模块时没有提前加载重量级依赖（HEAVY_MODULES）。
+
+用法（在仓库根目录执行）：
+    python -m benchmarks.bench_startup [--repeat 7] [--target 50]
+超出目标或提前加载了重量级依赖时退出码为 1。
+'''
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 命令行分发本身（不含子命令的实际工作）的额外启动耗时上限
+STARTUP_TARGET_MS = 50
+
+CLI_COMMANDS = [
+    ["-m", "crawler", "--help"],
+    ["-m", "crawler", "feeds", "--help"],
+    ["-m", "crawler", "sources"],
+]
+
+# 入口模块 -> 导入后不应出现在 sys.modules 中的依赖（只在真正执行对应阶段时才导入）
+HEAVY_MODULES = ["feedparser", "pyarrow", "tweepy", "wordcloud", "matplotlib", "nltk",
+                 "google.genai", "markdown2", "bs4", "lxml", "selectolax"]
+ENTRY_MODULES = ["crawler.__main__", "crawler.run_all", "crawler.tweet", "generate_daily_report"]
+
+
+def best_of(args, repeat):
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=REPO_ROOT, env=env,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def loaded_heavy(module):
+    """在新解释器中导入 module，返回被一并加载的重量级依赖"""
+    code = (
+        "import importlib, sys; importlib.import_module(%r); "
+        "print(','.join(m for m in %r if m in sys.modules))" % (module, HEAVY_MODULES)
+    )
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    proc = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, env=env,
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        return None
+    return [m for m in proc.stdout.strip().split(",") if m]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--target", type=float, default=STARTUP_TARGET_MS, help="额外启动耗时上限（毫秒）")
+    args = parser.parse_args(argv)
+
+    bare = best_of(["-c", "pass"], args.repeat)
+    print(f"⏱️ 空解释器 {bare:.0f} ms，目标：额外耗时 ≤ {args.target:.0f} ms")
+    failed = 0
+    for command in CLI_COMMANDS:
+        extra = best_of(command, args.repeat) - bare
+        ok = extra <= args.target
+        failed += not ok
+        print(f"  {'✅' if ok else '❌'} python {' '.join(command):<28} +{extra:6.0f} ms")
+
+    print("📦 入口模块导入耗时与重量级依赖：")
+    for module in ENTRY_MODULES:
+        extra = best_of(["-c", f"import {module}"], args.repeat) - bare
+        heavy = loaded_heavy(module)
+        if heavy is None:
+            print(f"  ⏭️ {module:<24} 无法导入（依赖缺失）")
+            continue
+        failed += bool(heavy)
+        note = f"提前加载了 {', '.join(heavy)}" if heavy else "未加载重量级依赖"
+        print(f"  {'❌' if heavy else '✅'} {module:<24} +{extra:6.0f} ms  {note}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,91 @@
+'''
+文本规范化基准测试。
+从 benchmarks/fixtures 中的 RSS 样例（按 --scale 合成放大）取出全部标题和正文，比较：
+    legacy     原 RSS 解析器的 clean_html（只处理正文）：unescape + <.*?> + strip
+    clean      textnorm.clean_html：同样的清洗（输出必须与 legacy 一致），预编译正则并跳过无需处理的文本
+    normalize  textnorm.normalize_text 处理正文：clean 之外再合并空白、截断
+    records    textnorm.normalize_records 处理标题和正文并识别语言（爬虫实际走的流程）
+只有 clean 与 legacy 是同样的工作量，可以直接比较快慢；normalize / records 多出的耗时是新增步骤的开销。
+输出每种方式的耗时、吞吐以及规范化前后的字符数。
+
+用法（在仓库根目录执行）：
+    python -m benchmarks.bench_textnorm [--scale 100] [--repeat 5]
+'''
+
+import argparse
+import re
+import time
+from html import unescape
+
+from benchmarks.fixture_server import scaled_feed
+from crawler import textnorm
+from crawler.sources import FEED_SOURCES
+from crawler.streaming import iter_feed_entries
+
+
+def load_records(scale):
+    records = []
+    for name in FEED_SOURCES:
+        for entry in iter_feed_entries([scaled_feed(name, scale)]):
+            records.append({"Title": entry.get("title", ""), "Description": entry.get("summary", "")})
+    return records
+
+
+LEGACY_TAG_RE = re.compile(r'<.*?>', re.S)
+
+
+def legacy(records):
+    return [LEGACY_TAG_RE.sub('', unescape(record["Description"])).strip() for record in records]
+
+
+def clean(records):
+    return [textnorm.clean_html(record["Description"]) for record in records]
+
+
+def normalize(records):
+    return [textnorm.normalize_text(record["Description"]) for record in records]
+
+
+def normalize_records(records):
+    copies = ({"Title": record["Title"], "Description": record["Description"]} for record in records)
+    return [record["Description"] for record in textnorm.normalize_records(copies, "Description")]
+
+
+def bench(func, records, repeat):
+    func(records)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func(records)
+    elapsed = (time.perf_counter() - start) / repeat
+    return result, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    records = load_records(args.scale)
+    if not records:
+        raise SystemExit("❌ 没有可用的 RSS 样例")
+    raw_chars = sum(len(record["Description"]) for record in records)
+    print(f"📄 {len(records)} 条正文，共 {raw_chars / 1024:.0f} K 字符，每种方式重复 {args.repeat} 轮")
+
+    results = {}
+    for label, func in (("legacy", legacy), ("clean", clean), ("normalize", normalize), ("records", normalize_records)):
+        results[label] = bench(func, records, args.repeat)
+    if results["clean"][0] != results["legacy"][0]:
+        raise SystemExit("❌ textnorm.clean_html 的输出与原清洗不一致")
+
+    fastest = min(elapsed for _, elapsed in results.values())
+    for label, (texts, elapsed) in results.items():
+        chars = sum(map(len, texts))
+        print(
+            f"  {label:<10} {elapsed * 1000:9.1f} ms  {len(records) / elapsed:10.0f} 条/s  "
+            f"{elapsed / fastest:5.1f}x 耗时  输出 {chars / 1024:.0f} K 字符（{chars / raw_chars:.0%}）"
+        )
+
+
+if __name__ == "__main__":
+    main()
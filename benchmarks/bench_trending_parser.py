@@ -0,0 +1,81 @@
+'''
+GitHub Trending 解析后端基准测试。
+读取 benchmarks/fixtures/github_trending_*.html，对每个可用后端重复解析，
+输出每页耗时和吞吐，并校验各后端的解析结果一致。
+
+用法（在仓库根目录执行）：
+    python -m benchmarks.bench_trending_parser [--repeat 50]
+'''
+
+import argparse
+import glob
+import os
+import time
+
+from crawler import trending_parser
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def load_fixtures():
+    paths = sorted(glob.glob(os.path.join(FIXTURE_DIR, "github_trending_*.html")))
+    fixtures = {}
+    for path in paths:
+        with open(path, "rb") as f:
+            fixtures[os.path.basename(path)] = f.read()
+    return fixtures
+
+
+def bench_backend(backend, pages, repeat):
+    parse = trending_parser.get_parser(backend)
+    # 预热：首次调用会导入模块、编译选择器
+    for content in pages:
+        parse(content)
+    start = time.perf_counter()
+    items = 0
+    for _ in range(repeat):
+        for content in pages:
+            items += len(parse(content))
+    elapsed = time.perf_counter() - start
+    n_pages = repeat * len(pages)
+    return {
+        "backend": backend,
+        "ms_per_page": elapsed / n_pages * 1000,
+        "pages_per_sec": n_pages / elapsed,
+        "items_per_sec": items / elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    fixtures = load_fixtures()
+    if not fixtures:
+        raise SystemExit(f"❌ {FIXTURE_DIR} 下没有 github_trending_*.html")
+    pages = list(fixtures.values())
+    backends = trending_parser.available_backends()
+
+    # 各后端的解析结果必须一致
+    reference = None
+    for backend in backends:
+        parsed = [trending_parser.parse_trending(content, backend) for content in pages]
+        if reference is None:
+            reference = parsed
+        elif parsed != reference:
+            raise SystemExit(f"❌ 后端 {backend} 的解析结果与 {backends[0]} 不一致")
+
+    total_bytes = sum(len(content) for content in pages)
+    print(f"📄 {len(pages)} 个样例页面，共 {total_bytes / 1024:.0f} KB，每个后端重复 {args.repeat} 轮")
+    results = [bench_backend(backend, pages, args.repeat) for backend in backends]
+    slowest = max(r["ms_per_page"] for r in results)
+    for r in sorted(results, key=lambda r: r["ms_per_page"]):
+        print(
+            f"  {r['backend']:<11} {r['ms_per_page']:8.2f} ms/页  "
+            f"{r['items_per_sec']:10.0f} 条/s  {slowest / r['ms_per_page']:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+'''
+本地故障注入 HTTP 服务器，用来验证 crawler.transport 的超时、重试、Retry-After 与熔断行为。
+路径决定注入的故障，计数按路径累计：
+    /ok                    200
+    /flaky/<n>             前 n 次返回 503，之后 200
+    /retry-after/<秒>      第一次返回 429 + Retry-After，之后 200
+    /slow/<秒>             等待若干秒后返回 200
+    /reset                 不返回响应直接断开连接
+    /status/<code>         固定返回该状态码
+
+用法（在仓库根目录执行）：
+    python -m benchmarks.fault_server            # 逐个场景跑一遍传输层并输出结果
+    python -m benchmarks.fault_server --serve    # 只启动服务器，供手动调试
+'''
+
+import argparse
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from crawler.transport import CircuitOpenError, Transport
+
+
+class FaultHandler(BaseHTTPRequestHandler):
+    hits = Counter()
+    lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body=b"ok", headers=None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # 客户端已因超时断开
+            pass
+
+    def do_GET(self):
+        with self.lock:
+            self.hits[self.path] += 1
+            count = self.hits[self.path]
+        parts = self.path.strip("/").split("/")
+        kind, arg = parts[0], parts[1] if len(parts) > 1 else ""
+
+        if kind == "flaky" and count <= int(arg):
+            self._send(503, b"unavailable")
+        elif kind == "retry-after" and count == 1:
+            self._send(429, b"slow down", {"Retry-After": arg})
+        elif kind == "slow":
+            time.sleep(float(arg))
+            self._send(200)
+        elif kind == "reset":
+            self.close_connection = True
+            self.connection.close()
+        elif kind == "status":
+            self._send(int(arg), b"status")
+        else:
+            self._send(200)
+
+
+def start_server(port=0):
+    """在后台线程启动服务器，返回 (server, base_url)"""
+    server = ThreadingHTTPServer(("127.0.0.1", port), FaultHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def run_scenarios(base):
+    # 熔断按主机计数：重试场景走 127.0.0.1，熔断场景走 localhost，互不影响
+    retrying = Transport(attempts=3, base_delay=0.1, max_delay=0.5, breaker_threshold=10)
+    breaking = Transport(attempts=3, base_delay=0.1, max_delay=0.5, breaker_threshold=3, breaker_cooldown=1)
+    other = base.replace("127.0.0.1", "localhost")
+
+    def get(transport, url, **kwargs):
+        start = time.perf_counter()
+        try:
+            outcome = transport.get(url, **kwargs).status_code
+        except requests.RequestException as exc:
+            outcome = type(exc).__name__
+        return outcome, time.perf_counter() - start
+
+    checks = [
+        ("正常请求", get(retrying, base + "/ok"), 200),
+        ("两次 503 后恢复", get(retrying, base + "/flaky/2"), 200),
+        ("遵守 Retry-After", get(retrying, base + "/retry-after/1"), 200),
+        ("404 不重试", get(retrying, base + "/status/404"), 404),
+        ("断开连接重试后失败", get(retrying, base + "/reset"), "ConnectionError"),
+        ("读超时", get(retrying, base + "/slow/2", timeout=(1, 0.5)), "ReadTimeout"),
+        ("持续 503 返回最后一次响应", get(breaking, other + "/status/503"), 503),
+        ("熔断后直接失败", get(breaking, other + "/ok"), CircuitOpenError.__name__),
+    ]
+    time.sleep(1.1)
+    checks.append(("冷却后试探恢复", get(breaking, other + "/ok"), 200))
+
+    failed = 0
+    for name, (outcome, elapsed), expected in checks:
+        ok = outcome == expected
+        failed += not ok
+        print(f"{'✅' if ok else '❌'} {name}：{outcome}（期望 {expected}，耗时 {elapsed:.2f}s）")
+    print(f"服务端请求计数：{dict(FaultHandler.hits)}")
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--serve", action="store_true", help="只启动服务器")
+    parser.add_argument("--port", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    server, base = start_server(args.port)
+    if args.serve:
+        print(f"🧪 故障注入服务器已启动：{base}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+        return 0
+    try:
+        return 1 if run_scenarios(base) else 0
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,277 @@
+'''
+本地回放服务器：把 benchmarks/fixtures 下录制的响应按各数据源的线上路径返回，
+基准测试因此不访问外网。scale 参数把条目数按倍数合成放大（链接 / ID 逐份改写，保证互不重复）。
+    /feed/<数据源>?scale=N                 RSS（arxiv / qbitai / 36kr / leiphone）
+    /trending?since=daily&scale=N          GitHub Trending HTML
+    /2/tweets/search/recent?scale=N        Twitter API v2 搜索结果，按 next_token 翻页，共 2N 页；
+                                           带 since_id 时只返回更新的推文；未请求 author_id 展开时不返回用户
+    /2/users?ids=..  /2/users/by?usernames=..  用户资料（取自录制页面中的 includes.users）
+    /2/users/<id>/tweets                   某个作者在录制页面中的推文（时间线），支持 since_id / max_results
+    /api/query?search_query=..&start=&max_results=
+                                           arXiv export API（Atom）：按查询中的 cat: 过滤录制的 arXiv 论文，
+                                           每个提交日期 N 份；非首页重复上一页的最后一条，模拟翻页期间列表变动
+所有响应带 ETag，带 If-None-Match 的重复请求返回 304。
+
+替换为真实录制：把线上响应原样保存为 FIXTURES 中对应的文件名即可。
+'''
+
+import hashlib
+import json
+import os
+import re
+import threading
+import xml.etree.ElementTree as ET
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+FIXTURES = {
+    "arxiv": "arxiv_cs.AI.xml",
+    "qbitai": "qbitai.xml",
+    "36kr": "36kr.xml",
+    "leiphone": "leiphone.xml",
+    "trending": "github_trending_daily.html",
+    "tweets": ["twitter_search_page1.json", "twitter_search_page2.json"],
+}
+
+ITEM_RE = re.compile(r"<item>.*?</item>", re.S)
+LINK_RE = re.compile(r"<link>(.*?)</link>")
+ARTICLE_RE = re.compile(r'<article class="Box-row">.*?</article>', re.S)
+REPO_HREF_RE = re.compile(r'(href="/[^/"?]+/[^/"?]+)(["/])')
+
+
+def _read(name, mode="rb"):
+    with open(os.path.join(FIXTURE_DIR, name), mode) as f:
+        return f.read()
+
+
+def _replicate(text, block_re, rewrite, scale):
+    """把 text 中每个匹配 block_re 的块复制 scale 份，第 k 份（k >= 1）用 rewrite(块, k) 改写"""
+    blocks = block_re.findall(text)
+    if scale <= 1 or not blocks:
+        return text
+    start = text.index(blocks[0])
+    end = text.rindex(blocks[-1]) + len(blocks[-1])
+    copies = [text[start:end]]
+    for k in range(1, scale):
+        copies.append("\n".join(rewrite(block, k) for block in blocks))
+    return text[:start] + "\n".join(copies) + text[end:]
+
+
+def scaled_feed(name, scale):
+    text = _read(FIXTURES[name]).decode("utf-8")
+    rewrite = lambda block, k: LINK_RE.sub(lambda m: f"<link>{m.group(1)}?copy={k}</link>", block)
+    return _replicate(text, ITEM_RE, rewrite, scale).encode("utf-8")
+
+
+def scaled_trending(scale):
+    text = _read(FIXTURES["trending"]).decode("utf-8")
+    rewrite = lambda block, k: REPO_HREF_RE.sub(lambda m: f"{m.group(1)}-{k}{m.group(2)}", block)
+    return _replicate(text, ARTICLE_RE, rewrite, scale).encode("utf-8")
+
+
+def tweet_page(index, scale, since_id=None, expand_authors=True):
+    """第 index 页（从 0 计）：轮流使用录制的各页，推文与媒体 ID 按页偏移"""
+    pages = FIXTURES["tweets"]
+    body = json.loads(_read(pages[index % len(pages)]))
+    offset = (index // len(pages)) * 10 ** 6
+    for tweet in body.get("data", []):
+        tweet["id"] = str(int(tweet["id"]) + offset)
+    if since_id:
+        body["data"] = [t for t in body.get("data", []) if int(t["id"]) > int(since_id)]
+    ids = [int(t["id"]) for t in body.get("data", [])]
+    if not expand_authors:
+        body.get("includes", {}).pop("users", None)
+    meta = body.setdefault("meta", {})
+    meta.pop("next_token", None)
+    meta.update(result_count=len(ids))
+    if ids:
+        meta.update(newest_id=str(max(ids)), oldest_id=str(min(ids)))
+    else:
+        meta.pop("newest_id", None)
+        meta.pop("oldest_id", None)
+    if index + 1 < len(pages) * scale:
+        meta["next_token"] = f"p{index + 1}"
+    return json.dumps(body, ensure_ascii=False).encode("utf-8")
+
+
+ATOM_ENTRY = (
+    "<entry><id>http://arxiv.org/abs/{id}v1</id><published>{date}T08:00:00Z</published>"
+    "<updated>{date}T08:00:00Z</updated><title>{title}</title><summary>{summary}</summary>{authors}"
+    '<link href="http://arxiv.org/abs/{id}v1" rel="alternate" type="text/html"/>'
+    '<arxiv:primary_category term="{primary}"/>{categories}</entry>'
+)
+ATOM_FEED = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n<feed xmlns="http://www.w3.org/2005/Atom" '
+    'xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/" xmlns:arxiv="http://arxiv.org/schemas/atom">'
+    "<title>arXiv Query</title><opensearch:totalResults>{total}</opensearch:totalResults>"
+    "<opensearch:startIndex>{start}</opensearch:startIndex><opensearch:itemsPerPage>{count}</opensearch:itemsPerPage>"
+    "\n{entries}\n</feed>\n"
+)
+CAT_RE = re.compile(r"cat:([\w.*-]+)")
+SUBMITTED_RE = re.compile(r"submittedDate:\[(\d{8})")
+
+
+def recorded_papers():
+    """录制的 arXiv RSS 中的论文：[{title, summary, authors, categories}]"""
+    root = ET.fromstring(_read(FIXTURES["arxiv"]))
+    papers = []
+    for item in root.iter("item"):
+        summary = item.findtext("description", "")
+        papers.append({
+            "title": item.findtext("title", "").strip(),
+            "summary": summary.split("Abstract:", 1)[-1].strip(),
+            "authors": [name.strip() for name in item.findtext("{http://purl.org/dc/elements/1.1/}creator", "").split(",")],
+            "categories": [c.text for c in item.findall("category")],
+        })
+    return papers
+
+
+def _category_match(categories, wanted):
+    return any(c == w or (w.endswith("*") and c.startswith(w[:-1])) for c in categories for w in wanted)
+
+
+def arxiv_query_body(query, start, max_results, scale):
+    wanted = CAT_RE.findall(query)
+    submitted = SUBMITTED_RE.search(query)
+    day = submitted.group(1) if submitted else "20250610"
+    date = f"{day[:4]}-{day[4:6]}-{day[6:]}"
+    recorded = recorded_papers()
+    papers = [
+        dict(paper, id=f"{day[2:6]}.{day[6:]}{k * len(recorded) + i:04d}")
+        for k in range(scale) for i, paper in enumerate(recorded)
+        if not wanted or _category_match(paper["categories"], wanted)
+    ]
+    first = max(start - 1, 0)
+    page = papers[first:start + max_results]
+    entries = "\n".join(
+        ATOM_ENTRY.format(
+            id=paper["id"], date=date, title=escape(paper["title"]), summary=escape(paper["summary"]),
+            authors="".join(f"<author><name>{escape(name)}</name></author>" for name in paper["authors"]),
+            primary=paper["categories"][0],
+            categories="".join(f'<category term="{c}" scheme="http://arxiv.org/schemas/atom"/>' for c in paper["categories"]),
+        )
+        for paper in page
+    )
+    return ATOM_FEED.format(total=len(papers), start=start, count=len(page), entries=entries).encode("utf-8")
+
+
+def recorded_tweets():
+    """录制的全部页面：(推文列表, 用户列表, 媒体列表)"""
+    tweets, users, media = [], {}, {}
+    for name in FIXTURES["tweets"]:
+        body = json.loads(_read(name))
+        tweets.extend(body.get("data", []))
+        users.update((u["id"], u) for u in body.get("includes", {}).get("users", []))
+        media.update((m["media_key"], m) for m in body.get("includes", {}).get("media", []))
+    return tweets, list(users.values()), media
+
+
+def users_body(ids=None, usernames=None):
+    _, users, _ = recorded_tweets()
+    if ids is not None:
+        users = [u for u in users if u["id"] in ids]
+    if usernames is not None:
+        usernames = {name.lower() for name in usernames}
+        users = [u for u in users if u["username"].lower() in usernames]
+    return json.dumps({"data": users}, ensure_ascii=False).encode("utf-8")
+
+
+def timeline_body(user_id, since_id=None, max_results=10):
+    tweets, _, media = recorded_tweets()
+    tweets = [t for t in tweets if t["author_id"] == user_id and int(t["id"]) > int(since_id or 0)]
+    tweets = sorted(tweets, key=lambda t: int(t["id"]), reverse=True)[:max_results]
+    keys = {key for t in tweets for key in t.get("attachments", {}).get("media_keys", [])}
+    body = {"data": tweets, "meta": {"result_count": len(tweets)}}
+    if keys:
+        body["includes"] = {"media": [media[key] for key in keys if key in media]}
+    if tweets:
+        body["meta"].update(newest_id=tweets[0]["id"], oldest_id=tweets[-1]["id"])
+    return json.dumps(body, ensure_ascii=False).encode("utf-8")
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    cache = {}
+    lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _body(self, parsed, query):
+        scale = max(1, int(query.get("scale", ["1"])[0]))
+        parts = parsed.path.strip("/").split("/")
+        if parts[0] == "feed" and len(parts) == 2 and parts[1] in FIXTURES:
+            return (parts[1], scale), "application/rss+xml; charset=utf-8", lambda: scaled_feed(parts[1], scale)
+        if parts[0] == "trending":
+            return ("trending", scale), "text/html; charset=utf-8", lambda: scaled_trending(scale)
+        if parsed.path == "/2/tweets/search/recent":
+            token = query.get("next_token", ["p0"])[0]
+            index = int(token[1:]) if token[1:].isdigit() else 0
+            since_id = query.get("since_id", [None])[0]
+            expand_authors = "author_id" in query.get("expansions", [""])[0].split(",")
+            return (("tweets", scale, index, since_id, expand_authors), "application/json",
+                    lambda: tweet_page(index, scale, since_id, expand_authors))
+        if parsed.path == "/api/query":
+            query_text = query.get("search_query", [""])[0]
+            start = int(query.get("start", ["0"])[0])
+            max_results = int(query.get("max_results", ["10"])[0])
+            return (("arxiv_api", parsed.query, scale), "application/atom+xml; charset=utf-8",
+                    lambda: arxiv_query_body(query_text, start, max_results, scale))
+        if parts[:2] == ["2", "users"]:
+            if len(parts) == 2 and "ids" in query:
+                ids = set(query["ids"][0].split(","))
+                return ("users", parsed.query), "application/json", lambda: users_body(ids=ids)
+            if parts[2:] == ["by"] and "usernames" in query:
+                names = query["usernames"][0].split(",")
+                return ("users", parsed.query), "application/json", lambda: users_body(usernames=names)
+            if len(parts) == 4 and parts[3] == "tweets":
+                since_id = query.get("since_id", [None])[0]
+                max_results = int(query.get("max_results", ["10"])[0])
+                return (("timeline", parsed.query, parts[2]), "application/json",
+                        lambda: timeline_body(parts[2], since_id, max_results))
+        return None, None, None
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        key, content_type, build = self._body(parsed, parse_qs(parsed.query))
+        if key is None:
+            self.send_error(404)
+            return
+        with self.lock:
+            if key not in self.cache:
+                body = build()
+                self.cache[key] = (body, '"%s"' % hashlib.sha1(body).hexdigest())
+            body, etag = self.cache[key]
+
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def start_server(port=0):
+    """在后台线程启动服务器，返回 (server, base_url)"""
+    server = ThreadingHTTPServer(("127.0.0.1", port), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    server, base = start_server(8765)
+    print(f"🧪 回放服务器已启动：{base}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
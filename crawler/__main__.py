@@ -0,0 +1,176 @@
+'''
+统一命令行入口（在仓库根目录执行）：
+    python -m crawler crawl              并发抓取全部 RSS 源和 GitHub Trending
+    python -m crawler feeds arxiv 36kr   只抓取指定的 RSS 源
+    python -m crawler github [--sweep]   GitHub Trending（--sweep 为多语言扫榜）
+    python -m crawler arxiv --since 2025-06-01 --until 2025-06-30
+                                         arXiv export API 多分类抓取 / 按日期补抓
+    python -m crawler tweets [--reset]   X 推文（按断点增量抓取，--reset 从头开始；
+                                         --whitelist-only 只轮询白名单作者的时间线）
+    python -m crawler report             生成当天的 AI 日报
+    python -m crawler daemon             常驻调度：按各源的自适应间隔轮询，输入变化后重新生成日报
+    python -m crawler sources            列出已注册的 RSS 源
+    python -m crawler archive search RAG --kind paper --since 2025-07-01
+                                         按关键词 / 数据源 / 作者 / 分类 / 日期查询历史归档
+    python -m crawler archive stars owner/repo   仓库历次上榜的 Star 数
+    python -m crawler archive backfill   把已有的 CSV 和列式存储补建进索引
+
+本模块只导入标准库；各子命令需要的模块（requests、feedparser、pyarrow、tweepy、genai 等）
+在执行到该子命令时才导入，--help 和参数错误不会触发任何重量级导入。
+'''
+
+import argparse
+import sys
+
+
+def cmd_crawl(args):
+    from crawler import run_all
+
+    return run_all.main()
+
+
+def cmd_feeds(args):
+    from crawler import metrics
+    from crawler.pipeline import crawl_feeds, report
+    from crawler.sources import FEED_SOURCES
+
+    unknown = [name for name in args.names if name not in FEED_SOURCES]
+    if unknown:
+        print(f"❌ 未知的数据源：{', '.join(unknown)}（可用：{', '.join(FEED_SOURCES)}）")
+        return 2
+    failed = report(crawl_feeds(args.names or None, incremental=not args.full))
+    metrics.finish("feeds")
+    return 1 if failed else 0
+
+
+def cmd_github(args):
+    from crawler import github_trends
+
+    github_trends.main(["--sweep"] if args.sweep else [])
+    return 0
+
+
+def cmd_arxiv(args):
+    from crawler import arxiv_export
+
+    categories = [c.strip() for c in args.categories.split(",") if c.strip()] if args.categories else None
+    arxiv_export.main(categories, args.since, args.until, incremental=not args.full)
+    return 0
+
+
+def cmd_tweets(args):
+    from crawler import tweet
+
+    tweet.main(reset=args.reset, whitelist_only=args.whitelist_only)
+    return 0
+
+
+def cmd_report(args):
+    import generate_daily_report
+
+    generate_daily_report.main()
+    return 0
+
+
+def cmd_daemon(args):
+    from crawler import scheduler
+
+    return scheduler.main(once=args.once, report=not args.no_report)
+
+
+def cmd_sources(args):
+    from crawler.sources import FEED_SOURCES
+
+    for name, source in FEED_SOURCES.items():
+        print(f"{name:<10} {source['kind']:<6} {source['url']}")
+    return 0
+
+
+def cmd_archive(args):
+    from crawler import archive_index
+
+    if args.action == "backfill":
+        count = archive_index.backfill()
+        print(f"✅ 已写入索引 {count} 条，索引共 {archive_index.get_archive().count()} 条")
+        return 0
+    if args.action == "stars":
+        history = archive_index.get_archive().star_history(args.repo, args.since, args.until)
+        if not history:
+            print(f"⚠️ 索引中没有 {args.repo} 的上榜记录")
+            return 1
+        for row in history:
+            print(f"{row['date']}  {row['stars']:>8}  {row['categories']}")
+        return 0
+    rows = archive_index.get_archive().search(
+        " ".join(args.keywords), source=args.source, kind=args.kind, author=args.author,
+        category=args.category, topic=args.topic, since=args.since, until=args.until, limit=args.limit,
+    )
+    for row in rows:
+        print(f"{row['date']}  {row['source']:<14} {row['title']}\n{'':10}{row['link']}")
+    print(f"🔎 共 {len(rows)} 条")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m crawler", description="AI 日报数据抓取与报告生成")
+    commands = parser.add_subparsers(dest="command", metavar="<命令>")
+    commands.required = True
+
+    commands.add_parser("crawl", help="并发抓取全部 RSS 源和 GitHub Trending").set_defaults(func=cmd_crawl)
+
+    feeds = commands.add_parser("feeds", help="抓取指定的 RSS 源（默认全部）")
+    feeds.add_argument("names", nargs="*", help="数据源名，见 sources 子命令")
+    feeds.add_argument("--full", action="store_true", help="关闭增量模式，重写当天的 CSV")
+    feeds.set_defaults(func=cmd_feeds)
+
+    github = commands.add_parser("github", help="抓取 GitHub Trending AI 项目")
+    github.add_argument("--sweep", action="store_true", help="按 SWEEP_MATRIX 扫描多语言、多时间维度的榜单")
+    github.set_defaults(func=cmd_github)
+
+    arxiv = commands.add_parser("arxiv", help="通过 export API 抓取多个分类的 arXiv 论文")
+    arxiv.add_argument("--categories", help="逗号分隔的分类，如 cs.CL,cs.LG,stat.ML（默认 ARXIV_CATEGORIES）")
+    arxiv.add_argument("--since", help="起始提交日期 YYYYMMDD 或 YYYY-MM-DD（含），默认最近两天")
+    arxiv.add_argument("--until", help="截止提交日期（含），默认今天")
+    arxiv.add_argument("--full", action="store_true", help="关闭增量模式，重写各天的 CSV")
+    arxiv.set_defaults(func=cmd_arxiv)
+
+    tweets = commands.add_parser("tweets", help="抓取 X 推文并生成词云")
+    tweets.add_argument("--reset", action="store_true", help="丢弃抓取断点，从头抓取")
+    tweets.add_argument("--whitelist-only", action="store_true", help="只轮询白名单作者的时间线（快速通道）")
+    tweets.set_defaults(func=cmd_tweets)
+    commands.add_parser("report", help="生成当天的 AI 日报").set_defaults(func=cmd_report)
+
+    daemon = commands.add_parser("daemon", help="常驻调度，按各数据源的自适应间隔轮询")
+    daemon.add_argument("--once", action="store_true", help="每个任务只运行一次后退出（适合 cron）")
+    daemon.add_argument("--no-report", action="store_true", help="输入变化后不自动生成日报")
+    daemon.set_defaults(func=cmd_daemon)
+    commands.add_parser("sources", help="列出已注册的 RSS 源").set_defaults(func=cmd_sources)
+
+    archive = commands.add_parser("archive", help="查询历史归档索引")
+    actions = archive.add_subparsers(dest="action", metavar="<操作>")
+    actions.required = True
+    search = actions.add_parser("search", help="按关键词和元数据查询")
+    search.add_argument("keywords", nargs="*", help="关键词，多个词需同时出现；英文词支持 rag* 前缀匹配")
+    search.add_argument("--source")
+    search.add_argument("--kind", choices=["paper", "news", "code", "x"])
+    search.add_argument("--author")
+    search.add_argument("--category")
+    search.add_argument("--topic", help="keywords.TOPICS 中的主题名，如 rag、agent")
+    search.add_argument("--limit", type=int, default=50)
+    stars = actions.add_parser("stars", help="仓库历次上榜的 Star 数")
+    stars.add_argument("repo", help="owner/name")
+    for action in (search, stars):
+        action.add_argument("--since", help="起始日期 YYYYMMDD 或 YYYY-MM-DD（含）")
+        action.add_argument("--until", help="截止日期（含）")
+    actions.add_parser("backfill", help="把已有的 CSV 和列式存储补建进索引")
+    archive.set_defaults(func=cmd_archive)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
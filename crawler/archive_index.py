@@ -0,0 +1,275 @@
+'''
+历史归档的全文与元数据索引（SQLite FTS5），跨天查询不再逐个扫描 generate_docs 下的 CSV。
+爬虫通过 store.StoreWriter 写出记录时同步写入索引；已有的历史 CSV / 列式存储用 backfill() 补建。
+    docs        每条记录一行，(date, source, item_key) 唯一；同一天重复写入时更新，stars 取最大值，
+                代码仓库的趋势标签（今日 / 本周 / 近30日）合并保留
+    docs_fts    英文分词（unicode61）全文索引：title / authors / categories / description / topics
+    docs_cjk    trigram 全文索引：title / description，用于中文子串查询（SQLite 不支持 trigram 时退回 LIKE）
+
+查询：
+    search(text, source, kind, author, category, topic, since, until)   关键词与元数据组合查询
+    star_history(repo)                                                  某个仓库历次上榜的日期与 Star 数
+'''
+
+import csv
+import os
+import re
+import sqlite3
+import threading
+
+from crawler import metrics
+from crawler.config import CACHE_DIR
+from crawler.keywords import tag_topics
+
+ARCHIVE_DB = os.path.join(CACHE_DIR, "archive.db")
+ARCHIVE_INDEX_ENABLED = True
+GENERATE_DOCS_DIR = "./generate_docs"
+
+DOC_COLUMNS = ["date", "source", "kind", "published", "title", "authors", "categories",
+               "description", "link", "stars", "topics"]
+FTS_COLUMNS = ["title", "authors", "categories", "description", "topics"]
+CJK_COLUMNS = ["title", "description"]
+
+CJK_RE = re.compile(r'[\u3000-\u9fff\uac00-\ud7af\uff00-\uffef]')
+CSV_DATE_RE = re.compile(r'(\d{4})-?(\d{2})-?(\d{2})\.csv$')
+TRIGRAM_MIN_CHARS = 3
+
+
+def _fts_triggers(table, columns):
+    cols = ", ".join(columns)
+    new = ", ".join(f"new.{c}" for c in columns)
+    old = ", ".join(f"old.{c}" for c in columns)
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {table}_ai AFTER INSERT ON docs BEGIN"
+        f" INSERT INTO {table}(rowid, {cols}) VALUES (new.id, {new}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_ad AFTER DELETE ON docs BEGIN"
+        f" INSERT INTO {table}({table}, rowid, {cols}) VALUES ('delete', old.id, {old}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_au AFTER UPDATE ON docs BEGIN"
+        f" INSERT INTO {table}({table}, rowid, {cols}) VALUES ('delete', old.id, {old});"
+        f" INSERT INTO {table}(rowid, {cols}) VALUES (new.id, {new}); END",
+    ]
+
+
+def normalize_date(value):
+    """YYYY-MM-DD / YYYYMMDD -> YYYYMMDD"""
+    return value.replace("-", "") if value else value
+
+
+class ArchiveIndex:
+    def __init__(self, path=ARCHIVE_DB):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS docs ("
+            " id INTEGER PRIMARY KEY,"
+            " date TEXT NOT NULL, source TEXT NOT NULL, kind TEXT, item_key TEXT NOT NULL,"
+            " published TEXT, title TEXT, authors TEXT, categories TEXT, description TEXT,"
+            " link TEXT, stars INTEGER, topics TEXT,"
+            " UNIQUE (date, source, item_key))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS docs_date ON docs (date)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS docs_source ON docs (source, date)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS docs_title ON docs (kind, title, date)")
+        self._conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts USING fts5("
+            f"{', '.join(FTS_COLUMNS)}, content='docs', content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+        )
+        for statement in _fts_triggers("docs_fts", FTS_COLUMNS):
+            self._conn.execute(statement)
+        try:
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS docs_cjk USING fts5("
+                f"{', '.join(CJK_COLUMNS)}, content='docs', content_rowid='id', tokenize='trigram')"
+            )
+            for statement in _fts_triggers("docs_cjk", CJK_COLUMNS):
+                self._conn.execute(statement)
+            self.has_trigram = True
+        except sqlite3.OperationalError:
+            # SQLite 3.34 之前没有 trigram 分词器
+            self.has_trigram = False
+        self._conn.commit()
+
+    def add(self, date_str, source, kind, records):
+        """写入一批统一字段的记录（见 crawler.store），返回写入条数"""
+        rows = []
+        for record in records:
+            key = record.get("link") or record.get("title") or ""
+            if not key:
+                continue
+            topics = record.get("topics")
+            if topics is None:
+                topics = ",".join(tag_topics(record.get("title"), record.get("description")))
+            rows.append((
+                date_str, source, record.get("kind") or kind, key,
+                record.get("published"), record.get("title"), record.get("authors"),
+                record.get("categories"), record.get("description"), record.get("link"),
+                record.get("stars"), topics,
+            ))
+        if not rows:
+            return 0
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO docs (date, source, kind, item_key, published, title, authors, categories,"
+                " description, link, stars, topics) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (date, source, item_key) DO UPDATE SET"
+                " kind = excluded.kind, published = excluded.published, title = excluded.title,"
+                " authors = excluded.authors,"
+                # 同一仓库当天出现在多个榜单时，保留全部趋势标签
+                " categories = CASE WHEN excluded.kind != 'code' THEN excluded.categories"
+                "  WHEN instr(',' || docs.categories || ',', ',' || excluded.categories || ',') > 0 THEN docs.categories"
+                "  ELSE docs.categories || ',' || excluded.categories END,"
+                " description = excluded.description, link = excluded.link, topics = excluded.topics,"
+                " stars = MAX(COALESCE(docs.stars, 0), COALESCE(excluded.stars, 0))",
+                rows,
+            )
+            self._conn.commit()
+        metrics.incr("archive.indexed", len(rows), source)
+        return len(rows)
+
+    def _text_conditions(self, text):
+        """把查询词拆成 SQL 条件：英文词走 docs_fts（支持 rag* 前缀），中文走 docs_cjk 子串"""
+        conditions, params = [], []
+        for term in (text or "").split():
+            prefix = term.endswith("*")
+            word = term.rstrip("*").replace('"', '""')
+            if not word:
+                continue
+            if CJK_RE.search(word):
+                if self.has_trigram and len(word) >= TRIGRAM_MIN_CHARS:
+                    conditions.append("docs.id IN (SELECT rowid FROM docs_cjk WHERE docs_cjk MATCH ?)")
+                    params.append(f'"{word}"')
+                else:
+                    conditions.append("(docs.title LIKE ? OR docs.description LIKE ?)")
+                    params += [f"%{word}%"] * 2
+            else:
+                conditions.append("docs.id IN (SELECT rowid FROM docs_fts WHERE docs_fts MATCH ?)")
+                params.append(f'"{word}"' + ("*" if prefix else ""))
+        return conditions, params
+
+    def search(self, text=None, source=None, kind=None, author=None, category=None, topic=None,
+               since=None, until=None, limit=50):
+        """
+        组合查询，条件之间为「且」；text 中的多个词也要求同时出现。
+        since / until 为 YYYYMMDD 或 YYYY-MM-DD（含边界）。按日期从新到旧返回字典列表。
+        """
+        conditions, params = self._text_conditions(text)
+        for column, value in (("source", source), ("kind", kind)):
+            if value:
+                conditions.append(f"docs.{column} = ?")
+                params.append(value)
+        for column, value in (("authors", author), ("categories", category)):
+            if value:
+                conditions.append(f"docs.{column} LIKE ?")
+                params.append(f"%{value}%")
+        if topic:
+            conditions.append("(',' || docs.topics || ',') LIKE ?")
+            params.append(f"%,{topic},%")
+        if since:
+            conditions.append("docs.date >= ?")
+            params.append(normalize_date(since))
+        if until:
+            conditions.append("docs.date <= ?")
+            params.append(normalize_date(until))
+        where = " AND ".join(conditions) or "1"
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(DOC_COLUMNS)} FROM docs WHERE {where}"
+                " ORDER BY docs.date DESC, docs.stars DESC, docs.id LIMIT ?",
+                [*params, limit],
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def star_history(self, repo, since=None, until=None):
+        """某个仓库（owner/name）历次上榜的 [{date, stars, categories, source}]，按日期从旧到新"""
+        conditions, params = ["kind = 'code'", "title = ?"], [repo]
+        if since:
+            conditions.append("date >= ?")
+            params.append(normalize_date(since))
+        if until:
+            conditions.append("date <= ?")
+            params.append(normalize_date(until))
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT date, MAX(stars) AS stars, GROUP_CONCAT(DISTINCT categories) AS categories,"
+                f" GROUP_CONCAT(DISTINCT source) AS source FROM docs WHERE {' AND '.join(conditions)}"
+                " GROUP BY date ORDER BY date",
+                params,
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_default_index = None
+_default_lock = threading.Lock()
+
+
+def get_archive():
+    """进程内共享的默认索引"""
+    global _default_index
+    with _default_lock:
+        if _default_index is None:
+            _default_index = ArchiveIndex()
+    return _default_index
+
+
+# === 补建历史数据 ===
+
+def csv_sources():
+    """历史 CSV 文件名前缀 -> (数据源, 类别, 转换函数)"""
+    from crawler import store
+    from crawler.sources import FEED_SOURCES
+
+    sources = {
+        "github_trends": ("github_trends", "code", store.github_record),
+        "github_sweep": ("github_sweep", "code", store.github_record),
+        "x": ("x", "x", store.tweet_record),
+        "arxiv_export": ("arxiv_export", "paper", lambda row: store.feed_record(row, "Abstract")),
+    }
+    for name, source in FEED_SOURCES.items():
+        text_field = source["text_field"]
+        sources[source["file_prefix"]] = (
+            name, source["kind"], lambda row, field=text_field: store.feed_record(row, field))
+    return sources
+
+
+def iter_csv_files(base_dir=GENERATE_DOCS_DIR):
+    """产出 (日期, 文件名前缀, 路径)，只包含文件名以日期结尾的 CSV"""
+    for root, dirs, files in os.walk(base_dir):
+        for file_name in sorted(files):
+            match = CSV_DATE_RE.search(file_name)
+            if match:
+                prefix = file_name[:match.start()].rstrip("_")
+                yield "".join(match.groups()), prefix, os.path.join(root, file_name)
+
+
+def backfill(index=None, base_dir=GENERATE_DOCS_DIR):
+    """把已有的列式存储分区和历史 CSV 写入索引（可重复执行），返回写入条数"""
+    from crawler import store
+
+    index = index or get_archive()
+    total = 0
+    # list_partitions 每个 part 文件一项，同一分区只读一次
+    partitions = dict.fromkeys((date_str, source) for date_str, source, _ in store.list_partitions())
+    for date_str, source in partitions:
+        with metrics.span("archive.backfill", source):
+            rows = store.read(dates=[date_str], sources=[source])
+            total += index.add(date_str, source, None, rows)
+
+    sources = csv_sources()
+    for date_str, prefix, path in iter_csv_files(base_dir):
+        if prefix not in sources:
+            continue
+        source, kind, to_record = sources[prefix]
+        with metrics.span("archive.backfill", source), open(path, newline="", encoding="utf-8-sig") as f:
+            total += index.add(date_str, source, kind, (to_record(row) for row in csv.DictReader(f)))
+    return total
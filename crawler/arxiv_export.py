@@ -0,0 +1,214 @@
+'''
+arXiv 多分类抓取（export API）：一次查询覆盖 ARXIV_CATEGORIES 中的全部分类，
+按提交日期把时间范围切成 WINDOW_DAYS 天的窗口，每个窗口按 start 翻页：
+    (cat:cs.CL OR cat:cs.LG ...) AND submittedDate:[YYYYMMDD0000 TO YYYYMMDD2359]
+- 交叉列出的论文在一次查询中只返回一次；翻页期间列表变动造成的重复按 arXiv ID 去重，
+  多次运行之间的重复由增量索引（crawler.seen_index）过滤
+- 对 export.arxiv.org 限速，相邻请求间隔 REQUEST_DELAY 秒（arXiv API 使用条款的要求）
+- 后台线程抓取下一页的同时解析、写出当前页（streaming.bounded）
+- 每个窗口写完后记入断点（crawler.checkpoint），补抓时跳过已完成的窗口；最近 REFRESH_DAYS 天的窗口总会重抓
+输出与 arXiv RSS 相同的 CSV 列，按提交日期写入 <output_dir>/arxiv_export_<YYYYMMDD>.csv。
+
+用法：python -m crawler arxiv [--categories cs.CL,cs.LG] [--since 2025-06-01 --until 2025-06-30]
+'''
+
+import datetime
+import email.utils
+import hashlib
+import itertools
+import re
+from urllib.parse import urlparse
+
+from crawler import metrics, store, textnorm
+from crawler.checkpoint import get_checkpoints
+from crawler.config import INCREMENTAL
+from crawler.pipeline import KEY_FIELDS, entry_to_record, output_path
+from crawler.seen_index import get_index
+from crawler.sources import fieldnames
+from crawler.streaming import bounded, iter_feed_entries, write_csv
+from crawler.transport import get_transport
+
+EXPORT_API_URL = "https://export.arxiv.org/api/query"
+ARXIV_CATEGORIES = ["cs.AI", "cs.CL", "cs.LG", "cs.CV", "stat.ML"]
+
+PAGE_SIZE = 500
+WINDOW_DAYS = 1
+# 不指定范围时抓取最近几天（含今天）
+DEFAULT_DAYS = 2
+REFRESH_DAYS = 2
+REQUEST_DELAY = 3
+# API 偶尔在 totalResults 大于 0 时返回空页，重试几次后放弃该窗口（不记入断点）
+EMPTY_PAGE_RETRIES = 2
+# 预取的页数：解析当前页时后台最多再抓这么多页
+PREFETCH_PAGES = 2
+
+SOURCE_NAME = "arxiv_export"
+SOURCE = {
+    "output_dir": "./generate_docs/archive",
+    "file_prefix": "arxiv_export",
+    "kind": "paper",
+    "text_field": "Abstract",
+    "default_authors": "Unknown",
+    "default_categories": "",
+}
+
+TOTAL_RE = re.compile(rb"<opensearch:totalResults[^>]*>\s*(\d+)\s*<")
+ENTRY_RE = re.compile(rb"<entry[\s>]")
+ARXIV_ID_RE = re.compile(r"/abs/(.+?)(?:v\d+)?$")
+
+
+def arxiv_id(url):
+    """http://arxiv.org/abs/2506.08000v2 -> 2506.08000（旧式 ID 如 hep-th/9901001 同样适用）"""
+    match = ARXIV_ID_RE.search(url or "")
+    return match.group(1) if match else url
+
+
+def build_query(categories, day_from, day_to):
+    cats = " OR ".join(f"cat:{category}" for category in categories)
+    return f"({cats}) AND submittedDate:[{day_from}0000 TO {day_to}2359]"
+
+
+def _day(value):
+    return datetime.datetime.strptime(value.replace("-", ""), "%Y%m%d").date()
+
+
+def windows(since, until, size=WINDOW_DAYS):
+    """把 [since, until]（YYYYMMDD 或 YYYY-MM-DD，含边界）切成 [(起, 止), ...]"""
+    start, end = _day(since), _day(until)
+    result = []
+    while start <= end:
+        stop = min(start + datetime.timedelta(days=size - 1), end)
+        result.append((start.strftime("%Y%m%d"), stop.strftime("%Y%m%d")))
+        start = stop + datetime.timedelta(days=1)
+    return result
+
+
+def checkpoint_key(categories):
+    digest = hashlib.sha1(",".join(sorted(categories)).encode("utf-8")).hexdigest()[:12]
+    return f"arxiv_export:{digest}"
+
+
+def fetch_page(query, start, page_size):
+    response = get_transport().get(EXPORT_API_URL, params={
+        "search_query": query,
+        "start": start,
+        "max_results": page_size,
+        "sortBy": "submittedDate",
+        "sortOrder": "ascending",
+    })
+    response.raise_for_status()
+    metrics.incr("http.bytes", len(response.content), urlparse(EXPORT_API_URL).hostname)
+    return response.content
+
+
+def iter_pages(categories, window_list, page_size=PAGE_SIZE):
+    """
+    逐个窗口翻页，产出 (窗口, 响应体)；窗口的全部页都取到后再产出 (窗口, None) 作为完成标记。
+    """
+    for window in window_list:
+        query = build_query(categories, *window)
+        start, total, empty = 0, None, 0
+        while total is None or start < total:
+            with metrics.span("fetch", SOURCE_NAME):
+                body = fetch_page(query, start, page_size)
+            match = TOTAL_RE.search(body)
+            total = int(match.group(1)) if match else 0
+            if not ENTRY_RE.search(body) and start < total:
+                empty += 1
+                if empty > EMPTY_PAGE_RETRIES:
+                    print(f"⚠️ arXiv {window[0]} 第 {start} 条起连续返回空页，下次运行重抓该窗口")
+                    break
+                continue
+            empty = 0
+            yield window, body
+            start += page_size
+        else:
+            yield window, None
+
+
+def _published(value):
+    """Atom 的 ISO 8601 时间 -> 与 RSS 相同的 RFC 2822 格式"""
+    try:
+        return email.utils.format_datetime(datetime.datetime.fromisoformat(value.replace("Z", "+00:00")))
+    except ValueError:
+        return value
+
+
+def page_records(bodies, seen_ids):
+    """解析各页响应体，按 arXiv ID 去重后产出 CSV 记录"""
+    for body in bodies:
+        for entry in iter_feed_entries([body]):
+            if "/api/errors" in entry.get("id", ""):
+                raise ValueError(f"arXiv API 查询错误：{entry.get('summary', '')}")
+            paper_id = arxiv_id(entry.get("id") or entry.get("link"))
+            if paper_id in seen_ids:
+                metrics.incr("items.duplicate", 1, SOURCE_NAME)
+                continue
+            seen_ids.add(paper_id)
+            record = entry_to_record(entry, SOURCE)
+            record["Date"] = _published(record["Date"])
+            record["Link"] = f"https://arxiv.org/abs/{paper_id}"
+            yield record
+
+
+def write_window(day, records, incremental=INCREMENTAL):
+    """把一个窗口的记录写入当天的 CSV 与列式存储，返回 (输出路径, 写入条数)"""
+    records = metrics.timed_iter(records, "parse", SOURCE_NAME, counter="items.parsed")
+    records = textnorm.normalize_records(records, SOURCE["text_field"], source=SOURCE_NAME)
+    if incremental:
+        records = get_index().iter_new(SOURCE_NAME, records, KEY_FIELDS, ("Title", SOURCE["text_field"]))
+    records = store.tee(
+        records, SOURCE_NAME, SOURCE["kind"],
+        lambda record: store.feed_record(record, SOURCE["text_field"]),
+        day,
+    )
+    path = output_path(SOURCE, day)
+    with metrics.span("write", SOURCE_NAME):
+        count = write_csv(records, path, fieldnames(SOURCE), append=incremental)
+    metrics.incr("items.written", count, SOURCE_NAME)
+    return path, count
+
+
+def crawl(categories=None, since=None, until=None, incremental=INCREMENTAL, page_size=PAGE_SIZE):
+    """抓取 [since, until] 内提交的论文（默认最近 DEFAULT_DAYS 天），返回写入条数"""
+    categories = categories or ARXIV_CATEGORIES
+    today = datetime.date.today()
+    until = until or today.strftime("%Y%m%d")
+    since = since or (today - datetime.timedelta(days=DEFAULT_DAYS - 1)).strftime("%Y%m%d")
+
+    checkpoints = get_checkpoints()
+    key = checkpoint_key(categories)
+    done = set((checkpoints.get(key) or {}).get("done", []))
+    refresh_from = (today - datetime.timedelta(days=REFRESH_DAYS)).strftime("%Y%m%d")
+    todo = [w for w in windows(since, until) if f"{w[0]}-{w[1]}" not in done or w[1] >= refresh_from]
+    skipped = len(windows(since, until)) - len(todo)
+    print(f"📚 arXiv {', '.join(categories)}：{len(todo)} 个窗口待抓取" + (f"，跳过已完成的 {skipped} 个" if skipped else ""))
+
+    get_transport().set_rate_limit(urlparse(EXPORT_API_URL).hostname, 1 / REQUEST_DELAY)
+    seen_ids = set()
+    total = 0
+    pages = bounded(iter_pages(categories, todo, page_size), maxsize=PREFETCH_PAGES)
+    for window, items in itertools.groupby(pages, key=lambda item: item[0]):
+        complete = []
+
+        def bodies(items=items, complete=complete):
+            for _, body in items:
+                if body is None:
+                    complete.append(True)
+                else:
+                    yield body
+
+        path, count = write_window(window[0], page_records(bodies(), seen_ids), incremental)
+        total += count
+        print(f"✅ arXiv {window[0]} 新增 {count} 条，已保存至：{path}")
+        if complete:
+            done.add(f"{window[0]}-{window[1]}")
+            checkpoints.save(key, {"done": sorted(done)})
+    return total
+
+
+def main(categories=None, since=None, until=None, incremental=INCREMENTAL):
+    total = crawl(categories, since, until, incremental)
+    print(f"🎉 arXiv 共新增 {total} 条")
+    metrics.finish(SOURCE_NAME)
+    return total
@@ -0,0 +1,53 @@
+'''
+分页抓取的断点存储：每个键保存一份任意 JSON 状态（游标、高水位等），
+每次保存都整体原子替换文件，进程中断后下次运行从最后一次保存的位置继续。
+'''
+
+import json
+import os
+import threading
+
+from crawler.config import CACHE_DIR
+
+CHECKPOINT_PATH = os.path.join(CACHE_DIR, "checkpoints.json")
+
+
+class CheckpointStore:
+    def __init__(self, path=CHECKPOINT_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, key, default=None):
+        with self._lock:
+            return self._load().get(key, default)
+
+    def save(self, key, state):
+        """保存 key 的状态；state 为 None 时删除"""
+        with self._lock:
+            data = self._load()
+            if state is None:
+                data.pop(key, None)
+            else:
+                data[key] = state
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp.{os.getpid()}"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.path)
+
+
+_default_store = None
+
+
+def get_checkpoints():
+    global _default_store
+    if _default_store is None:
+        _default_store = CheckpointStore()
+    return _default_store
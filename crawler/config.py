@@ -0,0 +1,41 @@
+# 爬虫公共配置
+import os
+
+
+# 统一的请求头
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0 Safari/537.36'
+}
+
+# 单个请求的 (连接, 读取) 超时，单位秒
+REQUEST_TIMEOUT = (5, 30)
+
+# 同一主机的最大并发请求数
+PER_HOST_LIMIT = 2
+
+# 一次完整抓取的总耗时预算，单位秒；超出预算的数据源会被单独放弃
+TOTAL_BUDGET = 120
+
+# 本地缓存根目录（HTTP 缓存、状态文件等）
+CACHE_DIR = "./cache"
+
+# 增量抓取：只追加未见过或内容有变化的条目（见 crawler.seen_index）
+INCREMENTAL = True
+
+# 失败重试：单个请求最多尝试次数，指数退避的初始 / 最大等待秒数（实际等待带 ±50% 随机抖动）
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+# 服务端 Retry-After 要求等待超过该秒数时不再重试
+MAX_RETRY_AFTER = 60
+
+# 熔断：同一主机连续失败达到阈值后熔断，冷却期内的请求直接失败，冷却后放行一个试探请求
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = 60
+
+# 按主机限速：{主机名: (每秒请求数, 突发数)}
+HOST_RATE_LIMITS = {}
+
+# 运行指标（crawler.metrics）：JSON 汇总目录；设置环境变量 PROMETHEUS_TEXTFILE_DIR 时额外写出 .prom 文件
+METRICS_DIR = "./cache/metrics"
+PROMETHEUS_TEXTFILE_DIR = os.getenv("PROMETHEUS_TEXTFILE_DIR")
@@ -0,0 +1,280 @@
+'''
+跨数据源的近似重复检测（MinHash + LSH）。
+同一条新闻常常同时出现在量子位、36Kr、雷锋网甚至推特上，标题略有差异。
+这里对标题 + 描述开头的特征集合计算 MinHash 签名，估计的 Jaccard 相似度
+不低于 SIMILARITY_THRESHOLD 的记录视为同一事件：
+    - 当天内的重复记录聚成一簇，只保留一条代表记录，其余链接放入 alternate_links
+    - 签名持久化到 SQLite，最近 HISTORY_DAYS 天内已经出现过的事件也能被识别出来
+
+性能：签名用单次哈希 MinHash（one permutation hashing）计算，每个特征只哈希一次并落到
+NUM_BINS 个桶之一，代价与特征数成线性而与签名长度无关；查找时把签名切成 BANDS 段做 LSH，
+只比较至少有一段完全相同的候选。
+
+近似匹配只用于新闻（scope="news"）。代码和论文的标题很短、用词高度重合（如 alice/llm-agent 与
+bob/agent-llm），按相似度会被误合并，因此改用 collapse_by_key 按确定的标识精确去重：
+代码按 owner/repo，论文按 arXiv ID（见 identity_key）。
+'''
+
+import bisect
+import datetime
+import hashlib
+import os
+import re
+import sqlite3
+import struct
+
+from crawler.config import CACHE_DIR
+
+DEDUP_DB = os.path.join(CACHE_DIR, "dedup.db")
+HISTORY_DAYS = 7
+SIMILARITY_THRESHOLD = 0.5
+# 描述只取开头部分：不同来源的正文差异大，标题和导语更能代表事件本身
+MAX_TEXT_CHARS = 200
+
+NUM_BINS = 32
+BANDS = 8
+ROWS_PER_BAND = NUM_BINS // BANDS
+
+ASCII_WORD_RE = re.compile(r'[a-z0-9]{2,}')
+CJK_RUN_RE = re.compile(r'[\u4e00-\u9fff]+')
+# 论文链接中的 arXiv ID，忽略协议、域名和版本号
+ARXIV_ID_RE = re.compile(r"/abs/(.+?)(?:v\d+)?/?$")
+SIGNATURE_STRUCT = struct.Struct(f"<{NUM_BINS}Q")
+# 致密化时借来的值与偏移量混合，避免不同空桶借到同一个值而虚增相似度
+GOLDEN = 0x9E3779B97F4A7C15
+MASK64 = (1 << 64) - 1
+
+
+def features(text):
+    """英文按词、中文按相邻两字切分特征，返回集合"""
+    text = text.lower()
+    result = set(ASCII_WORD_RE.findall(text))
+    for run in CJK_RUN_RE.findall(text):
+        if len(run) == 1:
+            result.add(run)
+        else:
+            result.update(run[i:i + 2] for i in range(len(run) - 1))
+    return result
+
+
+def _hash(feature):
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def minhash(feature_set, cache=None):
+    """
+    单次哈希 MinHash 签名：哈希值的低位决定落入哪个桶，每个桶保留最小值。
+    同一桶内低位相同，按完整哈希排序即按桶内取值排序，因此倒序写入字典后留下的就是最小值。
+    空桶从右侧最近的非空桶借值（旋转致密化）。
+    """
+    if not feature_set:
+        return None
+    cache = {} if cache is None else cache
+    missing = feature_set.difference(cache)
+    if missing:
+        cache.update({feature: _hash(feature) for feature in missing})
+    hashes = sorted((cache[feature] for feature in feature_set), reverse=True)
+    # 哈希值的低位（NUM_BINS 为 2 的幂）即桶号；从大到小写入，同一桶最后留下的是最小值
+    bins = {h & (NUM_BINS - 1): h for h in hashes}
+    signature = [bins.get(i) for i in range(NUM_BINS)]
+    if len(bins) < NUM_BINS:
+        filled = sorted(bins)
+        for i in range(NUM_BINS):
+            if signature[i] is None:
+                donor = filled[bisect.bisect(filled, i) % len(filled)]
+                offset = (donor - i) % NUM_BINS
+                signature[i] = (bins[donor] ^ (offset * GOLDEN)) & MASK64
+    return tuple(signature)
+
+
+def similarity(a, b):
+    """估计的 Jaccard 相似度"""
+    return sum(x == y for x, y in zip(a, b)) / NUM_BINS
+
+
+def band_keys(signature):
+    return list(enumerate(zip(*[iter(signature)] * ROWS_PER_BAND)))
+
+
+def record_text(row):
+    return f"{row.get('title') or ''} {(row.get('description') or '')[:MAX_TEXT_CHARS]}"
+
+
+class _UnionFind:
+    def __init__(self, n):
+        self.parent = list(range(n))
+
+    def find(self, x):
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+class DedupIndex:
+    def __init__(self, path=DEDUP_DB):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS signatures ("
+            " scope TEXT NOT NULL, date TEXT NOT NULL, signature BLOB NOT NULL, title TEXT, link TEXT)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_signatures_scope_date ON signatures (scope, date)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS identities ("
+            " scope TEXT NOT NULL, date TEXT NOT NULL, key TEXT NOT NULL, link TEXT)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_identities_scope_date ON identities (scope, date)")
+        self._conn.commit()
+
+    def history(self, scope, date_str, days=HISTORY_DAYS):
+        """返回 date_str 之前 days 天内的 [(签名, 标题, 链接)]，不含当天"""
+        start = (datetime.datetime.strptime(date_str, "%Y%m%d") - datetime.timedelta(days=days)).strftime("%Y%m%d")
+        rows = self._conn.execute(
+            "SELECT signature, title, link FROM signatures WHERE scope = ? AND date >= ? AND date < ?",
+            (scope, start, date_str),
+        )
+        return [(SIGNATURE_STRUCT.unpack(blob), title, link) for blob, title, link in rows]
+
+    def replace_day(self, scope, date_str, items):
+        """用当天的代表记录覆盖当天的签名（同一天重跑时不会越积越多）"""
+        self._conn.execute("DELETE FROM signatures WHERE scope = ? AND date = ?", (scope, date_str))
+        self._conn.executemany(
+            "INSERT INTO signatures (scope, date, signature, title, link) VALUES (?, ?, ?, ?, ?)",
+            [(scope, date_str, SIGNATURE_STRUCT.pack(*sig), title, link) for sig, title, link in items if sig],
+        )
+        self._conn.commit()
+
+    def history_keys(self, scope, date_str, days=HISTORY_DAYS):
+        """返回 date_str 之前 days 天内出现过的 {标识: 链接}，不含当天"""
+        start = (datetime.datetime.strptime(date_str, "%Y%m%d") - datetime.timedelta(days=days)).strftime("%Y%m%d")
+        rows = self._conn.execute(
+            "SELECT key, link FROM identities WHERE scope = ? AND date >= ? AND date < ?",
+            (scope, start, date_str),
+        )
+        return dict(rows)
+
+    def replace_day_keys(self, scope, date_str, items):
+        """用当天的 [(标识, 链接)] 覆盖当天的记录"""
+        self._conn.execute("DELETE FROM identities WHERE scope = ? AND date = ?", (scope, date_str))
+        self._conn.executemany(
+            "INSERT INTO identities (scope, date, key, link) VALUES (?, ?, ?, ?)",
+            [(scope, date_str, key, link) for key, link in items],
+        )
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+
+def _canonical_index(rows, members):
+    # 代表记录：描述最长的一条，其次是最早出现的
+    return max(members, key=lambda i: (len(rows[i].get("description") or ""), -i))
+
+
+def collapse(rows, date_str, index=None, scope="news", drop_seen=True):
+    """
+    聚合近似重复的记录；scope 区分不同类别的历史签名（目前只有 news）。
+    返回代表记录列表（保持原顺序），每条代表记录带上 alternate_links；
+    drop_seen 为 True 时丢弃与历史签名重复的事件。
+    """
+    if not rows:
+        return []
+    cache = {}
+    signatures = [minhash(features(record_text(row)), cache) for row in rows]
+
+    keys = [band_keys(sig) if sig is not None else () for sig in signatures]
+    buckets = {}
+    uf = _UnionFind(len(rows))
+    for i, sig in enumerate(signatures):
+        for key in keys[i]:
+            for j in buckets.get(key, ()):
+                if uf.find(i) != uf.find(j) and similarity(sig, signatures[j]) >= SIMILARITY_THRESHOLD:
+                    uf.union(i, j)
+            buckets.setdefault(key, []).append(i)
+
+    clusters = {}
+    for i in range(len(rows)):
+        clusters.setdefault(uf.find(i), []).append(i)
+
+    history_buckets = {}
+    if index is not None:
+        for sig, _, link in index.history(scope, date_str):
+            for key in band_keys(sig):
+                history_buckets.setdefault(key, []).append((sig, link))
+
+    result, today_items = [], []
+    for root in sorted(clusters):
+        members = clusters[root]
+        canonical = _canonical_index(rows, members)
+        sig = signatures[canonical]
+        row = dict(rows[canonical])
+        row["alternate_links"] = [
+            rows[i].get("link") for i in members if i != canonical and rows[i].get("link")
+        ]
+        previous = None
+        if history_buckets:
+            previous = next(
+                (link for key in keys[canonical] for old_sig, link in history_buckets.get(key, ())
+                 if similarity(sig, old_sig) >= SIMILARITY_THRESHOLD),
+                None,
+            )
+        today_items.append((sig, row.get("title"), row.get("link")))
+        if previous is not None:
+            row["seen_before"] = previous
+            if drop_seen:
+                continue
+        result.append(row)
+
+    if index is not None:
+        index.replace_day(scope, date_str, today_items)
+    return result
+
+
+def identity_key(kind, row):
+    """代码 -> owner/repo（GitHub 名称不区分大小写），论文 -> arXiv ID；取不到时退回到链接或标题"""
+    title = (row.get("title") or "").strip()
+    link = (row.get("link") or "").strip()
+    if kind == "code":
+        return (title or link).lower()
+    if kind == "paper":
+        match = ARXIV_ID_RE.search(link)
+        return match.group(1) if match else (link or title.lower())
+    return link or title.lower()
+
+
+def collapse_by_key(rows, date_str, index=None, scope="code", drop_seen=True):
+    """
+    按 identity_key 精确去重，参数和返回值与 collapse 相同。
+    同一标识保留最后出现的一条（同一天多次抓取时即最新的快照），位置取第一次出现处；
+    其余记录中与代表记录不同的链接放入 alternate_links。
+    """
+    groups = {}
+    for row in rows:
+        groups.setdefault(identity_key(scope, row), []).append(row)
+
+    seen = index.history_keys(scope, date_str) if index is not None else {}
+    result, today_items = [], []
+    for key, members in groups.items():
+        row = dict(members[-1])
+        links = []
+        for member in members:
+            link = member.get("link")
+            if link and link != row.get("link") and link not in links:
+                links.append(link)
+        row["alternate_links"] = links
+        today_items.append((key, row.get("link")))
+        if key in seen:
+            row["seen_before"] = seen[key]
+            if drop_seen:
+                continue
+        result.append(row)
+
+    if index is not None:
+        index.replace_day_keys(scope, date_str, today_items)
+    return result
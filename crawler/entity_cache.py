@@ -0,0 +1,103 @@
+'''
+X（Twitter）用户资料与媒体信息的持久化缓存（SQLite），按 (类别, ID) 存放接口返回的原始字段。
+跨页、跨运行共享：已缓存的作者不再通过 expansions 随每页搜索结果返回，缺失的作者再批量查询。
+每个类别最多保留 MAX_ENTRIES 条，超出时按最近使用时间淘汰最旧的（LRU）。
+    user       用户 ID -> {id, username, name}
+    username   小写用户名 -> 同上（解析白名单作者的 ID）
+    media      media_key -> {media_key, type, url, preview_image_url}
+'''
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from crawler import metrics
+from crawler.config import CACHE_DIR
+
+ENTITY_DB = os.path.join(CACHE_DIR, "x_entities.db")
+MAX_ENTRIES = 50000
+
+
+class EntityCache:
+    def __init__(self, path=ENTITY_DB, max_entries=MAX_ENTRIES):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entities ("
+            " kind TEXT NOT NULL,"
+            " id TEXT NOT NULL,"
+            " data TEXT NOT NULL,"
+            " last_used REAL NOT NULL,"
+            " PRIMARY KEY (kind, id))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entities_lru ON entities (kind, last_used)")
+        self._conn.commit()
+
+    def get_many(self, kind, ids):
+        """返回 {id: 字段字典}，只包含已缓存的 ID；命中的条目刷新最近使用时间"""
+        ids = list(dict.fromkeys(str(i) for i in ids))
+        found = {}
+        with self._lock:
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT id, data FROM entities WHERE kind = ? AND id IN ({placeholders})",
+                    [kind, *chunk],
+                ).fetchall()
+                found.update((key, json.loads(data)) for key, data in rows)
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE entities SET last_used = ? WHERE kind = ? AND id = ?",
+                    [(now, kind, key) for key in found],
+                )
+                self._conn.commit()
+        for key in ids:
+            metrics.cache(f"x.{kind}", key in found)
+        return found
+
+    def put_many(self, kind, entities):
+        """entities 为 {id: 字段字典}"""
+        if not entities:
+            return
+        now = time.time()
+        rows = [(kind, str(key), json.dumps(data, ensure_ascii=False), now) for key, data in entities.items()]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO entities (kind, id, data, last_used) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (kind, id) DO UPDATE SET data = excluded.data, last_used = excluded.last_used",
+                rows,
+            )
+            self._evict(kind)
+            self._conn.commit()
+
+    def _evict(self, kind):
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM entities WHERE kind = ?", (kind,)).fetchone()
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM entities WHERE kind = ? AND id IN ("
+                " SELECT id FROM entities WHERE kind = ? ORDER BY last_used LIMIT ?)",
+                (kind, kind, count - self.max_entries),
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_entity_cache():
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = EntityCache()
+        return _default_cache
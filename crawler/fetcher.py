@@ -0,0 +1,66 @@
+'''
+并发抓取引擎：
+1. 请求经由 crawler.transport（按主机复用连接、超时、重试与熔断）
+2. 用 asyncio 并发执行各数据源的抓取任务，同一主机的并发数受 PER_HOST_LIMIT 限制
+3. 所有任务共享一个总耗时预算，某个源超时或出错只影响它自己
+'''
+
+import asyncio
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from crawler.config import PER_HOST_LIMIT, TOTAL_BUDGET
+from crawler.transport import get_transport
+
+
+def fetch(url, **kwargs):
+    """同步 GET（带超时、重试与熔断）并检查状态码"""
+    response = get_transport().get(url, **kwargs)
+    response.raise_for_status()
+    return response
+
+
+async def _run_job(job, semaphores, executor):
+    host = urlparse(job["url"]).hostname
+    async with semaphores[host]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, job["func"])
+
+
+async def _run_all(jobs, per_host_limit, total_timeout):
+    semaphores = defaultdict(lambda: asyncio.Semaphore(per_host_limit))
+    executor = ThreadPoolExecutor(max_workers=max(1, len(jobs)), thread_name_prefix="fetch")
+    tasks = {
+        job["name"]: asyncio.ensure_future(_run_job(job, semaphores, executor))
+        for job in jobs
+    }
+    try:
+        done, pending = await asyncio.wait(tasks.values(), timeout=total_timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+    finally:
+        # 不等待超时的线程，它们会在 REQUEST_TIMEOUT 内自行结束
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    results = {}
+    for name, task in tasks.items():
+        if not task.done() or task.cancelled():
+            results[name] = asyncio.TimeoutError(f"超出总耗时预算 {total_timeout}s")
+        elif task.exception() is not None:
+            results[name] = task.exception()
+        else:
+            results[name] = task.result()
+    return results
+
+
+def run_jobs(jobs, per_host_limit=PER_HOST_LIMIT, total_timeout=TOTAL_BUDGET):
+    """
+    并发执行抓取任务。
+    jobs 为字典列表：{"name": 任务名, "url": 用于按主机限流的地址, "func": 无参可调用对象}
+    返回 {任务名: 结果或异常}，单个任务失败不会抛出。
+    """
+    if not jobs:
+        return {}
+    return asyncio.run(_run_all(jobs, per_host_limit, total_timeout))
@@ -1,20 +1,41 @@
-import requests
-import re
+'''
+GitHub Trending 抓取：按日 / 周 / 月三个时间维度抓取上榜项目，过滤出 AI 相关项目，写出 CSV、Markdown 和列式存储。
+
+用法（在仓库根目录执行）：python -m crawler github [--sweep]（或 python -m crawler.github_trends）
+'''
+
 import os
 import datetime
-import pandas as pd
-from bs4 import BeautifulSoup
+import itertools
+from urllib.parse import quote, urlencode
+
+from crawler import metrics, store, textnorm
+from crawler.config import INCREMENTAL
+from crawler.fetcher import run_jobs
+from crawler.http_cache import fetch_records
+from crawler.keywords import KeywordMatcher
+from crawler.seen_index import get_index
+from crawler.streaming import write_csv
+from crawler.trending_parser import parse_trending
+from crawler.transport import get_transport
 
 # 保存路径
 BASE_PATH = "./generate_docs/github_trends"
-os.makedirs(BASE_PATH, exist_ok=True)
 
 # 获取当前日期
 TODAY = datetime.datetime.today().strftime("%Y%m%d")
 
-# AI关键词列表（可扩展）
+# AI关键词列表（可扩展）：英文词按整词匹配，词尾 * 表示前缀匹配
 AI_KEYWORDS = ['ai', 'artificial intelligence', 'machine learning', 'deep learning',
-               'neural', 'nlp', 'transformer', 'llm', 'chatgpt', 'gpt']
+               'neural*', 'nlp', 'transformer*', 'llm*', 'chatgpt', 'gpt*']
+AI_MATCHER = KeywordMatcher(AI_KEYWORDS)
+
+# 增量索引：同一趋势维度下的同一仓库、描述未变时不再重复写出
+SEEN_SOURCE = "github_trends"
+SEEN_KEY_FIELDS = ("趋势", "项目")
+SEEN_HASH_FIELDS = ("描述",)
+
+CSV_COLUMNS = ["趋势", "项目", "Stars", "描述", "链接"]
 
 # GitHub Trending 时间维度
 TRENDS = {
@@ -23,118 +44,207 @@ TRENDS = {
     "monthly": "近30日"
 }
 
+# 扫榜模式：时间维度 × 编程语言 × 自然语言 的组合矩阵，空字符串表示不限
+SWEEP_MATRIX = {
+    "since": ["daily", "weekly", "monthly"],
+    "language": ["", "python", "jupyter-notebook", "rust", "c++"],
+    "spoken_language": ["en"],
+}
+# 扫榜限速：平均每秒请求数、允许的突发数和并发数（失败重试由 crawler.transport 负责）
+SWEEP_RATE = 1.0
+SWEEP_BURST = 2
+SWEEP_CONCURRENCY = 4
 
-def parse_star_count(star_str):
-    """将 GitHub star 数格式如 '3.5k' 转为整数"""
-    star_str = star_str.strip().lower().replace(',', '')
-    if 'k' in star_str:
-        return int(float(star_str.replace('k', '')) * 1000)
-    elif 'm' in star_str:
-        return int(float(star_str.replace('m', '')) * 1000000)
-    return int(star_str)
-
-
-def fetch_trending(since='daily'):
-    url = f"https://github.com/trending?since={since}&spoken_language_code=en"
-    headers = {'User-Agent': 'Mozilla/5.0'}
-    res = requests.get(url, headers=headers)
-    soup = BeautifulSoup(res.text, 'html.parser')
-
-    articles = soup.find_all('article', class_='Box-row')
-    result = []
-
-    for article in articles:
-        # 获取 repo 名称
-        header = article.h2
-        if not header:
-            continue
+SWEEP_SOURCE = "github_sweep"
+SWEEP_COLUMNS = ["趋势", "项目", "Stars", "描述", "链接", "语言", "最佳排名"]
 
-        repo_link = header.find('a')
-        if not repo_link:
-            continue
 
-        repo = repo_link.get('href').strip('/')  # /owner/repo => owner/repo
-        author, name = repo.split('/')
+def trending_url(since='daily', language='', spoken_language='en'):
+    url = "https://github.com/trending"
+    if language:
+        url += "/" + quote(language, safe='')
+    params = {"since": since}
+    if spoken_language:
+        params["spoken_language_code"] = spoken_language
+    return f"{url}?{urlencode(params)}"
 
-        # 获取描述
-        desc_tag = article.find('p')
-        description = desc_tag.get_text(strip=True) if desc_tag else ""
 
-        # 获取 star 数
-        star_tag = article.find('a', href=lambda x: x and x.endswith('/stargazers'))
-        stars = parse_star_count(star_tag.text.strip()) if star_tag else 0
+def parse_page(content):
+    """解析趋势页并规范化描述（结果随 HTTP 缓存保存，304 时不再处理）"""
+    records = parse_trending(content)
+    for record in records:
+        record["description"] = textnorm.normalize_text(record["description"])
+    return records
 
-        full_url = f"https://github.com/{repo}"
-        result.append({
-            "repository": repo,
-            "author": author,
-            "name": name,
-            "description": description,
-            "url": full_url,
-            "stars": stars
-        })
 
-    return result
+def fetch_trending(since='daily', language='', spoken_language='en'):
+    # 页面未变化（304）时直接复用上次解析结果
+    url = trending_url(since, language, spoken_language)
+    with metrics.span("fetch", "github_trends"):
+        records, _ = fetch_records(url, parse_page, headers={'User-Agent': 'Mozilla/5.0'})
+    return records
 
 
 def is_ai_project(description):
-    desc = description.lower()
-    return any(keyword in desc for keyword in AI_KEYWORDS)
-
+    return AI_MATCHER.search(description)
 
-def save_to_csv_md(data_by_trend):
-    csv_rows = []
-    md_lines = ["# 📊 GitHub AI 项目趋势汇总（" + TODAY + "）\n"]
 
+def iter_csv_rows(data_by_trend):
+    """逐行产出 CSV 记录"""
     for trend_key, trend_label in TRENDS.items():
-        data = data_by_trend.get(trend_key, [])
-        if not data:
-            continue
-
-        md_lines.append(f"## ⭐ {trend_label}趋势\n")
-        md_lines.append("| 项目 | ⭐Stars | 描述 | 链接 |")
-        md_lines.append("|------|---------|------|------|")
-
-        for row in data:
-            csv_rows.append({
+        for row in data_by_trend.get(trend_key, []):
+            yield {
                 "趋势": trend_label,
                 "项目": row["repository"],
                 "Stars": row["stars"],
                 "描述": row["description"],
                 "链接": row["url"]
-            })
-            md_lines.append(
-                f"| `{row['repository']}` | {row['stars']} | {row['description'] or '无'} | [🔗链接]({row['url']}) |"
-            )
-
-        md_lines.append("\n")
-
-    # 保存 CSV
-    csv_path = os.path.join(BASE_PATH, f"github_trends_{TODAY}.csv")
-    df = pd.DataFrame(csv_rows)
-    df.to_csv(csv_path, index=False)
-    print(f"✅ 已保存 CSV：{csv_path}")
+            }
+
+
+def save_to_csv_md(data_by_trend, incremental=INCREMENTAL, date_str=None):
+    """写出当天（date_str，默认 TODAY）的 CSV 与列式存储，返回 CSV 新增条数"""
+    date_str = date_str or TODAY
+    csv_rows = iter_csv_rows(data_by_trend)
+
+    # 每次上榜快照都写入列式存储和归档索引（Star 历史依赖它）；
+    # CSV 在增量模式下只追加新上榜或描述变化的项目
+    csv_path = os.path.join(BASE_PATH, f"github_trends_{date_str}.csv")
+    csv_rows = store.tee(csv_rows, "github_trends", "code", store.github_record, date_str)
+    if incremental:
+        csv_rows = get_index().iter_new(SEEN_SOURCE, csv_rows, SEEN_KEY_FIELDS, SEEN_HASH_FIELDS)
+    with metrics.span("write", "github_trends"):
+        count = write_csv(csv_rows, csv_path, CSV_COLUMNS, append=incremental)
+    metrics.incr("items.written", count, "github_trends")
+    print(f"✅ 已保存 CSV：{csv_path}（新增 {count} 条）")
+    return count
+
+
+def fetch_ai_trending(since='daily'):
+    """抓取某一时间维度的趋势榜，只保留 AI 相关项目并按 stars 排序"""
+    trending = fetch_trending(since)
+    ai_related = [r for r in trending if is_ai_project(r['description'])]
+    # 按 stars 排序
+    ai_related.sort(key=lambda r: r.get("stars", 0), reverse=True)
+    return ai_related
+
+
+def sweep_dimensions(matrix=None):
+    """展开扫榜矩阵，返回 (since, language, spoken_language) 列表"""
+    matrix = matrix or SWEEP_MATRIX
+    return list(itertools.product(
+        matrix.get("since") or ["daily"],
+        matrix.get("language") or [""],
+        matrix.get("spoken_language") or [""],
+    ))
+
+
+def fetch_sweep(matrix=None, rate=SWEEP_RATE, concurrency=SWEEP_CONCURRENCY):
+    """并发抓取矩阵中的每个榜单，对 github.com 限速，失败的页面由传输层带抖动重试"""
+    get_transport().set_rate_limit("github.com", rate, SWEEP_BURST)
+
+    dims = sweep_dimensions(matrix)
+    jobs = [
+        {
+            "name": dim,
+            "url": trending_url(*dim),
+            "func": lambda dim=dim: fetch_trending(*dim),
+        }
+        for dim in dims
+    ]
+    results = run_jobs(jobs, per_host_limit=concurrency)
+
+    lists = {}
+    for dim in dims:
+        result = results[dim]
+        if isinstance(result, BaseException):
+            print(f"❌ 榜单 {trending_url(*dim)} 抓取失败：{result}")
+            continue
+        lists[dim] = result
+    return lists
+
+
+def merge_sweep(lists):
+    """
+    按仓库合并多个榜单：stars 取最大值，排名在每个维度上取最好（数值最小）的一次。
+    维度键形如 since:daily / language:python / spoken:en，不限语言记为 all。
+    """
+    merged = {}
+    for (since, language, spoken_language), records in lists.items():
+        dims = (f"since:{since}", f"language:{language or 'all'}", f"spoken:{spoken_language or 'all'}")
+        for rank, record in enumerate(records, 1):
+            key = record["repository"].lower()
+            item = merged.get(key)
+            if item is None:
+                item = merged[key] = dict(record, ranks={}, trends=set())
+            else:
+                item["stars"] = max(item["stars"], record["stars"])
+                item["language"] = item["language"] or record["language"]
+            item["trends"].add(since)
+            for dim in dims:
+                if rank < item["ranks"].get(dim, rank + 1):
+                    item["ranks"][dim] = rank
+
+    result = list(merged.values())
+    result.sort(key=lambda r: (min(r["ranks"].values()), -r["stars"]))
+    return result
 
-    # # 保存 Markdown
-    # md_path = os.path.join(BASE_PATH, f"github_trends_{TODAY}.md")
-    # with open(md_path, "w", encoding="utf-8") as f:
-    #     f.write("\n".join(md_lines))
-    # print(f"✅ 已保存 MD：{md_path}")
 
+def iter_sweep_rows(repos):
+    for repo in repos:
+        yield {
+            "趋势": "/".join(TRENDS.get(t, t) for t in TRENDS if t in repo["trends"]),
+            "项目": repo["repository"],
+            "Stars": repo["stars"],
+            "描述": repo["description"],
+            "链接": repo["url"],
+            "语言": repo["language"],
+            "最佳排名": " ".join(f"{dim}#{rank}" for dim, rank in sorted(repo["ranks"].items())),
+        }
+
+
+def sweep(matrix=None, incremental=INCREMENTAL, date_str=None):
+    """扫榜模式：并发抓取整个矩阵，按仓库去重合并后再做 AI 过滤并保存（date_str 默认 TODAY）"""
+    date_str = date_str or TODAY
+    dims = sweep_dimensions(matrix)
+    print(f"📡 正在扫榜 GitHub Trending：共 {len(dims)} 个榜单...")
+    lists = fetch_sweep(matrix)
+    repos = merge_sweep(lists)
+    ai_repos = [r for r in repos if is_ai_project(r['description'])]
+    print(f"🧠 {len(lists)} 个榜单共 {sum(map(len, lists.values()))} 条，去重后 {len(repos)} 个仓库，AI 项目 {len(ai_repos)} 个")
+
+    rows = iter_sweep_rows(ai_repos)
+    csv_path = os.path.join(BASE_PATH, f"github_sweep_{date_str}.csv")
+    rows = store.tee(rows, SWEEP_SOURCE, "code", store.github_record, date_str)
+    if incremental:
+        rows = get_index().iter_new(SWEEP_SOURCE, rows, ("项目",), SEEN_HASH_FIELDS)
+    with metrics.span("write", SWEEP_SOURCE):
+        count = write_csv(rows, csv_path, SWEEP_COLUMNS, append=incremental)
+    metrics.incr("items.written", count, SWEEP_SOURCE)
+    print(f"✅ 已保存 CSV：{csv_path}（新增 {count} 条）")
+    return csv_path, count
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="抓取 GitHub Trending AI 项目")
+    parser.add_argument("--sweep", action="store_true", help="按 SWEEP_MATRIX 扫描多语言、多时间维度的榜单")
+    args = parser.parse_args(argv)
+    if args.sweep:
+        sweep()
+        metrics.finish("github_sweep")
+        return
 
-def main():
     print("📡 正在抓取 GitHub Trending 页面...")
     data_by_trend = {}
 
     for trend_key in TRENDS.keys():
-        trending = fetch_trending(trend_key)
-        ai_related = [r for r in trending if is_ai_project(r['description'])]
-        # 按 stars 排序
-        ai_related.sort(key=lambda r: r.get("stars", 0), reverse=True)
-        data_by_trend[trend_key] = ai_related
-        print(f"🧠 {TRENDS[trend_key]}：共发现 AI 项目 {len(ai_related)} 个")
+        data_by_trend[trend_key] = fetch_ai_trending(trend_key)
+        print(f"🧠 {TRENDS[trend_key]}：共发现 AI 项目 {len(data_by_trend[trend_key])} 个")
 
     save_to_csv_md(data_by_trend)
+    metrics.finish("github_trends")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,226 @@
+'''
+基于 ETag / Last-Modified 的磁盘 HTTP 缓存。
+首次抓取时保存校验头、响应体以及解析出的记录；之后的请求带上
+If-None-Match / If-Modified-Since，服务端返回 304 时直接复用上次解析好的记录，跳过解析。
+响应体和记录都可以流式读写，大体积的源不需要整体载入内存。
+
+缓存目录结构（key 为 URL 的 sha1）：
+    <key>.json           校验头等元数据
+    <key>.body           响应体
+    <key>.records.jsonl  上次解析出的记录，每行一条
+'''
+
+import hashlib
+import json
+import os
+import time
+from collections import namedtuple
+from urllib.parse import urlparse
+
+from crawler import metrics
+from crawler.config import CACHE_DIR, REQUEST_TIMEOUT
+from crawler.transport import get_transport
+
+# 非流式请求 content 为完整响应体；流式请求 content 为 None，chunks 为分块迭代器
+CachedResponse = namedtuple("CachedResponse", "url status content not_modified chunks", defaults=(None,))
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _write_atomic(path, data):
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def iter_body(response):
+    """按块迭代响应体，兼容流式和非流式两种响应"""
+    if response.content is not None:
+        yield response.content
+    else:
+        yield from response.chunks
+
+
+class HttpCache:
+    def __init__(self, cache_dir=os.path.join(CACHE_DIR, "http")):
+        self.cache_dir = cache_dir
+
+    def _path(self, url, suffix):
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, key + suffix)
+
+    def _load_meta(self, url):
+        try:
+            with open(self._path(url, ".json"), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _conditional_get(self, url, session, kwargs):
+        """发送条件请求，返回 (requests 响应, 是否有可复用的缓存体)"""
+        headers = dict(kwargs.pop("headers", None) or {})
+        kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+
+        meta = self._load_meta(url)
+        has_body = meta is not None and os.path.exists(self._path(url, ".body"))
+        if has_body:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        client = session or get_transport()
+        return client.get(url, headers=headers, **kwargs), has_body
+
+    def _new_meta(self, url, response):
+        """根据响应头生成新的元数据；响应不带校验头时返回 None"""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not (etag or last_modified):
+            return None
+        return {"url": url, "etag": etag, "last_modified": last_modified, "saved_at": time.time()}
+
+    def _commit(self, url, meta):
+        """响应体已就位后再写入元数据，并作废旧的解析结果"""
+        try:
+            os.remove(self._path(url, ".records.jsonl"))
+        except OSError:
+            pass
+        _write_atomic(self._path(url, ".json"), json.dumps(meta).encode("utf-8"))
+
+    def _iter_cached_body(self, url):
+        with open(self._path(url, ".body"), "rb") as f:
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    return
+                yield chunk
+
+    def fetch(self, url, session=None, **kwargs):
+        """条件 GET：命中 304 时返回缓存的响应体，并标记 not_modified"""
+        host = urlparse(url).hostname
+        with metrics.span("download", host):
+            response, has_body = self._conditional_get(url, session, kwargs)
+            content = response.content
+        metrics.cache("http", response.status_code == 304 and has_body, host)
+        if response.status_code == 304 and has_body:
+            with open(self._path(url, ".body"), "rb") as f:
+                return CachedResponse(url, 304, f.read(), True)
+        response.raise_for_status()
+        metrics.incr("http.bytes", len(content), host)
+        meta = self._new_meta(url, response)
+        if meta is not None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            _write_atomic(self._path(url, ".body"), content)
+            self._commit(url, meta)
+        return CachedResponse(url, response.status_code, content, False)
+
+    def fetch_stream(self, url, session=None, **kwargs):
+        """
+        流式条件 GET：响应体以分块迭代器返回，边下载边写入缓存，
+        完整读完后才替换旧的缓存体。
+        """
+        host = urlparse(url).hostname
+        response, has_body = self._conditional_get(url, session, dict(kwargs, stream=True))
+        metrics.cache("http", response.status_code == 304 and has_body, host)
+        if response.status_code == 304 and has_body:
+            response.close()
+            return CachedResponse(url, 304, None, True, self._iter_cached_body(url))
+        response.raise_for_status()
+        meta = self._new_meta(url, response)
+        if meta is None:
+            return CachedResponse(url, response.status_code, None, False, self._count_bytes(
+                response.iter_content(CHUNK_SIZE), host))
+
+        def tee():
+            os.makedirs(self.cache_dir, exist_ok=True)
+            body_path = self._path(url, ".body")
+            tmp_path = f"{body_path}.tmp.{os.getpid()}"
+            with response, open(tmp_path, "wb") as f:
+                for chunk in self._count_bytes(response.iter_content(CHUNK_SIZE), host):
+                    f.write(chunk)
+                    yield chunk
+            os.replace(tmp_path, body_path)
+            self._commit(url, meta)
+
+        return CachedResponse(url, response.status_code, None, False, tee())
+
+    def _count_bytes(self, chunks, host):
+        size = 0
+        try:
+            for chunk in chunks:
+                size += len(chunk)
+                yield chunk
+        finally:
+            metrics.incr("http.bytes", size, host)
+
+    def iter_records(self, url):
+        """逐条读取上次从该 URL 解析出的记录，不存在时返回 None"""
+        path = self._path(url, ".records.jsonl")
+        if not os.path.exists(path):
+            return None
+
+        def read():
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    yield json.loads(line)
+
+        return read()
+
+    def load_records(self, url):
+        records = self.iter_records(url)
+        return None if records is None else list(records)
+
+    def tee_records(self, url, records):
+        """边产出记录边写入缓存；只有记录全部产出且该 URL 有校验头时才会生效"""
+        path = self._path(url, ".records.jsonl")
+        tmp_path = f"{path}.tmp.{os.getpid()}"
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                yield record
+        if self._load_meta(url) is not None:
+            os.replace(tmp_path, path)
+        else:
+            os.remove(tmp_path)
+
+    def save_records(self, url, records):
+        for _ in self.tee_records(url, records):
+            pass
+
+
+_default_cache = None
+
+
+def get_cache():
+    """进程内共享的默认缓存"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = HttpCache()
+    return _default_cache
+
+
+def fetch_cached(url, **kwargs):
+    return get_cache().fetch(url, **kwargs)
+
+
+def fetch_records(url, parse, **kwargs):
+    """
+    抓取 url 并用 parse(content) 解析为记录列表。
+    服务端返回 304 且存在缓存记录时直接复用，不再解析。
+    返回 (records, not_modified)。
+    """
+    cache = get_cache()
+    response = cache.fetch(url, **kwargs)
+    host = urlparse(url).hostname
+    if response.not_modified:
+        records = cache.load_records(url)
+        metrics.cache("records", records is not None, host)
+        if records is not None:
+            return records, True
+    with metrics.span("parse", host):
+        records = parse(response.content)
+    metrics.incr("items.parsed", len(records), host)
+    cache.save_records(url, records)
+    return records, response.not_modified
@@ -0,0 +1,126 @@
+'''
+多关键词匹配器：把整张词表编译成一个按前缀树展开的正则，一次扫描找出文本中所有命中的词。
+    英文词    前后带词边界（'ai' 不会命中 maintain / email）
+    英文前缀  词尾写 * 表示前缀匹配（'transformer*' 命中 transformers）
+    中文词    按子串匹配
+词表扩大到上千个词时正则按公共前缀合并分支，匹配耗时不随词数线性增长。
+供 is_ai_project、列式存储的主题标签和 ranking 的相关度打分共用。
+'''
+
+import re
+
+WORD_CHARS = "a-z0-9"
+
+# 主题 -> 关键词，写入列式存储时据此给每条记录打上全部命中的主题
+TOPICS = {
+    "llm": ["llm*", "large language model*", "language model*", "gpt*", "chatgpt", "chatbot*",
+            "prompt*", "大模型", "大语言模型", "语言模型"],
+    "agent": ["agent*", "agentic", "multi-agent", "tool use", "function calling", "mcp",
+              "智能体", "多智能体"],
+    "rag": ["rag", "retrieval-augmented", "retrieval augmented", "vector database*", "embedding*",
+            "检索增强", "向量数据库"],
+    "vision": ["computer vision", "diffusion", "image generation", "text-to-image", "video generation",
+               "object detection", "segmentation", "vlm*", "多模态", "图像生成", "视频生成", "视觉"],
+    "speech": ["speech", "tts", "asr", "text-to-speech", "speech recognition", "voice", "语音"],
+    "training": ["fine-tuning", "finetuning", "fine-tune*", "lora", "rlhf", "pretraining", "pre-training",
+                 "distillation", "微调", "预训练", "蒸馏", "强化学习"],
+    "inference": ["inference", "quantization", "quantized", "serving", "vllm", "gguf", "llama.cpp",
+                  "推理加速", "量化", "部署"],
+    "ml": ["ai", "artificial intelligence", "machine learning", "deep learning", "neural*",
+           "transformer*", "nlp", "pytorch", "tensorflow", "jax", "人工智能", "机器学习", "深度学习",
+           "神经网络"],
+    "robotics": ["robot*", "embodied", "机器人", "具身智能"],
+}
+
+
+def _trie_pattern(words):
+    """把若干词编译成按公共前缀合并的正则片段"""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = None
+    return _node_pattern(trie)
+
+
+def _node_pattern(node):
+    branches = [re.escape(char) + _node_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+    body = "|".join(branches)
+    if "" in node:
+        return f"(?:{body})?"
+    return body if len(branches) == 1 else f"(?:{body})"
+
+
+class KeywordMatcher:
+    """
+    terms 为词列表，或 {词: 附带值} 字典（例如主题名、权重）。
+    匹配前文本统一转小写，返回的词是词表中的原词（前缀词不带 *）。
+    """
+
+    def __init__(self, terms):
+        if not isinstance(terms, dict):
+            terms = {term: term for term in terms}
+        self.values = {}
+        self._prefixes = set()
+        exact, prefix, cjk = [], [], []
+        for term, value in terms.items():
+            term = term.lower().strip()
+            if term.endswith("*"):
+                term = term[:-1]
+                self._prefixes.add(term)
+                prefix.append(term)
+            elif term.isascii():
+                exact.append(term)
+            else:
+                cjk.append(term)
+            self.values[term] = value
+
+        patterns = []
+        if exact:
+            patterns.append(rf"(?<![{WORD_CHARS}])(?:{_trie_pattern(exact)})(?![{WORD_CHARS}])")
+        if prefix:
+            patterns.append(rf"(?<![{WORD_CHARS}])(?:{_trie_pattern(prefix)})[{WORD_CHARS}]*")
+        if cjk:
+            patterns.append(_trie_pattern(cjk))
+        # 空词表时编译一个永远不匹配的正则
+        self.pattern = re.compile("|".join(patterns) or r"(?!)")
+
+    def _canonical(self, matched):
+        if matched in self.values:
+            return matched
+        # 前缀词命中时匹配文本带有后缀，回退到最长的前缀词
+        for end in range(len(matched) - 1, 0, -1):
+            if matched[:end] in self._prefixes:
+                return matched[:end]
+        return matched
+
+    def finditer(self, text):
+        """依次产出文本中命中的词"""
+        for match in self.pattern.finditer((text or "").lower()):
+            yield self._canonical(match.group(0))
+
+    def search(self, text):
+        return self.pattern.search((text or "").lower()) is not None
+
+    def counts(self, text):
+        """{命中的词: 次数}"""
+        counts = {}
+        for term in self.finditer(text):
+            counts[term] = counts.get(term, 0) + 1
+        return counts
+
+    def tags(self, text):
+        """命中的词对应的附带值集合"""
+        return {self.values[term] for term in self.finditer(text)}
+
+
+TOPIC_MATCHER = KeywordMatcher({term: topic for topic, terms in TOPICS.items() for term in terms})
+
+
+def tag_topics(*texts):
+    """返回文本命中的全部主题（按 TOPICS 中的顺序）"""
+    found = TOPIC_MATCHER.tags(" \n ".join(text for text in texts if text))
+    return [topic for topic in TOPICS if topic in found]
@@ -0,0 +1,134 @@
+'''
+按内容寻址的大模型响应缓存。
+    prompt_key(model, prompt)        模型名 + 规范化后提示词的哈希，命中时不再请求模型
+    entries_key(model, kind, rows)   某个类别的记录集合的哈希（与顺序无关），
+                                     当天重跑时未变化的类别整体直接复用
+缓存文件存放在 <cache_dir>/<key>.json；读取命中时刷新 mtime，
+写入时按最长保留时间和总大小上限淘汰（先删过期的，再按最近使用时间删最旧的）。
+'''
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+from crawler import metrics
+from crawler.config import CACHE_DIR
+
+LLM_CACHE_DIR = os.path.join(CACHE_DIR, "llm")
+MAX_AGE_SECONDS = 7 * 24 * 3600
+MAX_TOTAL_BYTES = 50 * 1024 * 1024
+
+WHITESPACE_RE = re.compile(r'[ \t\r\f\v]+')
+BLANK_LINES_RE = re.compile(r'\n{3,}')
+
+
+def normalize_prompt(prompt):
+    """统一换行、压缩空白，避免无意义的格式差异导致缓存失效"""
+    prompt = prompt.replace("\r\n", "\n").strip()
+    prompt = WHITESPACE_RE.sub(" ", prompt)
+    prompt = "\n".join(line.strip() for line in prompt.split("\n"))
+    return BLANK_LINES_RE.sub("\n\n", prompt)
+
+
+def _sha256(*parts):
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(str(part).encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+def prompt_key(model, prompt):
+    return _sha256("prompt", model, normalize_prompt(prompt))
+
+
+def entries_key(model, kind, rows, *settings):
+    """记录集合的哈希；settings 用于区分会影响提示词的配置（如 token 预算）"""
+    row_hashes = sorted(
+        _sha256(row.get("title"), row.get("link"), row.get("description"), row.get("stars"))
+        for row in rows
+    )
+    return _sha256("entries", model, kind, *settings, *row_hashes)
+
+
+class LLMCache:
+    def __init__(self, cache_dir=LLM_CACHE_DIR, max_age=MAX_AGE_SECONDS, max_bytes=MAX_TOTAL_BYTES):
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.max_age:
+                os.remove(path)
+                raise OSError
+            with open(path, encoding="utf-8") as f:
+                text = json.load(f)["text"]
+            os.utime(path)
+        except (OSError, ValueError, KeyError):
+            with self._lock:
+                self.misses += 1
+            metrics.cache("llm", False)
+            return None
+        with self._lock:
+            self.hits += 1
+        metrics.cache("llm", True)
+        return text
+
+    def put(self, key, text, model=""):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.tmp.{threading.get_ident()}"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"model": model, "created": time.time(), "text": text}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self):
+        """删除过期条目；总大小仍超限时按最近使用时间从旧到新删除"""
+        with self._lock:
+            try:
+                names = [n for n in os.listdir(self.cache_dir) if n.endswith(".json")]
+            except OSError:
+                return
+            now = time.time()
+            entries = []
+            for name in names:
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                if now - stat.st_mtime > self.max_age:
+                    os.remove(path)
+                else:
+                    entries.append((stat.st_mtime, stat.st_size, path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                os.remove(path)
+                total -= size
+
+    def cached_call(self, key, call, model=""):
+        """命中则返回缓存，否则调用 call() 并写入缓存"""
+        text = self.get(key)
+        if text is None:
+            text = call()
+            if text:
+                self.put(key, text, model)
+        return text
+
+    def generate(self, generate, model, prompt):
+        """带缓存地调用 generate(prompt)"""
+        return self.cached_call(prompt_key(model, prompt), lambda: generate(prompt), model)
@@ -0,0 +1,197 @@
+'''
+轻量的运行指标：各阶段 / 各数据源的耗时、字节与条目计数、缓存命中率。
+进程内全局一份，线程安全；运行结束时调用 finish() 输出 JSON 汇总，
+配置了 PROMETHEUS_TEXTFILE_DIR 时同时写出 Prometheus textfile（供 node_exporter 采集）。
+
+    with metrics.span("fetch", "arxiv"):        # 计时一个阶段
+        ...
+    records = metrics.timed_iter(records, "parse", "arxiv")   # 只统计生成器内部耗时
+    metrics.incr("http.bytes", len(body), "export.arxiv.org")
+    metrics.cache("http", hit=True, source="arxiv")
+'''
+
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+from crawler.config import METRICS_DIR, PROMETHEUS_TEXTFILE_DIR
+
+_lock = threading.Lock()
+_started = time.time()
+# (阶段, 数据源) -> [次数, 总秒数, 最大秒数]
+_spans = {}
+# (指标名, 数据源) -> 数值
+_counters = {}
+
+
+def reset():
+    global _started
+    with _lock:
+        _started = time.time()
+        _spans.clear()
+        _counters.clear()
+
+
+def observe(stage, seconds, source=""):
+    """记录某阶段的一次耗时"""
+    with _lock:
+        entry = _spans.setdefault((stage, source or ""), [0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] = max(entry[2], seconds)
+
+
+@contextmanager
+def span(stage, source=""):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, time.perf_counter() - start, source)
+
+
+def timed_iter(iterable, stage, source="", counter=None):
+    """
+    包装生成器：只累计在其内部花费的时间（不含下游处理每条记录的时间），
+    counter 不为空时同时累计产出的条目数。
+    """
+    iterator = iter(iterable)
+    elapsed = 0.0
+    count = 0
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                elapsed += time.perf_counter() - start
+            count += 1
+            yield item
+    finally:
+        observe(stage, elapsed, source)
+        if counter:
+            incr(counter, count, source)
+
+
+def incr(name, value=1, source=""):
+    with _lock:
+        key = (name, source or "")
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def cache(name, hit, source=""):
+    """记录一次缓存访问，汇总时计算命中率"""
+    incr(f"cache.{name}.{'hit' if hit else 'miss'}", 1, source)
+
+
+def summary(run=""):
+    with _lock:
+        spans = [
+            {"stage": stage, "source": source, "count": count,
+             "total_seconds": round(total, 4), "max_seconds": round(longest, 4)}
+            for (stage, source), (count, total, longest) in sorted(_spans.items())
+        ]
+        counters = [
+            {"name": name, "source": source, "value": value}
+            for (name, source), value in sorted(_counters.items())
+        ]
+        cache_totals = {}
+        for (name, _), value in _counters.items():
+            if name.startswith("cache."):
+                cache_name, outcome = name[len("cache."):].rsplit(".", 1)
+                totals = cache_totals.setdefault(cache_name, {"hit": 0, "miss": 0})
+                totals[outcome] += value
+        started = _started
+
+    caches = {
+        name: dict(totals, hit_rate=round(totals["hit"] / (totals["hit"] + totals["miss"]), 4))
+        for name, totals in sorted(cache_totals.items())
+        if totals["hit"] + totals["miss"]
+    }
+    return {
+        "run": run,
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(started)),
+        "duration_seconds": round(time.time() - started, 3),
+        "spans": spans,
+        "counters": counters,
+        "caches": caches,
+    }
+
+
+def _metric_name(name):
+    return "crawler_" + re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+
+def _labels(**labels):
+    def escape(value):
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in labels.items() if value != "") + "}"
+
+
+def to_prometheus(data):
+    """把 summary() 的结果转换为 Prometheus 文本格式"""
+    run = data["run"]
+    lines = [
+        "# TYPE crawler_run_duration_seconds gauge",
+        f"crawler_run_duration_seconds{_labels(run=run)} {data['duration_seconds']}",
+        "# TYPE crawler_run_timestamp_seconds gauge",
+        f"crawler_run_timestamp_seconds{_labels(run=run)} {int(time.time())}",
+        "# TYPE crawler_stage_seconds_total counter",
+    ]
+    for item in data["spans"]:
+        labels = _labels(run=run, stage=item["stage"], source=item["source"])
+        lines.append(f"crawler_stage_seconds_total{labels} {item['total_seconds']}")
+    lines.append("# TYPE crawler_stage_calls_total counter")
+    for item in data["spans"]:
+        labels = _labels(run=run, stage=item["stage"], source=item["source"])
+        lines.append(f"crawler_stage_calls_total{labels} {item['count']}")
+
+    declared = set()
+    for item in data["counters"]:
+        metric = _metric_name(item["name"]) + "_total"
+        if metric not in declared:
+            lines.append(f"# TYPE {metric} counter")
+            declared.add(metric)
+        lines.append(f"{metric}{_labels(run=run, source=item['source'])} {item['value']}")
+
+    lines.append("# TYPE crawler_cache_hit_ratio gauge")
+    for name, totals in data["caches"].items():
+        lines.append(f"crawler_cache_hit_ratio{_labels(run=run, cache=name)} {totals['hit_rate']}")
+    return "\n".join(lines) + "\n"
+
+
+def _write_atomic(path, text):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def print_top(data, limit=8):
+    """按总耗时打印最慢的几个阶段"""
+    spans = sorted(data["spans"], key=lambda item: item["total_seconds"], reverse=True)[:limit]
+    for item in spans:
+        source = f"[{item['source']}]" if item["source"] else ""
+        print(f"   {item['stage']}{source}：{item['total_seconds']:.2f}s / {item['count']} 次")
+    for name, totals in data["caches"].items():
+        print(f"   缓存 {name} 命中率 {totals['hit_rate']:.0%}（{totals['hit']}/{totals['hit'] + totals['miss']}）")
+
+
+def finish(run):
+    """写出本次运行的 JSON 汇总（以及可选的 Prometheus textfile），返回汇总路径"""
+    data = summary(run)
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(time.time()))
+    path = os.path.join(METRICS_DIR, f"{run}_{stamp}.json")
+    _write_atomic(path, json.dumps(data, ensure_ascii=False, indent=2))
+    print(f"📈 运行指标已保存至：{path}")
+    print_top(data)
+    if PROMETHEUS_TEXTFILE_DIR:
+        prom_path = os.path.join(PROMETHEUS_TEXTFILE_DIR, f"daily_ai_{run}.prom")
+        _write_atomic(prom_path, to_prometheus(data))
+    return path
@@ -1,46 +1,14 @@
 '''
-书写一个python脚本，实现以下功能：
-1. 从https://36kr.com/feedl拉取数据
-2. 遍历所有的内容，按照这些标题进行整理汇总Date,Title,Authors,Categories,Description,Link
-3. 输出为csv文件，存储到./generate_docs/36kr文件夹下，文件名为36kr_<日期>.csv其中日期为当前日期，格式类似20250530
-'''
-
-import os
-import csv
-import datetime
-import feedparser
-import requests
-from io import BytesIO
-
-# Step 1: 拉取36Kr的RSS Feed数据
-headers = {
-    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0 Safari/537.36'
-}
-FEED_URL = "https://36kr.com/feed"
-response = requests.get(FEED_URL, headers=headers)
-feed = feedparser.parse(BytesIO(response.content))
+从 https://36kr.com/feed 拉取数据，整理为 Date,Title,Authors,Categories,Description,Link，
+输出到 ./generate_docs/36kr/36kr_<日期>.csv。
+配置见 crawler.sources.FEED_SOURCES["36kr"]，处理流程见 crawler.pipeline。
 
-# Step 2: 处理输出目录
-output_dir = "./generate_docs/36kr"
-os.makedirs(output_dir, exist_ok=True)
-
-# Step 3: 设置文件名
-today_str = datetime.datetime.now().strftime("%Y%m%d")
-output_file = os.path.join(output_dir, f"36kr_{today_str}.csv")
+用法（在仓库根目录执行）：python -m crawler.news.36kr，或 python -m crawler feeds 36kr
+'''
 
-# Step 4: 提取字段并写入CSV
-with open(output_file, mode="w", encoding="utf-8", newline="") as csvfile:
-    writer = csv.writer(csvfile)
-    writer.writerow(["Date", "Title", "Authors", "Categories", "Description", "Link"])
-    
-    for entry in feed.entries:
-        date = entry.get("published", "")
-        title = entry.get("title", "")
-        authors = ", ".join([author.name for author in entry.get("authors", [])]) if "authors" in entry else ""
-        categories = ", ".join([tag.term for tag in entry.get("tags", [])]) if "tags" in entry else ""
-        description = entry.get("summary", "").replace('\n', ' ').replace('\r', '')
-        link = entry.get("link", "")
-        
-        writer.writerow([date, title, authors, categories, description, link])
+from crawler import metrics
+from crawler.pipeline import crawl_feeds, report
 
-print(f"已保存36Kr日报至：{output_file}")
\ No newline at end of file
+if __name__ == "__main__":
+    report(crawl_feeds(["36kr"]))
+    metrics.finish("36kr")
@@ -0,0 +1,174 @@
+'''
+RSS 数据源的统一处理流程：条件抓取 -> feedparser 解析 -> 字段抽取 -> 写入 CSV。
+服务端返回 304 时跳过解析，直接复用 HTTP 缓存中的记录。
+开启增量模式时只把未见过或内容有变化的条目追加到当天的 CSV 中。
+写出的记录同时追加到按日期/数据源分区的列式存储（crawler.store）中。
+所有注册在 crawler.sources.FEED_SOURCES 中的源共用这一条流程，
+在同一进程内先并发抓取，再批量解析和写出。
+
+各阶段都是生成器，记录逐条流过。配置了 "stream": True 的源（大体积的归档 feed）
+会在抓取任务中直接流式下载、增量解析并写盘，下载尚未结束时第一批记录就已落盘。
+'''
+
+import datetime
+import os
+from io import BytesIO
+
+from crawler import metrics, store, textnorm
+from crawler.config import INCREMENTAL
+from crawler.fetcher import run_jobs
+from crawler.http_cache import get_cache, iter_body
+from crawler.seen_index import get_index
+from crawler.sources import FEED_SOURCES, fieldnames
+from crawler.streaming import bounded, iter_feed_entries, write_csv
+
+# 增量索引的键与内容哈希字段
+KEY_FIELDS = ("Link",)
+
+
+def fetch_feed(name):
+    """条件抓取某个数据源，返回 http_cache.CachedResponse"""
+    with metrics.span("fetch", name):
+        return get_cache().fetch(FEED_SOURCES[name]["url"])
+
+
+def parse_entries(content):
+    # feedparser 导入较慢，只在确实需要解析（非 304、非流式）时才导入
+    import feedparser
+
+    return feedparser.parse(BytesIO(content)).entries
+
+
+def iter_entries(name, response):
+    """流式源走增量解析，其余源走 feedparser"""
+    if FEED_SOURCES[name].get("stream"):
+        return iter_feed_entries(iter_body(response))
+    return iter(parse_entries(response.content))
+
+
+def entry_to_record(entry, source):
+    """把一条 feedparser 条目转换为输出记录；标题和正文的清洗在 textnorm 中成批进行"""
+    if entry.get("authors"):
+        authors = ", ".join(a.get("name", "") for a in entry["authors"])
+    else:
+        authors = entry.get("author") or source["default_authors"]
+
+    if entry.get("tags"):
+        categories = ", ".join(tag["term"] for tag in entry["tags"] if tag.get("term"))
+    else:
+        categories = entry.get("category") or source["default_categories"]
+
+    return {
+        "Date": entry.get("published", ""),
+        "Title": entry.get("title", ""),
+        "Authors": authors,
+        "Categories": categories,
+        source["text_field"]: entry.get("summary", ""),
+        "Link": entry.get("link", ""),
+    }
+
+
+def today():
+    return datetime.datetime.now().strftime("%Y%m%d")
+
+
+def output_path(source, date_str=None):
+    date_str = date_str or today()
+    return os.path.join(source["output_dir"], f"{source['file_prefix']}_{date_str}.csv")
+
+
+def feed_records(name, response):
+    """把抓取结果逐条转换为记录；304 时直接复用上次解析的记录"""
+    source = FEED_SOURCES[name]
+    cache = get_cache()
+    if response.not_modified:
+        records = cache.iter_records(response.url)
+        metrics.cache("records", records is not None, name)
+        if records is not None:
+            return records
+    records = (entry_to_record(entry, source) for entry in iter_entries(name, response))
+    # 流式源的解析耗时包含边下载边解析的等待时间
+    records = metrics.timed_iter(records, "parse", name, counter="items.parsed")
+    records = textnorm.normalize_records(
+        records, source["text_field"], max_chars=source.get("max_chars", textnorm.MAX_CHARS), source=name)
+    return cache.tee_records(response.url, records)
+
+
+def process_feed(name, response, date_str=None, incremental=INCREMENTAL):
+    """处理某个数据源的抓取结果并写入 CSV，返回 (输出路径, 写入条目数)"""
+    with metrics.span("process", name):
+        path, count = _process_feed(name, response, date_str, incremental)
+    metrics.incr("items.written", count, name)
+    return path, count
+
+
+def _process_feed(name, response, date_str, incremental):
+    source = FEED_SOURCES[name]
+    records = feed_records(name, response)
+    path = output_path(source, date_str)
+    if source.get("stream"):
+        # 下载和解析在后台线程中进行，与写盘并行
+        records = bounded(records)
+    if incremental:
+        hash_fields = ("Title", source["text_field"])
+        records = get_index().iter_new(name, records, KEY_FIELDS, hash_fields)
+    records = store.tee(
+        records, name, source["kind"],
+        lambda record: store.feed_record(record, source["text_field"]),
+        date_str or today(),
+    )
+    return path, write_csv(records, path, fieldnames(source), append=incremental)
+
+
+def crawl_stream(name, date_str=None, incremental=INCREMENTAL):
+    """流式源：在同一个任务内完成下载、增量解析与写盘"""
+    response = get_cache().fetch_stream(FEED_SOURCES[name]["url"])
+    return process_feed(name, response, date_str, incremental)
+
+
+def feed_jobs(names=None, date_str=None, incremental=INCREMENTAL):
+    """为 run_jobs 构造抓取任务"""
+    names = names or list(FEED_SOURCES)
+    jobs = []
+    for name in names:
+        if FEED_SOURCES[name].get("stream"):
+            func = lambda name=name: crawl_stream(name, date_str, incremental)
+        else:
+            func = lambda name=name: fetch_feed(name)
+        jobs.append({"name": name, "url": FEED_SOURCES[name]["url"], "func": func})
+    return jobs
+
+
+def process_results(results, date_str=None, incremental=INCREMENTAL):
+    """批量处理 run_jobs 的抓取结果，返回 {数据源: (输出路径, 条目数) 或异常}"""
+    outputs = {}
+    for name, response in results.items():
+        if name not in FEED_SOURCES:
+            continue
+        if isinstance(response, BaseException) or FEED_SOURCES[name].get("stream"):
+            # 抓取失败，或流式源已在抓取任务中处理完毕
+            outputs[name] = response
+            continue
+        try:
+            outputs[name] = process_feed(name, response, date_str, incremental)
+        except Exception as e:
+            outputs[name] = e
+    return outputs
+
+
+def crawl_feeds(names=None, date_str=None, incremental=INCREMENTAL):
+    """并发抓取并批量处理指定的数据源（默认全部）"""
+    return process_results(run_jobs(feed_jobs(names, date_str, incremental)), date_str, incremental)
+
+
+def report(outputs):
+    """打印处理结果，返回失败的数据源列表"""
+    failed = []
+    for name, result in outputs.items():
+        if isinstance(result, BaseException):
+            failed.append(name)
+            print(f"❌ {name} 处理失败：{type(result).__name__}: {result}")
+        else:
+            path, count = result
+            print(f"✅ {name} 新增 {count} 条，已保存至：{path}")
+    return failed
@@ -0,0 +1,184 @@
+'''
+按 token 预算打包日报提示词。
+1. 粗略估算每条记录的 token 数，过长的摘要/描述截断到 MAX_FIELD_TOKENS
+2. 每个类别单独成一个请求；超出预算的类别拆成多个 map 请求，各自初筛候选
+3. 再用 reduce 请求从所有候选中选出最终结果（候选过多时逐层 reduce）
+每个请求都控制在 budget 以内，三个类别可以并发请求。
+每条记录带编号 [id]，模型只返回 JSON 格式的选择结果（编号 + 推荐理由、概述等字段），
+标题、链接、Star 数等原始字段由本地渲染（crawler.report_render），不再由模型排版成表格。
+'''
+
+import json
+import re
+
+# 单个请求的 token 预算（含说明文字）
+PROMPT_TOKEN_BUDGET = 8000
+# 单条记录中摘要/描述字段的 token 上限
+MAX_FIELD_TOKENS = 160
+# 单个请求最多采纳的选择条数（超出部分丢弃，保证逐层 reduce 收敛）
+MAX_PICKS = 8
+
+CJK_RE = re.compile(r'[\u3000-\u9fff\uac00-\ud7af\uff00-\uffef]')
+
+CATEGORY_LABELS = {
+    "news": "新闻资讯",
+    "paper": "arXiv论文",
+    "code": "GitHub代码",
+}
+
+CATEGORY_INSTRUCTIONS = {
+    "news": (
+        "- 从以下新闻中选出你认为最重要的最多5条；\n"
+        "- 每条给出：reason（推荐理由）、summary（内容概述，100字以内）、category（类别）；\n"
+    ),
+    "paper": (
+        "- 从以下论文中筛选出最多5篇（如内容极其重要可略微超过），重点关注RAG、大模型、模型优化、知名作者或机构；\n"
+        "- 每篇给出：title_zh（中文标题）、reason（推荐原因）、summary（论文概述，不超过100字）；\n"
+    ),
+    "code": (
+        "- 分析以下代码仓的功能，筛选不超过5个值得推荐的项目；重点关注RAG工具、模型工具相关内容；\n"
+        "- 每个给出：reason（推荐理由）、summary（中文简要概述）；\n"
+    ),
+}
+
+# 模型返回的各类别字段（id 之外）
+CATEGORY_FIELDS = {
+    "news": ("reason", "summary", "category"),
+    "paper": ("title_zh", "reason", "summary"),
+    "code": ("reason", "summary"),
+}
+
+PROMPT_HEADER = "你是一名专业的信息分析助手，请分析以下{label}数据并筛选推荐内容。\n\n"
+PROMPT_FOOTER = (
+    "每条记录开头的 [数字] 是编号。全部使用中文，只输出 JSON，不要输出其它内容，格式为：\n"
+    '{{"items": [{{"id": 编号, {fields}}}]}}\n'
+)
+
+MAP_NOTE = "（这是第 {index}/{total} 批候选，请先从本批中筛选，后续会汇总）\n"
+REDUCE_NOTE = "以下是从多批数据中分别初筛出的候选，请按同样的要求给出最终推荐。\n\n"
+
+
+def estimate_tokens(text):
+    """粗略估算 token 数：中日韩字符按 1 个 token，其它字符按 4 个字符 1 个 token"""
+    if not text:
+        return 0
+    cjk = len(CJK_RE.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+def truncate(text, max_tokens):
+    """把文本截断到约 max_tokens 个 token，尽量在句子边界处截断"""
+    text = (text or "").strip()
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if estimate_tokens(text[:mid]) <= max_tokens:
+            lo = mid
+        else:
+            hi = mid - 1
+    cut = text[:lo]
+    boundary = max(cut.rfind(p) for p in ("。", ". ", "！", "？", "; ", "；"))
+    if boundary > lo // 2:
+        cut = cut[:boundary + 1]
+    return cut.rstrip() + "…"
+
+
+def format_entry(row, max_field_tokens=MAX_FIELD_TOKENS, entry_id=None):
+    """把统一字段的记录格式化为一行，过长的描述会被截断；entry_id 为模型回传的编号"""
+    description = truncate(row.get("description") or "", max_field_tokens)
+    if row.get("kind") == "code":
+        values = [row.get("categories"), row.get("title"), row.get("stars"), description, row.get("link")]
+    else:
+        values = [row.get("published"), row.get("title"), row.get("authors"), row.get("categories"),
+                  description, row.get("link")]
+    prefix = "- " if entry_id is None else f"- [{entry_id}] "
+    line = prefix + ", ".join("" if v is None else str(v) for v in values)
+    if row.get("alternate_links"):
+        # 近似重复聚合后的其它来源，便于模型判断热度
+        line += f"（另有 {len(row['alternate_links'])} 个来源报道）"
+    return line
+
+
+def _category_prompt(kind, lines, note=""):
+    fields = ", ".join(f'"{field}": "..."' for field in CATEGORY_FIELDS[kind])
+    return (
+        PROMPT_HEADER.format(label=CATEGORY_LABELS[kind])
+        + f"【{CATEGORY_LABELS[kind]}】\n" + note + CATEGORY_INSTRUCTIONS[kind] + "\n"
+        + "\n".join(lines) + "\n\n"
+        + PROMPT_FOOTER.format(fields=fields)
+    )
+
+
+def pack_lines(lines, budget):
+    """把记录行按顺序装箱，每箱的 token 数不超过 budget（单行超预算时独占一箱）"""
+    chunks, current, used = [], [], 0
+    for line in lines:
+        cost = estimate_tokens(line) + 1
+        if current and used + cost > budget:
+            chunks.append(current)
+            current, used = [], 0
+        current.append(line)
+        used += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _build_prompts(kind, rows, note, budget, max_field_tokens):
+    lines = [format_entry(row, max_field_tokens, i) for i, row in enumerate(rows, 1)]
+    overhead = estimate_tokens(_category_prompt(kind, [], note + MAP_NOTE.format(index=99, total=99)))
+    chunks = pack_lines(lines, max(budget - overhead, 1))
+    if len(chunks) == 1:
+        return [_category_prompt(kind, chunks[0], note)]
+    return [
+        _category_prompt(kind, chunk, note + MAP_NOTE.format(index=i, total=len(chunks)))
+        for i, chunk in enumerate(chunks, 1)
+    ]
+
+
+def build_map_prompts(kind, rows, budget=PROMPT_TOKEN_BUDGET, max_field_tokens=MAX_FIELD_TOKENS):
+    """为某个类别生成一个或多个 map 提示词，每个都不超过 budget；记录编号为其在 rows 中的序号（从 1 开始）"""
+    if not rows:
+        return []
+    return _build_prompts(kind, rows, "", budget, max_field_tokens)
+
+
+def build_reduce_prompts(kind, candidates, budget=PROMPT_TOKEN_BUDGET, max_field_tokens=MAX_FIELD_TOKENS):
+    """
+    用各个 map 请求选出的候选记录重新生成提示词，编号规则与 build_map_prompts 相同。
+    返回多个提示词时，调用方需要对其结果继续 reduce，直到只剩一个。
+    """
+    return _build_prompts(kind, candidates, REDUCE_NOTE, budget, max_field_tokens)
+
+
+def parse_selection(kind, text, count):
+    """
+    解析模型返回的 JSON 选择结果，返回 [(序号, {字段: 值}), ...]（序号从 0 开始）。
+    忽略越界或重复的编号，最多 MAX_PICKS 条；不是合法 JSON 时返回 None。
+    """
+    text = (text or "").strip()
+    if text.startswith("```"):
+        text = text.strip("`").strip()
+        if text.startswith("json"):
+            text = text[4:]
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return None
+    items = data.get("items") if isinstance(data, dict) else data
+    if not isinstance(items, list):
+        return None
+    picks, seen = [], set()
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        try:
+            index = int(item.get("id")) - 1
+        except (TypeError, ValueError):
+            continue
+        if 0 <= index < count and index not in seen:
+            seen.add(index)
+            picks.append((index, {field: str(item.get(field) or "").strip() for field in CATEGORY_FIELDS[kind]}))
+    return picks[:MAX_PICKS]
@@ -0,0 +1,123 @@
+'''
+调用大模型之前的本地打分与筛选：
+    相关度   TOPIC_TERMS 中的关键词按 TF-IDF 加权（IDF 在当天同类记录上计算）
+    热度     GitHub star 数（取对数）
+    白名单   知名作者 / 机构
+    去重     标题高度相似的记录只保留得分最高的一条
+每个类别只把得分最高的 TOP_K 条交给模型。
+'''
+
+import math
+import re
+
+from crawler.keywords import KeywordMatcher
+
+# 关注主题关键词 -> 权重
+TOPIC_TERMS = {
+    "rag": 3.0, "retrieval-augmented": 3.0, "retrieval augmented": 3.0, "检索增强": 3.0,
+    "llm": 2.5, "large language model": 2.5, "大模型": 2.5, "大语言模型": 2.5,
+    "agent": 1.5, "智能体": 1.5,
+    "quantization": 2.0, "量化": 2.0, "distillation": 2.0, "蒸馏": 2.0,
+    "pruning": 1.5, "剪枝": 1.5, "inference": 1.5, "推理": 1.0,
+    "fine-tuning": 1.5, "finetuning": 1.5, "微调": 1.5,
+    "embedding": 1.5, "vector database": 2.0, "向量数据库": 2.0,
+    "transformer": 1.0, "multimodal": 1.0, "多模态": 1.0,
+    "benchmark": 0.5, "reasoning": 1.0,
+}
+
+AUTHOR_ALLOWLIST = {
+    "yann lecun", "geoffrey hinton", "yoshua bengio", "andrew ng", "jeff dean",
+    "ilya sutskever", "percy liang", "christopher d. manning", "kaiming he",
+}
+
+INSTITUTION_ALLOWLIST = {
+    "openai", "deepmind", "google", "meta", "microsoft", "anthropic", "nvidia",
+    "stanford", "berkeley", "mit", "cmu", "tsinghua", "peking university",
+    "清华", "北大", "阿里", "腾讯", "字节", "百度", "智谱", "月之暗面", "deepseek",
+}
+
+# 各类别交给模型的候选条数
+TOP_K = {"news": 30, "paper": 40, "code": 20}
+
+# 标题 token 集合的 Jaccard 相似度超过该阈值视为重复
+DUPLICATE_THRESHOLD = 0.8
+
+WEIGHT_RELEVANCE = 1.0
+WEIGHT_STARS = 0.6
+WEIGHT_ALLOWLIST = 2.0
+
+TOKEN_RE = re.compile(r'[a-z0-9]+|[\u4e00-\u9fff]')
+
+
+TOPIC_MATCHER = KeywordMatcher(TOPIC_TERMS)
+AUTHOR_MATCHER = KeywordMatcher(AUTHOR_ALLOWLIST)
+INSTITUTION_MATCHER = KeywordMatcher(INSTITUTION_ALLOWLIST)
+
+
+def _text(row):
+    return f"{row.get('title') or ''} {row.get('description') or ''}".lower()
+
+
+def term_counts(text):
+    return TOPIC_MATCHER.counts(text)
+
+
+def title_tokens(title):
+    return frozenset(TOKEN_RE.findall((title or "").lower()))
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def score_rows(rows):
+    """返回与 rows 一一对应的得分列表"""
+    docs = [term_counts(_text(row)) for row in rows]
+    n = len(docs)
+    df = {}
+    for counts in docs:
+        for term in counts:
+            df[term] = df.get(term, 0) + 1
+    idf = {term: math.log((n + 1) / (count + 1)) + 1 for term, count in df.items()}
+
+    max_stars = max((row.get("stars") or 0 for row in rows), default=0)
+    scores = []
+    for row, counts in zip(rows, docs):
+        relevance = sum(
+            TOPIC_TERMS[term] * (1 + math.log(count)) * idf[term]
+            for term, count in counts.items()
+        )
+        stars = row.get("stars") or 0
+        popularity = math.log1p(stars) / math.log1p(max_stars) if max_stars else 0.0
+        allowlisted = AUTHOR_MATCHER.search(row.get("authors")) or INSTITUTION_MATCHER.search(_text(row))
+        scores.append(
+            WEIGHT_RELEVANCE * relevance
+            + WEIGHT_STARS * popularity * 10
+            + WEIGHT_ALLOWLIST * allowlisted * 5
+        )
+    return scores
+
+
+def suppress_duplicates(ranked, threshold=DUPLICATE_THRESHOLD):
+    """ranked 已按得分降序排列；与已保留记录标题高度相似的记录被丢弃"""
+    kept, kept_tokens = [], []
+    for row in ranked:
+        tokens = title_tokens(row.get("title"))
+        if any(jaccard(tokens, other) >= threshold for other in kept_tokens):
+            continue
+        kept.append(row)
+        kept_tokens.append(tokens)
+    return kept
+
+
+def select_top(kind, rows, k=None):
+    """为某个类别打分、去重并返回得分最高的 k 条（保持得分降序）"""
+    if not rows:
+        return []
+    k = TOP_K.get(kind, 30) if k is None else k
+    scores = score_rows(rows)
+    order = sorted(range(len(rows)), key=lambda i: scores[i], reverse=True)
+    ranked = [dict(rows[i], score=round(scores[i], 3)) for i in order]
+    return suppress_duplicates(ranked)[:k]
@@ -0,0 +1,199 @@
+'''
+日报本地渲染：把每个类别选中的条目（原始字段 + 模型给出的推荐理由、概述等）
+用 string.Template 模板渲染为 Markdown、HTML、JSON Feed 和 RSS 四种格式。
+每个类别的结果一到就提交各格式的渲染任务并发执行，全部类别完成后按固定顺序拼接写出。
+'''
+
+import hashlib
+import html
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from string import Template
+
+from crawler.prompt_builder import CATEGORY_LABELS
+
+SECTION_ORDER = ("news", "paper", "code")
+FORMATS = ("md", "html", "json", "rss")
+REPORT_TITLE = "AI 日报"
+# 日报发布地址，写入 RSS 的 <channel><link> 和 JSON Feed 的 home_page_url；未设置时省略
+REPORT_LINK = os.getenv("REPORT_LINK")
+
+# 各类别表格的列：(表头, 字段)；link 列渲染为链接
+COLUMNS = {
+    "news": [("标题", "title"), ("推荐理由", "reason"), ("内容概述", "summary"),
+             ("类别", "category"), ("链接", "link")],
+    "paper": [("论文标题（原标题）", "title"), ("论文标题（中文标题）", "title_zh"), ("推荐原因", "reason"),
+              ("论文概述", "summary"), ("论文链接", "link")],
+    "code": [("趋势", "categories"), ("项目名", "title"), ("Star数", "stars"), ("推荐理由", "reason"),
+             ("中文简要概述", "summary"), ("项目链接", "link")],
+}
+
+MD_SECTION = Template("## $label\n\n$header\n$divider\n$rows\n")
+MD_LINK = Template("[$text]($url)")
+HTML_SECTION = Template(
+    "<section>\n<h2>$label</h2>\n<table>\n<thead><tr>$header</tr></thead>\n<tbody>\n$rows\n</tbody>\n</table>\n</section>"
+)
+HTML_LINK = Template('<a href="$url">$text</a>')
+HTML_DOCUMENT = Template(
+    "<!DOCTYPE html>\n<html lang=\"zh-CN\">\n<head>\n<meta charset=\"utf-8\">\n<title>$title</title>\n"
+    "<style>table{border-collapse:collapse}th,td{border:1px solid #ccc;padding:4px 8px;vertical-align:top}</style>\n"
+    "</head>\n<body>\n<h1>$title</h1>\n$sections\n</body>\n</html>\n"
+)
+RSS_ITEM = Template(
+    "<item><title>$title</title>$link$guid"
+    "<category>$label</category><description>$description</description></item>"
+)
+RSS_LINK = Template("<link>$url</link>")
+RSS_GUID = Template('<guid isPermaLink="$permalink">$id</guid>')
+RSS_DOCUMENT = Template(
+    '<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0"><channel>\n'
+    "<title>$title</title>$link<description>$title</description><lastBuildDate>$date</lastBuildDate>\n"
+    "$items\n</channel></rss>\n"
+)
+
+
+def _md_cell(value):
+    return str(value if value is not None else "").replace("|", "\\|").replace("\n", " ").strip()
+
+
+def _md_row(kind, item):
+    cells = []
+    for _, field in COLUMNS[kind]:
+        value = _md_cell(item.get(field))
+        if field == "link" and value:
+            value = MD_LINK.substitute(text="链接", url=value)
+        cells.append(value)
+    return "| " + " | ".join(cells) + " |"
+
+
+def render_md(kind, items):
+    headers = [header for header, _ in COLUMNS[kind]]
+    return MD_SECTION.substitute(
+        label=CATEGORY_LABELS[kind],
+        header="| " + " | ".join(headers) + " |",
+        divider="|" + "---|" * len(headers),
+        rows="\n".join(_md_row(kind, item) for item in items),
+    )
+
+
+def _html_row(kind, item):
+    cells = []
+    for _, field in COLUMNS[kind]:
+        value = html.escape(str(item.get(field) if item.get(field) is not None else ""))
+        if field == "link" and value:
+            value = HTML_LINK.substitute(text="链接", url=value)
+        cells.append(f"<td>{value}</td>")
+    return "<tr>" + "".join(cells) + "</tr>"
+
+
+def render_html(kind, items):
+    return HTML_SECTION.substitute(
+        label=html.escape(CATEGORY_LABELS[kind]),
+        header="".join(f"<th>{html.escape(header)}</th>" for header, _ in COLUMNS[kind]),
+        rows="\n".join(_html_row(kind, item) for item in items),
+    )
+
+
+def _description(item):
+    parts = [item.get("title_zh"), item.get("summary"), item.get("reason") and f"推荐理由：{item['reason']}"]
+    return "\n".join(part for part in parts if part)
+
+
+def item_id(kind, item):
+    """条目的唯一标识：优先用链接；没有链接时用类别和标题的哈希，同一条目每次生成都相同"""
+    if item.get("link"):
+        return item["link"]
+    digest = hashlib.sha1(f"{kind}\n{item.get('title') or ''}".encode("utf-8")).hexdigest()
+    return f"urn:sha1:{digest}"
+
+
+def render_json(kind, items):
+    """JSON Feed 1.1 的 items"""
+    return [
+        {
+            "id": item_id(kind, item),
+            "url": item.get("link"),
+            "title": item.get("title"),
+            "content_text": _description(item),
+            "tags": [CATEGORY_LABELS[kind]],
+        }
+        for item in items
+    ]
+
+
+def render_rss(kind, items):
+    return "\n".join(
+        RSS_ITEM.substitute(
+            title=html.escape(str(item.get("title") or "")),
+            link=RSS_LINK.substitute(url=html.escape(item["link"])) if item.get("link") else "",
+            guid=RSS_GUID.substitute(
+                permalink="true" if item.get("link") else "false", id=html.escape(item_id(kind, item))),
+            label=html.escape(CATEGORY_LABELS[kind]),
+            description=html.escape(_description(item)),
+        )
+        for item in items
+    )
+
+
+RENDERERS = {"md": render_md, "html": render_html, "json": render_json, "rss": render_rss}
+
+
+class ReportRenderer:
+    """add_section 在类别结果到达时立即并发渲染各格式；write 按 SECTION_ORDER 拼接并写出"""
+
+    def __init__(self, date_str, formats=FORMATS):
+        self.date_str = date_str
+        self.formats = formats
+        self._sections = {}
+        self._executor = ThreadPoolExecutor(max_workers=len(formats))
+
+    def add_section(self, kind, items):
+        if not items:
+            return
+        self._sections[kind] = {fmt: self._executor.submit(RENDERERS[fmt], kind, items) for fmt in self.formats}
+
+    def _parts(self, fmt):
+        return [self._sections[kind][fmt].result() for kind in SECTION_ORDER if kind in self._sections]
+
+    def documents(self):
+        """返回 {扩展名: 文档内容}"""
+        title = f"{REPORT_TITLE} - {self.date_str}"
+        documents = {}
+        if "md" in self.formats:
+            documents["md"] = "\n".join(self._parts("md"))
+        if "html" in self.formats:
+            documents["html"] = HTML_DOCUMENT.substitute(
+                title=html.escape(title), sections="\n".join(self._parts("html")))
+        if "json" in self.formats:
+            feed = {
+                "version": "https://jsonfeed.org/version/1.1",
+                "title": title,
+                "items": [item for part in self._parts("json") for item in part],
+            }
+            if REPORT_LINK:
+                feed["home_page_url"] = REPORT_LINK
+            documents["json"] = json.dumps(feed, ensure_ascii=False, indent=2) + "\n"
+        if "rss" in self.formats:
+            documents["xml"] = RSS_DOCUMENT.substitute(
+                title=html.escape(title),
+                link=RSS_LINK.substitute(url=html.escape(REPORT_LINK)) if REPORT_LINK else "",
+                date=format_datetime(datetime.now(timezone.utc)),
+                items="\n".join(self._parts("rss")))
+        return documents
+
+    def write(self, reports_dir, name):
+        """写出 <reports_dir>/<name>.<扩展名>，返回写出的路径列表"""
+        os.makedirs(reports_dir, exist_ok=True)
+        paths = []
+        try:
+            for ext, content in self.documents().items():
+                path = os.path.join(reports_dir, f"{name}.{ext}")
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(content)
+                paths.append(path)
+        finally:
+            self._executor.shutdown()
+        return paths
@@ -0,0 +1,54 @@
+'''
+在同一进程内并发抓取所有数据源，替代 crawler_all.sh 中逐个启动脚本的方式。
+总耗时约等于最慢的那个源；某个源失败或超时不会影响其它源。
+RSS 源来自 crawler.sources.FEED_SOURCES，抓取完成后统一批量解析写出。
+
+用法：python -m crawler.run_all
+'''
+
+import time
+
+from crawler import github_trends, metrics
+from crawler.fetcher import run_jobs
+from crawler.pipeline import feed_jobs, process_results, report
+
+
+def github_jobs():
+    return [
+        {
+            "name": f"github_{trend_key}",
+            "url": github_trends.trending_url(trend_key),
+            "func": lambda since=trend_key: github_trends.fetch_ai_trending(since),
+        }
+        for trend_key in github_trends.TRENDS
+    ]
+
+
+def main():
+    print("🚀 开始并发抓取所有数据源...")
+    start = time.monotonic()
+    results = run_jobs(feed_jobs() + github_jobs())
+
+    outputs = process_results(results)
+    data_by_trend = {}
+    for name, result in results.items():
+        if not name.startswith("github_"):
+            continue
+        if isinstance(result, BaseException):
+            outputs[name] = result
+            continue
+        trend_key = name[len("github_"):]
+        data_by_trend[trend_key] = result
+        print(f"🧠 {github_trends.TRENDS[trend_key]}：共发现 AI 项目 {len(result)} 个")
+
+    if data_by_trend:
+        github_trends.save_to_csv_md(data_by_trend)
+
+    failed = report(outputs)
+    print(f"⏱️ 全部完成，耗时 {time.monotonic() - start:.1f}s，失败 {len(failed)} 个")
+    metrics.finish("crawl")
+    return 1 if len(failed) == len(results) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,252 @@
+'''
+常驻调度模式：在一个长期运行的进程内按各数据源自己的间隔轮询，
+模块只导入一次，HTTP 连接池（crawler.transport）在多次抓取之间复用。
+
+自适应轮询：
+    每次抓取后看是否有新条目（304 / 没有新条目视为未更新）
+    有更新   记录两次更新的间隔，平滑后取其 UPDATE_FRACTION 作为新的轮询间隔
+    未更新   轮询间隔乘以 BACKOFF
+间隔限制在各任务的 [min, max] 之间；学到的间隔与下次运行时间保存在 crawler.checkpoint 中，重启后沿用。
+任一数据源有新条目后，等待 REPORT_DEBOUNCE 秒（合并连续更新）再重新生成当天的日报。
+
+用法：python -m crawler daemon [--once] [--no-report]
+'''
+
+import os
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from crawler import metrics
+from crawler.checkpoint import get_checkpoints
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+
+# 任务名 -> 初始 / 最短 / 最长轮询间隔（秒）
+SCHEDULE = {
+    "qbitai": {"interval": 15 * MINUTE, "min": 5 * MINUTE, "max": 2 * HOUR},
+    "36kr": {"interval": 15 * MINUTE, "min": 5 * MINUTE, "max": 2 * HOUR},
+    "leiphone": {"interval": 30 * MINUTE, "min": 10 * MINUTE, "max": 4 * HOUR},
+    # arXiv 每个工作日更新一次
+    "arxiv": {"interval": 4 * HOUR, "min": HOUR, "max": 24 * HOUR},
+    "github_daily": {"interval": 2 * HOUR, "min": 30 * MINUTE, "max": 12 * HOUR},
+    "github_weekly": {"interval": 6 * HOUR, "min": 2 * HOUR, "max": 24 * HOUR},
+    "github_monthly": {"interval": 12 * HOUR, "min": 6 * HOUR, "max": 48 * HOUR},
+    "tweets": {"interval": 30 * MINUTE, "min": 10 * MINUTE, "max": 4 * HOUR},
+}
+
+BACKOFF = 1.5
+# 更新间隔的指数平滑系数，以及轮询间隔占平均更新间隔的比例
+GAP_SMOOTHING = 0.3
+UPDATE_FRACTION = 0.5
+MAX_WORKERS = 4
+REPORT_DEBOUNCE = 10 * MINUTE
+# 常驻进程的运行指标每隔这么久写出一次并清零
+METRICS_INTERVAL = HOUR
+
+
+def today():
+    return datetime.now().strftime("%Y%m%d")
+
+
+# === 各任务：返回 (新增条目数, 是否 304) ===
+
+def poll_feed(name):
+    from crawler.pipeline import crawl_stream, fetch_feed, process_feed
+    from crawler.sources import FEED_SOURCES
+
+    if FEED_SOURCES[name].get("stream"):
+        _, count = crawl_stream(name)
+        return count, False
+    response = fetch_feed(name)
+    _, count = process_feed(name, response)
+    return count, response.not_modified
+
+
+def poll_github(since):
+    from crawler import github_trends
+
+    data = github_trends.fetch_ai_trending(since)
+    # 常驻进程跨天运行，输出按本次抓取时的日期（不修改模块级的 TODAY）
+    return github_trends.save_to_csv_md({since: data}, date_str=today()), False
+
+
+def poll_tweets():
+    from crawler import tweet
+
+    return tweet.main(), False
+
+
+def default_jobs():
+    """任务名 -> 无参函数；没有 X 凭据时不轮询推文"""
+    from crawler.github_trends import TRENDS
+    from crawler.sources import FEED_SOURCES
+
+    jobs = {name: (lambda name=name: poll_feed(name)) for name in FEED_SOURCES}
+    jobs.update({f"github_{since}": (lambda since=since: poll_github(since)) for since in TRENDS})
+    if os.environ.get("TWITTER_BEARER_TOKEN"):
+        jobs["tweets"] = poll_tweets
+    return jobs
+
+
+def run_report():
+    import generate_daily_report
+
+    generate_daily_report.main(today())
+
+
+# === 自适应间隔 ===
+
+def next_interval(state, changed, now, limits):
+    """根据本次抓取结果更新 state（interval / gap / last_change），返回新的轮询间隔"""
+    interval = state.get("interval", limits["interval"])
+    if changed:
+        last_change = state.get("last_change")
+        if last_change:
+            gap = now - last_change
+            state["gap"] = gap if "gap" not in state else GAP_SMOOTHING * gap + (1 - GAP_SMOOTHING) * state["gap"]
+            interval = state["gap"] * UPDATE_FRACTION
+        else:
+            interval = limits["interval"]
+        state["last_change"] = now
+    else:
+        interval *= BACKOFF
+    state["interval"] = min(max(interval, limits["min"]), limits["max"])
+    return state["interval"]
+
+
+class Scheduler:
+    def __init__(self, jobs=None, schedule=SCHEDULE, report=True, report_debounce=REPORT_DEBOUNCE,
+                 checkpoints=None, clock=time.time):
+        self.jobs = jobs if jobs is not None else default_jobs()
+        self.schedule = schedule
+        self.report = report
+        self.report_debounce = report_debounce
+        self.checkpoints = checkpoints or get_checkpoints()
+        self.clock = clock
+        self.stop_event = threading.Event()
+        self.changed_at = None
+        self._lock = threading.Lock()
+        self._running = set()
+        now = clock()
+        self.state = {}
+        for name in self.jobs:
+            state = self.checkpoints.get(f"schedule:{name}") or {}
+            state.setdefault("next_run", now)
+            self.state[name] = state
+
+    def _limits(self, name):
+        return self.schedule.get(name, {"interval": HOUR, "min": 10 * MINUTE, "max": 24 * HOUR})
+
+    def run_job(self, name):
+        """执行一个任务并安排下一次运行，返回是否有更新"""
+        start = self.clock()
+        try:
+            with metrics.span("job", name):
+                count, not_modified = self.jobs[name]()
+            count = count or 0
+            error = None
+        except Exception as e:
+            count, not_modified, error = 0, False, e
+        now = self.clock()
+        with self._lock:
+            state = self.state[name]
+            if error is None:
+                interval = next_interval(state, count > 0, now, self._limits(name))
+            else:
+                # 失败时不调整学到的间隔，按最短间隔重试
+                interval = self._limits(name)["min"]
+            state["next_run"] = now + interval
+            self.checkpoints.save(f"schedule:{name}", state)
+            self._running.discard(name)
+            if count > 0:
+                self.changed_at = now
+        metrics.incr("scheduler.runs", 1, name)
+        metrics.incr("scheduler.not_modified", int(not_modified), name)
+        if error is not None:
+            print(f"❌ {name} 失败：{type(error).__name__}: {error}，{interval / MINUTE:.0f} 分钟后重试")
+        else:
+            status = "304 未变化" if not_modified else f"新增 {count} 条"
+            print(f"🔁 {name}：{status}，耗时 {now - start:.1f}s，下次 {interval / MINUTE:.0f} 分钟后")
+        return count > 0
+
+    def due_jobs(self, now):
+        with self._lock:
+            due = [name for name, state in self.state.items()
+                   if state["next_run"] <= now and name not in self._running]
+            self._running.update(due)
+        return due
+
+    def maybe_report(self, now, idle, force=False):
+        """
+        有新数据且已经 report_debounce 秒没有新的更新时生成日报；idle 表示没有正在运行的任务，
+        force 为 True 时不等待 report_debounce。
+        """
+        with self._lock:
+            changed_at = self.changed_at
+        if not self.report or changed_at is None or not idle:
+            return False
+        if not force and now - changed_at < self.report_debounce:
+            return False
+        with self._lock:
+            self.changed_at = None
+        print("📰 输入已更新，重新生成日报...")
+        try:
+            run_report()
+        except Exception as e:
+            print(f"❌ 日报生成失败：{type(e).__name__}: {e}")
+        return True
+
+    def seconds_until_next(self, now):
+        with self._lock:
+            waits = [state["next_run"] - now for name, state in self.state.items() if name not in self._running]
+            if self.report and self.changed_at is not None:
+                waits.append(self.changed_at + self.report_debounce - now)
+        # 最多睡一分钟，及时发现刚结束的任务带来的更新
+        return min(max(min(waits, default=MINUTE), 1), MINUTE)
+
+    def run(self, once=False):
+        """主循环；once 为 True 时每个任务只跑一次（并按需生成日报）后退出"""
+        print(f"🕰️ 调度器启动，任务：{', '.join(self.jobs)}")
+        metrics_flushed = self.clock()
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            futures = []
+            if once:
+                names = list(self.jobs)
+                with self._lock:
+                    self._running.update(names)
+                futures = [executor.submit(self.run_job, name) for name in names]
+                for future in futures:
+                    future.result()
+                self.maybe_report(self.clock(), idle=True, force=True)
+                return
+            while not self.stop_event.is_set():
+                now = self.clock()
+                futures = [f for f in futures if not f.done()]
+                futures += [executor.submit(self.run_job, name) for name in self.due_jobs(now)]
+                self.maybe_report(now, idle=not futures)
+                if now - metrics_flushed >= METRICS_INTERVAL:
+                    metrics.finish("daemon")
+                    metrics.reset()
+                    metrics_flushed = now
+                self.stop_event.wait(self.seconds_until_next(self.clock()))
+            print("🛑 调度器停止，等待正在运行的任务结束...")
+
+    def stop(self, *args):
+        self.stop_event.set()
+
+
+def main(once=False, report=True):
+    scheduler = Scheduler(report=report)
+    signal.signal(signal.SIGTERM, scheduler.stop)
+    signal.signal(signal.SIGINT, scheduler.stop)
+    scheduler.run(once=once)
+    metrics.finish("daemon")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
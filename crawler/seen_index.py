@@ -0,0 +1,139 @@
+'''
+已抓取条目的持久化索引（SQLite）。
+以「数据源 + 规范化链接/GUID」为键，记录内容哈希。爬虫每次只追加新出现或内容有变化的条目，
+同一天内重复抓取、以及跨天重复出现的条目（arXiv 交叉列表、连续多天上榜的仓库）都会被过滤掉。
+'''
+
+import datetime
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from crawler import metrics
+from crawler.config import CACHE_DIR
+from crawler.streaming import batched
+
+SEEN_DB = os.path.join(CACHE_DIR, "seen.db")
+
+ARXIV_VERSION_RE = re.compile(r'(/abs/[^/]+?)v\d+$')
+TRACKING_PARAMS = {"spm", "ref", "from"}
+
+
+def canonical_link(url):
+    """规范化链接：统一 https、小写主机名、去掉锚点/跟踪参数/末尾斜杠以及 arXiv 版本号"""
+    url = (url or "").strip()
+    if not url:
+        return ""
+    parts = urlsplit(url)
+    scheme = "https" if parts.scheme in ("http", "https") else parts.scheme
+    path = parts.path.rstrip("/")
+    if parts.netloc.lower().endswith("arxiv.org"):
+        path = ARXIV_VERSION_RE.sub(r'\1', path)
+    query = urlencode([
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not (k.lower().startswith("utm_") or k.lower() in TRACKING_PARAMS)
+    ])
+    return urlunsplit((scheme, parts.netloc.lower(), path, query, ""))
+
+
+def content_hash(record, fields):
+    h = hashlib.sha1()
+    for field in fields:
+        h.update(str(record.get(field, "")).strip().encode("utf-8"))
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+
+def item_key(record, key_fields):
+    values = [str(record.get(field, "")) for field in key_fields]
+    if key_fields and key_fields[-1] in ("Link", "链接", "url"):
+        values[-1] = canonical_link(values[-1])
+    return "|".join(values)
+
+
+class SeenIndex:
+    def __init__(self, path=SEEN_DB):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen ("
+            " source TEXT NOT NULL,"
+            " item_key TEXT NOT NULL,"
+            " content_hash TEXT NOT NULL,"
+            " first_seen TEXT NOT NULL,"
+            " last_seen TEXT NOT NULL,"
+            " PRIMARY KEY (source, item_key))"
+        )
+        self._conn.commit()
+
+    def _known_hashes(self, source, keys):
+        known = {}
+        keys = list(keys)
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT item_key, content_hash FROM seen WHERE source = ? AND item_key IN ({placeholders})",
+                [source] + chunk,
+            )
+            known.update(rows)
+        return known
+
+    def filter_new(self, source, records, key_fields, hash_fields):
+        """返回尚未见过或内容已变化的记录（不修改索引）"""
+        keyed = [(item_key(r, key_fields), content_hash(r, hash_fields), r) for r in records]
+        with self._lock:
+            known = self._known_hashes(source, {key for key, _, _ in keyed})
+        result = []
+        for key, digest, record in keyed:
+            if known.get(key) != digest:
+                known[key] = digest  # 同一批内的重复条目只保留第一条
+                result.append(record)
+        return result
+
+    def iter_new(self, source, records, key_fields, hash_fields, batch_size=500):
+        """
+        filter_new 的流式版本：按批查询索引，逐条产出新记录；
+        每批记录被下游取走后即登记到索引中。
+        """
+        for batch in batched(records, batch_size):
+            new_records = self.filter_new(source, batch, key_fields, hash_fields)
+            metrics.incr("seen.new", len(new_records), source)
+            metrics.incr("seen.skipped", len(batch) - len(new_records), source)
+            yield from new_records
+            self.mark_seen(source, new_records, key_fields, hash_fields)
+
+    def mark_seen(self, source, records, key_fields, hash_fields):
+        """写出成功后再把记录登记到索引中"""
+        now = datetime.datetime.now().isoformat(timespec="seconds")
+        rows = [(source, item_key(r, key_fields), content_hash(r, hash_fields), now, now) for r in records]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO seen (source, item_key, content_hash, first_seen, last_seen) VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT (source, item_key) DO UPDATE SET"
+                " content_hash = excluded.content_hash, last_seen = excluded.last_seen",
+                rows,
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_default_index = None
+_default_lock = threading.Lock()
+
+
+def get_index():
+    """进程内共享的默认索引"""
+    global _default_index
+    with _default_lock:
+        if _default_index is None:
+            _default_index = SeenIndex()
+    return _default_index
@@ -0,0 +1,59 @@
+'''
+RSS 数据源注册表。
+新增一个数据源只需要在 FEED_SOURCES 中加一项配置：
+    url                 RSS 地址
+    output_dir          CSV 输出目录
+    file_prefix         文件名前缀，输出为 <file_prefix>_<YYYYMMDD>.csv
+    kind                数据类别：paper 论文 / news 资讯（列式存储中的 kind 列）
+    text_field          正文列名（论文为 Abstract，资讯为 Description）
+    default_authors     条目没有作者信息时的默认值
+    default_categories  条目没有分类信息时的默认值
+    max_chars           可选，正文截断长度，默认 textnorm.MAX_CHARS，None 表示不截断
+    stream              可选，为 True 时流式下载并增量解析（适合大体积的归档 feed）
+'''
+
+FEED_SOURCES = {
+    "arxiv": {
+        "url": "https://export.arxiv.org/rss/cs.AI",
+        "output_dir": "./generate_docs/archive",
+        "file_prefix": "arxiv_ai",
+        "kind": "paper",
+        "text_field": "Abstract",
+        "default_authors": "Unknown",
+        "default_categories": "cs.AI",
+        # arXiv 的 RSS 一次返回当天全部论文，体积最大：边下载边解析，解析与写盘并行
+        "stream": True,
+    },
+    "qbitai": {
+        "url": "https://www.qbitai.com/feed",
+        "output_dir": "./generate_docs/qbitai",
+        "file_prefix": "qbitai",
+        "kind": "news",
+        "text_field": "Description",
+        "default_authors": "Qbitai",
+        "default_categories": "AI资讯",
+    },
+    "36kr": {
+        "url": "https://36kr.com/feed",
+        "output_dir": "./generate_docs/36kr",
+        "file_prefix": "36kr",
+        "kind": "news",
+        "text_field": "Description",
+        "default_authors": "",
+        "default_categories": "",
+    },
+    "leiphone": {
+        "url": "https://www.leiphone.com/feed",
+        "output_dir": "./generate_docs/leiphone",
+        "file_prefix": "leiphone",
+        "kind": "news",
+        "text_field": "Description",
+        "default_authors": "",
+        "default_categories": "",
+    },
+}
+
+
+def fieldnames(source):
+    """数据源输出 CSV 的列顺序"""
+    return ["Date", "Title", "Authors", "Categories", source["text_field"], "Link"]
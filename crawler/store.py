@@ -0,0 +1,242 @@
+'''
+按日期和数据源分区的列式存储（Parquet），所有数据源共用一套字段：
+    date        抓取日期 YYYYMMDD（分区列）
+    source      数据源名（分区列）
+    kind        paper / code / news / x
+    published   原始发布时间
+    title, authors, categories, description, link
+    stars       GitHub star 数，其它源为空
+    topics      keywords.TOPICS 中命中的主题，逗号分隔（写入时自动标注）
+    extra       其它源特有字段，JSON 字符串
+
+目录结构：<STORE_DIR>/date=<YYYYMMDD>/source=<name>/part-<时间戳>-<pid>.parquet
+每次写入新增一个 part 文件（只追加，不改写）。读取时只列出被请求的分区目录，
+只加载被请求的列，不再扫描整个 generate_docs 目录树。
+part 文件生效的同时把记录写入全文索引（crawler.archive_index），跨天查询走索引。
+
+依赖 pyarrow；未安装时写入会被跳过并给出提示，读取返回空列表。
+'''
+
+import json
+import os
+import time
+
+from crawler.keywords import tag_topics
+
+STORE_DIR = "./generate_docs/store"
+STORE_ENABLED = True
+
+COLUMNS = ["date", "source", "kind", "published", "title", "authors", "categories",
+           "description", "link", "stars", "topics", "extra"]
+PARTITION_COLUMNS = ("date", "source")
+DATA_COLUMNS = [c for c in COLUMNS if c not in PARTITION_COLUMNS]
+
+_warned = False
+
+
+def _pyarrow():
+    """延迟导入 pyarrow，未安装时返回 None"""
+    global _warned
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        if not _warned:
+            print("⚠️ 未安装 pyarrow，跳过列式存储")
+            _warned = True
+        return None
+    return pa, pq
+
+
+def _schema(pa):
+    fields = []
+    for column in DATA_COLUMNS:
+        fields.append((column, pa.int64() if column == "stars" else pa.string()))
+    return pa.schema(fields)
+
+
+def feed_record(record, text_field):
+    """RSS 记录 -> 统一字段"""
+    return {
+        "published": record.get("Date", ""),
+        "title": record.get("Title", ""),
+        "authors": record.get("Authors", ""),
+        "categories": record.get("Categories", ""),
+        "description": record.get(text_field, ""),
+        "link": record.get("Link", ""),
+        "extra": {"lang": record["Lang"]} if record.get("Lang") else None,
+    }
+
+
+def github_record(row):
+    """github_trends CSV 行 -> 统一字段"""
+    repo = row.get("项目", "")
+    return {
+        "title": repo,
+        "authors": repo.split("/")[0],
+        "categories": row.get("趋势", ""),
+        "description": row.get("描述", ""),
+        "link": row.get("链接", ""),
+        "stars": int(row.get("Stars") or 0),
+    }
+
+
+def tweet_record(row):
+    """推文 CSV 行 -> 统一字段"""
+    return {
+        "published": row.get("Date", ""),
+        "title": row.get("Title", ""),
+        "authors": row.get("Authors", ""),
+        "categories": row.get("Categories", ""),
+        "description": row.get("Description", ""),
+        "link": row.get("Link", ""),
+        "extra": {"media": row.get("Media", "")} if row.get("Media") else None,
+    }
+
+
+class StoreWriter:
+    """向某个 (日期, 数据源) 分区追加一个 part 文件，按批写入行组"""
+
+    def __init__(self, source, kind, date_str, store_dir=STORE_DIR, batch_size=1024):
+        self.source = source
+        self.kind = kind
+        self.path = os.path.join(
+            store_dir, f"date={date_str}", f"source={source}",
+            f"part-{time.strftime('%H%M%S')}-{time.time_ns() % 10**9:09d}-{os.getpid()}.parquet",
+        )
+        self.date_str = date_str
+        self.batch_size = batch_size
+        self.count = 0
+        self._batch = []
+        self._indexed = []
+        self._writer = None
+        self._modules = _pyarrow() if STORE_ENABLED else None
+
+    def add(self, record):
+        if _index_enabled():
+            self._indexed.append(record)
+        if self._modules is None:
+            if len(self._indexed) >= self.batch_size:
+                self._flush()
+            return
+        row = {column: record.get(column) for column in DATA_COLUMNS}
+        row["kind"] = self.kind
+        if row["topics"] is None:
+            row["topics"] = ",".join(tag_topics(row["title"], row["description"]))
+        if isinstance(row["extra"], dict):
+            row["extra"] = json.dumps(row["extra"], ensure_ascii=False)
+        for column in DATA_COLUMNS:
+            if column != "stars" and row[column] is not None:
+                row[column] = str(row[column])
+        self._batch.append(row)
+        if len(self._batch) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        # 归档索引与行组按同样的批大小写入，流式数据源的内存占用只与批大小有关
+        if self._indexed:
+            from crawler.archive_index import get_archive
+
+            get_archive().add(self.date_str, self.source, self.kind, self._indexed)
+            self._indexed = []
+        if not self._batch:
+            return
+        pa, pq = self._modules
+        schema = _schema(pa)
+        table = pa.Table.from_pylist(self._batch, schema=schema)
+        if self._writer is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._writer = pq.ParquetWriter(self.path + ".tmp", schema)
+        self._writer.write_table(table)
+        self.count += len(self._batch)
+        self._batch = []
+
+    def close(self):
+        self._flush()
+        if self._writer is not None:
+            self._writer.close()
+            # 写完整后才让读取方看见
+            os.replace(self.path + ".tmp", self.path)
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        elif self._writer is not None:
+            self._writer.close()
+            os.remove(self.path + ".tmp")
+
+
+def _index_enabled():
+    from crawler import archive_index
+
+    return archive_index.ARCHIVE_INDEX_ENABLED
+
+
+def tee(records, source, kind, to_store, date_str, store_dir=STORE_DIR):
+    """
+    边产出记录边写入列式存储；to_store 把源记录转换为统一字段。
+    记录全部产出后 part 文件才会生效。
+    """
+    with StoreWriter(source, kind, date_str, store_dir) as writer:
+        for record in records:
+            writer.add(to_store(record))
+            yield record
+
+
+def list_partitions(dates=None, sources=None, store_dir=STORE_DIR):
+    """返回 [(日期, 数据源, part 文件路径)]，只列出被请求的分区目录"""
+    if not os.path.isdir(store_dir):
+        return []
+    if dates is None:
+        dates = sorted(name[5:] for name in os.listdir(store_dir) if name.startswith("date="))
+    parts = []
+    for date_str in dates:
+        date_dir = os.path.join(store_dir, f"date={date_str}")
+        if not os.path.isdir(date_dir):
+            continue
+        names = sources if sources is not None else sorted(
+            name[7:] for name in os.listdir(date_dir) if name.startswith("source=")
+        )
+        for source in names:
+            source_dir = os.path.join(date_dir, f"source={source}")
+            if not os.path.isdir(source_dir):
+                continue
+            for file_name in sorted(os.listdir(source_dir)):
+                if file_name.endswith(".parquet"):
+                    parts.append((date_str, source, os.path.join(source_dir, file_name)))
+    return parts
+
+
+def read(dates=None, sources=None, kinds=None, columns=None, store_dir=STORE_DIR):
+    """
+    读取指定日期/数据源分区中的指定列，返回字典列表。
+    dates / sources / kinds / columns 为 None 时表示不限。
+    """
+    parts = list_partitions(dates, sources, store_dir)
+    modules = _pyarrow() if parts else None
+    if modules is None:
+        return []
+    _, pq = modules
+
+    columns = list(columns or COLUMNS)
+    data_columns = [c for c in columns if c in DATA_COLUMNS]
+    if kinds is not None and "kind" not in data_columns:
+        data_columns.append("kind")
+
+    rows = []
+    for date_str, source, path in parts:
+        # 早期写入的 part 文件可能缺少后来新增的列
+        part = pq.ParquetFile(path)
+        present = set(part.schema_arrow.names)
+        table = part.read(columns=[c for c in data_columns if c in present])
+        for row in table.to_pylist():
+            if kinds is not None and row.get("kind") not in kinds:
+                continue
+            row["date"] = date_str
+            row["source"] = source
+            rows.append({c: row.get(c) for c in columns})
+    return rows
@@ -0,0 +1,197 @@
+'''
+流式、内存有界的记录处理工具：
+    分块响应体 -> 增量 XML 解析（iter_feed_entries）-> 记录转换 -> CSV / Parquet 写出
+各阶段都是生成器，记录逐条流过而不会整体物化；bounded() 在两个阶段之间放一个有界队列，
+让下载/解析和写盘并行进行，同时在下游变慢时反压上游。
+'''
+
+import csv
+import os
+import queue
+import threading
+import xml.etree.ElementTree as ET
+
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+DC_NS = "{http://purl.org/dc/elements/1.1/}"
+RSS1_NS = "{http://purl.org/rss/1.0/}"
+
+# RSS / Atom 元素名 -> feedparser 风格的字段名
+TEXT_FIELDS = {
+    "title": "title",
+    ATOM_NS + "title": "title",
+    "description": "summary",
+    ATOM_NS + "summary": "summary",
+    "pubDate": "published",
+    ATOM_NS + "published": "published",
+    ATOM_NS + "updated": "updated",
+    DC_NS + "date": "published",
+    "guid": "id",
+    ATOM_NS + "id": "id",
+}
+
+
+def _local_tag(tag):
+    # RSS 1.0 (RDF) 的元素去掉命名空间后与 RSS 2.0 同名
+    return tag[len(RSS1_NS):] if tag.startswith(RSS1_NS) else tag
+
+
+def _entry_from_element(elem):
+    """把 <item> / <entry> 元素转换为与 feedparser 条目兼容的字典"""
+    entry = {"authors": [], "tags": []}
+    for child in elem:
+        tag = _local_tag(child.tag)
+        text = (child.text or "").strip()
+        if tag in TEXT_FIELDS:
+            entry.setdefault(TEXT_FIELDS[tag], text)
+        elif tag == "link":
+            entry.setdefault("link", text)
+        elif tag == ATOM_NS + "link":
+            if child.get("rel", "alternate") == "alternate":
+                entry.setdefault("link", child.get("href", ""))
+        elif tag == DC_NS + "creator" or tag == "author":
+            entry["authors"].extend({"name": name.strip()} for name in text.split(",") if name.strip())
+        elif tag == ATOM_NS + "author":
+            name = child.findtext(ATOM_NS + "name", "").strip()
+            if name:
+                entry["authors"].append({"name": name})
+        elif tag == "category":
+            entry["tags"].append({"term": text})
+        elif tag == ATOM_NS + "category":
+            entry["tags"].append({"term": child.get("term", "")})
+    if "published" not in entry and "updated" in entry:
+        entry["published"] = entry["updated"]
+    return entry
+
+
+def iter_feed_entries(chunks):
+    """
+    增量解析 RSS 2.0 / Atom 字节流，每解析完一个条目就产出一个字典并释放对应的 XML 节点，
+    内存占用与单个条目大小相关，而与整个 feed 的大小无关。
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    stack = []
+
+    def drain():
+        for event, elem in parser.read_events():
+            if event == "start":
+                stack.append(elem)
+                continue
+            stack.pop()
+            if _local_tag(elem.tag) in ("item", ATOM_NS + "entry"):
+                yield _entry_from_element(elem)
+                # 已处理的条目从父节点上摘掉，避免文档树不断增长
+                if stack:
+                    stack[-1].remove(elem)
+                elem.clear()
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from drain()
+    parser.close()
+    yield from drain()
+
+
+_DONE = object()
+
+
+def bounded(iterable, maxsize=256):
+    """
+    在后台线程中消费 iterable，通过容量为 maxsize 的队列交给调用方。
+    下游处理慢时队列写满，上游自动阻塞（反压）；上游的异常会在下游重新抛出。
+    """
+    q = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def produce():
+        try:
+            for item in iterable:
+                while not stop.is_set():
+                    try:
+                        q.put(item, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if stop.is_set():
+                    return
+            q.put((_DONE, None))
+        except BaseException as e:
+            q.put((_DONE, e))
+
+    thread = threading.Thread(target=produce, name="bounded-producer", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = q.get()
+            if isinstance(item, tuple) and len(item) == 2 and item[0] is _DONE:
+                if item[1] is not None:
+                    raise item[1]
+                return
+            yield item
+    finally:
+        stop.set()
+
+
+def batched(iterable, size):
+    """把 iterable 切成长度不超过 size 的列表"""
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def write_csv(records, path, columns, append=False, encoding="utf-8"):
+    """
+    流式写入 CSV，返回写入条数。
+    append 为 True 时追加到已有文件末尾（文件不存在时写表头），且没有记录时不创建文件。
+    """
+    csvfile = None
+    count = 0
+    try:
+        for record in records:
+            if csvfile is None:
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                exists = append and os.path.exists(path)
+                # 追加时不能再写 BOM
+                csvfile = open(path, mode="a" if exists else "w", newline="",
+                               encoding="utf-8" if exists else encoding)
+                writer = csv.DictWriter(csvfile, fieldnames=columns, extrasaction="ignore")
+                if not exists:
+                    writer.writeheader()
+            writer.writerow(record)
+            count += 1
+    finally:
+        if csvfile is not None:
+            csvfile.close()
+    if count == 0 and not append:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, mode="w", newline="", encoding=encoding) as f:
+            csv.DictWriter(f, fieldnames=columns).writeheader()
+    return count
+
+
+def write_parquet(records, path, columns, batch_size=1024):
+    """按批流式写出 Parquet，返回写出的条目数（需要 pyarrow）"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(column, pa.string()) for column in columns])
+    count = 0
+    writer = None
+    try:
+        for batch in batched(records, batch_size):
+            table = pa.Table.from_pylist(
+                [{c: (None if r.get(c) is None else str(r.get(c))) for c in columns} for r in batch],
+                schema=schema,
+            )
+            if writer is None:
+                writer = pq.ParquetWriter(path, schema)
+            writer.write_table(table)
+            count += len(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
@@ -0,0 +1,220 @@
+'''
+所有出站请求共用的传输层：
+1. 每个主机一个带连接池的 requests.Session，复用 TCP/TLS 连接
+2. 连接 / 读取超时（REQUEST_TIMEOUT）
+3. 网络错误、429 和 5xx 按指数退避 + 随机抖动重试；响应带 Retry-After 时按其等待
+4. 每个主机一个熔断器：连续失败达到阈值后在冷却期内直接失败，不再拖慢整条抓取链
+5. 可按主机限速（令牌桶）
+'''
+
+import email.utils
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from crawler import metrics
+from crawler.config import (
+    HEADERS, REQUEST_TIMEOUT, PER_HOST_LIMIT, RETRY_ATTEMPTS, RETRY_BASE_DELAY, RETRY_MAX_DELAY,
+    MAX_RETRY_AFTER, BREAKER_THRESHOLD, BREAKER_COOLDOWN, HOST_RATE_LIMITS,
+)
+
+# 只对网络错误、限流和服务端错误重试，404 等客户端错误直接返回
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(requests.RequestException):
+    """主机处于熔断状态，请求未发出"""
+
+
+class RateLimiter:
+    """令牌桶限速器：平均每秒最多 rate 次，允许 burst 次突发，线程安全"""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    closed     正常放行，记录连续失败次数
+    open       冷却期内直接拒绝
+    half_open  冷却结束后只放行一个试探请求，成功则恢复，失败则重新熔断
+    """
+
+    def __init__(self, host, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.host = host
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def before(self):
+        with self._lock:
+            if self.state == "closed":
+                return
+            remaining = self._opened_at + self.cooldown - time.monotonic()
+            if self.state == "open" and remaining <= 0:
+                self.state = "half_open"
+                self._trial = False
+            if self.state == "half_open" and not self._trial:
+                self._trial = True
+                return
+            raise CircuitOpenError(f"{self.host} 已熔断，{max(remaining, 0):.0f}s 后重试")
+
+    def success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._trial = False
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.threshold:
+                if self.state != "open":
+                    metrics.incr("http.breaker_open", 1, self.host)
+                    print(f"🔌 {self.host} 连续失败 {self.failures} 次，熔断 {self.cooldown}s")
+                self.state = "open"
+                self._opened_at = time.monotonic()
+                self._trial = False
+
+
+def backoff_delay(attempt, base_delay=RETRY_BASE_DELAY, max_delay=RETRY_MAX_DELAY):
+    """第 attempt 次失败（从 0 计）后的等待秒数：指数增长，带 ±50% 抖动"""
+    return min(max_delay, base_delay * 2 ** attempt) * random.uniform(0.5, 1.5)
+
+
+def retry_after(response):
+    """解析 Retry-After 头（秒数或 HTTP 日期），没有或无法解析时返回 None"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class Transport:
+    def __init__(self, attempts=RETRY_ATTEMPTS, base_delay=RETRY_BASE_DELAY, max_delay=RETRY_MAX_DELAY,
+                 breaker_threshold=BREAKER_THRESHOLD, breaker_cooldown=BREAKER_COOLDOWN,
+                 rate_limits=HOST_RATE_LIMITS):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self._sessions = {}
+        self._breakers = {}
+        self._limiters = {host: RateLimiter(*limit) for host, limit in rate_limits.items()}
+        self._lock = threading.Lock()
+
+    def session(self, url):
+        """返回该 URL 所在主机的 Session，首次访问时创建"""
+        parsed = urlparse(url)
+        key = (parsed.scheme, parsed.netloc)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                session.headers.update(HEADERS)
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=PER_HOST_LIMIT * 4)
+                session.mount(f"{parsed.scheme}://", adapter)
+                self._sessions[key] = session
+        return session
+
+    def breaker(self, host):
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker(
+                    host, self.breaker_threshold, self.breaker_cooldown)
+        return breaker
+
+    def set_rate_limit(self, host, rate, burst=1):
+        with self._lock:
+            self._limiters[host] = RateLimiter(rate, burst)
+
+    def request(self, method, url, **kwargs):
+        """
+        发送请求并按需重试。重试用尽时网络错误会抛出，可重试状态码则返回最后一次响应，
+        由调用方决定是否 raise_for_status。
+        """
+        host = urlparse(url).hostname
+        breaker = self.breaker(host)
+        session = self.session(url)
+        kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+
+        for attempt in range(self.attempts):
+            breaker.before()
+            limiter = self._limiters.get(host)
+            if limiter is not None:
+                limiter.acquire()
+            last = attempt == self.attempts - 1
+            metrics.incr("http.requests", 1, host)
+            try:
+                response = session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                metrics.incr("http.errors", 1, host)
+                breaker.failure()
+                if last:
+                    raise
+                delay = backoff_delay(attempt, self.base_delay, self.max_delay)
+                reason = type(exc).__name__
+            else:
+                # 从发出请求到收到响应头的耗时（含 DNS、建连、TLS 和服务端处理）
+                metrics.observe("http.ttfb", response.elapsed.total_seconds(), host)
+                if response.status_code not in RETRY_STATUS:
+                    breaker.success()
+                    return response
+                breaker.failure()
+                wait = retry_after(response)
+                if last or (wait is not None and wait > MAX_RETRY_AFTER):
+                    return response
+                response.close()
+                delay = wait if wait is not None else backoff_delay(attempt, self.base_delay, self.max_delay)
+                reason = f"HTTP {response.status_code}"
+            metrics.incr("http.retries", 1, host)
+            print(f"⚠️ {url} 请求失败（{reason}），{delay:.1f}s 后第 {attempt + 1} 次重试")
+            time.sleep(delay)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def get_transport():
+    """进程内共享的传输层"""
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = Transport()
+    return _transport
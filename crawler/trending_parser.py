@@ -0,0 +1,187 @@
+'''
+GitHub Trending 页面解析，可切换 HTML 解析后端：
+    selectolax  基于 lexbor 的 C 解析器 + CSS 选择器（最快）
+    lxml        libxml2 + 预编译 XPath
+    bs4         BeautifulSoup html.parser（纯 Python，兜底）
+每个后端都只遍历一次 article.Box-row，在同一次遍历中取出
+仓库名、描述、star 数、语言、fork 数和时间段内新增 star 数。
+'''
+
+import re
+
+# auto 时按 selectolax -> lxml -> bs4 的顺序选择第一个可用的后端
+PARSER_BACKEND = "auto"
+
+NUMBER_RE = re.compile(r'[\d,.]+\s*[km]?', re.I)
+
+
+def parse_count(text):
+    """将 GitHub 计数格式如 '12,345' / '3.5k' 转为整数，无法识别时返回 0"""
+    match = NUMBER_RE.search(text or "")
+    if not match:
+        return 0
+    value = match.group(0).strip().lower().replace(',', '')
+    if value.endswith('k'):
+        return int(float(value[:-1]) * 1000)
+    if value.endswith('m'):
+        return int(float(value[:-1]) * 1000000)
+    return int(float(value))
+
+
+def _record(href, description, stars, language, forks, stars_period):
+    repo = (href or "").strip().strip('/')
+    if repo.count('/') != 1:
+        return None
+    author, name = repo.split('/')
+    return {
+        "repository": repo,
+        "author": author,
+        "name": name,
+        "description": " ".join(description.split()) if description else "",
+        "url": f"https://github.com/{repo}",
+        "stars": parse_count(stars),
+        "language": (language or "").strip(),
+        "forks": parse_count(forks),
+        "stars_period": parse_count(stars_period),
+    }
+
+
+def parse_selectolax(content):
+    from selectolax.lexbor import LexborHTMLParser
+
+    tree = LexborHTMLParser(content)
+    result = []
+    for article in tree.css("article.Box-row"):
+        link = article.css_first("h2 a")
+        if link is None:
+            continue
+        desc = article.css_first("p")
+        stars = article.css_first('a[href$="/stargazers"]')
+        forks = article.css_first('a[href$="/forks"]')
+        language = article.css_first('span[itemprop="programmingLanguage"]')
+        period = article.css_first("span.float-sm-right")
+        record = _record(
+            link.attributes.get("href"),
+            desc.text() if desc else "",
+            stars.text() if stars else "",
+            language.text() if language else "",
+            forks.text() if forks else "",
+            period.text() if period else "",
+        )
+        if record:
+            result.append(record)
+    return result
+
+
+_lxml_xpaths = None
+
+
+def _compile_lxml_xpaths():
+    global _lxml_xpaths
+    if _lxml_xpaths is None:
+        from lxml import etree
+
+        _lxml_xpaths = {
+            "articles": etree.XPath("//article[contains(concat(' ', normalize-space(@class), ' '), ' Box-row ')]"),
+            "href": etree.XPath("string(./h2//a/@href)"),
+            "description": etree.XPath("string(./p)"),
+            "stars": etree.XPath("string(.//a[substring(@href, string-length(@href) - 10) = '/stargazers'])"),
+            "forks": etree.XPath("string(.//a[substring(@href, string-length(@href) - 5) = '/forks'])"),
+            "language": etree.XPath("string(.//span[@itemprop='programmingLanguage'])"),
+            "period": etree.XPath("string(.//span[contains(concat(' ', normalize-space(@class), ' '), ' float-sm-right ')])"),
+        }
+    return _lxml_xpaths
+
+
+def parse_lxml(content):
+    import lxml.html
+
+    xpaths = _compile_lxml_xpaths()
+    tree = lxml.html.fromstring(content)
+    result = []
+    for article in xpaths["articles"](tree):
+        record = _record(
+            xpaths["href"](article),
+            xpaths["description"](article),
+            xpaths["stars"](article),
+            xpaths["language"](article),
+            xpaths["forks"](article),
+            xpaths["period"](article),
+        )
+        if record:
+            result.append(record)
+    return result
+
+
+def parse_bs4(content):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(content, 'html.parser')
+    result = []
+    for article in soup.find_all('article', class_='Box-row'):
+        header = article.h2
+        link = header.find('a') if header else None
+        if not link:
+            continue
+        desc = article.find('p')
+        stars = forks = language = period = None
+        # 单次遍历子树，一并取出其余字段
+        for tag in article.find_all(['a', 'span']):
+            href = tag.get('href') or ''
+            if tag.name == 'a':
+                if href.endswith('/stargazers'):
+                    stars = tag
+                elif href.endswith('/forks'):
+                    forks = tag
+            elif tag.get('itemprop') == 'programmingLanguage':
+                language = tag
+            elif 'float-sm-right' in (tag.get('class') or []):
+                period = tag
+        record = _record(
+            link.get('href'),
+            desc.get_text(" ", strip=True) if desc else "",
+            stars.get_text() if stars else "",
+            language.get_text() if language else "",
+            forks.get_text() if forks else "",
+            period.get_text() if period else "",
+        )
+        if record:
+            result.append(record)
+    return result
+
+
+BACKENDS = {
+    "selectolax": parse_selectolax,
+    "lxml": parse_lxml,
+    "bs4": parse_bs4,
+}
+
+_MODULES = {"selectolax": "selectolax.lexbor", "lxml": "lxml.html", "bs4": "bs4"}
+
+
+def available_backends():
+    import importlib
+
+    names = []
+    for name, module in _MODULES.items():
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def get_parser(backend=None):
+    """返回指定后端的解析函数；auto 时选择第一个可用的后端"""
+    backend = backend or PARSER_BACKEND
+    if backend == "auto":
+        names = available_backends()
+        if not names:
+            raise ImportError("没有可用的 HTML 解析后端，请安装 selectolax、lxml 或 bs4")
+        backend = names[0]
+    return BACKENDS[backend]
+
+
+def parse_trending(content, backend=None):
+    return get_parser(backend)(content)
@@ -1,24 +1,51 @@
+'''
+按关键词抓取 X（Twitter）推文，输出 CSV、Markdown 和词云图。
+tweepy / wordcloud / matplotlib 只在真正用到时才导入。
+
+断点续抓：每个查询在 crawler.checkpoint 中保存
+    since_id   已完整翻完的各轮中最新的推文 ID（高水位），新一轮只抓比它新的推文
+    pending    尚未翻完的一轮（since_id / next_token / 本轮最新 ID），中断或达到 MAX_TWEETS 后下次先续上
+每一页写入当天的 CSV 和列式存储之后才推进断点，当天多次运行的结果逐页追加合并。
+
+词云使用 crawler.wordfreq 按天增量维护的词频：每页只统计新写出的推文，
+当天、最近 7 天、最近 30 天的词云（WORDCLOUD_WINDOWS）和热词趋势都由每天的词频合并得到。
+
+作者和媒体信息缓存在 crawler.entity_cache 中：搜索请求不再展开作者（author_id expansion），
+本地缺失的作者按每批 100 个批量查询。白名单作者的时间线作为快速通道单独轮询，各自保存 since_id。
+
+用法：python -m crawler tweets [--reset] [--whitelist-only]（或 python -m crawler.tweet）
+'''
+
 import os
-import tweepy
-import pandas as pd
+import csv
+import hashlib
 from datetime import datetime, timezone, timedelta
 from email.utils import format_datetime
 from pathlib import Path
-from wordcloud import WordCloud
-import matplotlib.pyplot as plt
-import nltk
-from nltk.corpus import stopwords
 
-# 初始化 NLTK
-nltk.download('stopwords')
-stop_words = set(stopwords.words('english'))
+from crawler import metrics, store, textnorm, wordfreq
+from crawler.checkpoint import get_checkpoints
+from crawler.config import INCREMENTAL
+from crawler.entity_cache import get_entity_cache
+from crawler.seen_index import get_index
+from crawler.streaming import write_csv
+
+_client = None
+
 
 # === Step 1: API 初始化 ===
-BEARER_TOKEN = os.environ.get('TWITTER_BEARER_TOKEN')
-if not BEARER_TOKEN:
-    raise RuntimeError("❌ TWITTER_BEARER_TOKEN 环境变量未设置")
+def get_client():
+    """首次调用时检查环境变量并创建 tweepy 客户端"""
+    global _client
+    if _client is None:
+        import tweepy
+
+        bearer_token = os.environ.get('TWITTER_BEARER_TOKEN')
+        if not bearer_token:
+            raise RuntimeError("❌ TWITTER_BEARER_TOKEN 环境变量未设置")
+        _client = tweepy.Client(bearer_token=bearer_token, wait_on_rate_limit=True)
+    return _client
 
-client = tweepy.Client(bearer_token=BEARER_TOKEN, wait_on_rate_limit=True)
 
 # === Step 2: 配置 ===
 QUERY = (
@@ -32,53 +59,105 @@ USER_WHITELIST = {
     'ilyasut', 'sama', 'ylecun', 'AndrewYNg', 'JeffDean'
 }
 
-utc_now = datetime.now(timezone.utc)
-three_days_ago = utc_now - timedelta(days=3)
-date_str = datetime.now().strftime('%Y-%m-%d')
-formatted_date = datetime.now().strftime('%a, %d %b %Y %H:%M:%S +0000')
-
 SAVE_DIR = Path('./generate_docs/x')
-SAVE_DIR.mkdir(parents=True, exist_ok=True)
-csv_path = SAVE_DIR / f'x_{date_str}.csv'
-md_path = SAVE_DIR / f'x_{date_str}.md'
-wordcloud_path = SAVE_DIR / f'x_{date_str}_wordcloud.png'
 
 # === Step 3: 推文抓取 ===
-MAX_TWEETS = 100
+MAX_TWEETS = 300
 MAX_RESULTS_PER_PAGE = 100
-tweet_count = 0
-next_token = None
-all_data = []
-
-while tweet_count < MAX_TWEETS:
-    response = client.search_recent_tweets(
-        query=QUERY,
-        tweet_fields=['created_at', 'author_id', 'text', 'attachments'],
-        user_fields=['username', 'name'],
-        expansions=['author_id', 'attachments.media_keys'],
-        media_fields=['url', 'preview_image_url', 'type'],
-        max_results=MAX_RESULTS_PER_PAGE,
-        next_token=next_token
-    )
-
-    if not response.data:
-        break
-
-    users = {u['id']: u for u in response.includes.get('users', [])}
-    media_map = {m['media_key']: m for m in response.includes.get('media', [])}
-
-    for tweet in response.data:
+# 白名单作者时间线（快速通道）每人每次最多拉取的推文数（接口限制 5~100）
+WHITELIST_MAX_RESULTS = 20
+USER_LOOKUP_BATCH = 100
+TWEET_FIELDS = ['created_at', 'author_id', 'text', 'attachments']
+USER_FIELDS = ['username', 'name']
+MEDIA_FIELDS = ['url', 'preview_image_url', 'type']
+CSV_COLUMNS = ['Date', 'Title', 'Authors', 'Categories', 'Description', 'Link', 'Media']
+
+# 词云窗口（天）：1 为当天，其余输出 x_<日期>_wordcloud_<N>d.png
+WORDCLOUD_WINDOWS = (1, 7, 30)
+# Markdown 中列出的热词数（当天相对前 TREND_DAYS 天日均值增长最多的词）
+TREND_DAYS = 7
+TREND_TOP = 15
+
+
+def checkpoint_key(query=QUERY):
+    """断点按查询区分，修改 QUERY 后从头开始"""
+    return "x:" + hashlib.sha1(query.encode("utf-8")).hexdigest()[:12]
+
+
+def whitelist_key(username):
+    return f"x:user:{username.lower()}"
+
+
+def cache_users(users):
+    """把用户资料写入缓存（按 ID 和小写用户名各存一份）"""
+    users = [getattr(user, 'data', user) for user in users]
+    cache = get_entity_cache()
+    cache.put_many('user', {user['id']: user for user in users})
+    cache.put_many('username', {user['username'].lower(): user for user in users})
+
+
+def lookup_users(client, user_ids):
+    """返回 {用户 ID: 用户资料}：先查缓存，缺失的再按批调用 get_users"""
+    users = get_entity_cache().get_many('user', user_ids)
+    missing = [user_id for user_id in dict.fromkeys(map(str, user_ids)) if user_id not in users]
+    for i in range(0, len(missing), USER_LOOKUP_BATCH):
+        with metrics.span("users", "x"):
+            response = client.get_users(ids=missing[i:i + USER_LOOKUP_BATCH], user_fields=USER_FIELDS)
+        metrics.incr("x.user_lookups", 1, "x")
+        fetched = [user.data for user in response.data or []]
+        cache_users(fetched)
+        users.update((user['id'], user) for user in fetched)
+    return users
+
+
+def lookup_usernames(client, usernames):
+    """返回 {用户名: 用户资料}，用于解析白名单作者的 ID；查无此人的用户名缓存为空记录，不再重复查询"""
+    cached = get_entity_cache().get_many('username', [name.lower() for name in usernames])
+    users = {name: cached[name.lower()] for name in usernames if name.lower() in cached}
+    missing = [name for name in usernames if name not in users]
+    for i in range(0, len(missing), USER_LOOKUP_BATCH):
+        batch = missing[i:i + USER_LOOKUP_BATCH]
+        with metrics.span("users", "x"):
+            response = client.get_users(usernames=batch, user_fields=USER_FIELDS)
+        metrics.incr("x.user_lookups", 1, "x")
+        fetched = [user.data for user in response.data or []]
+        cache_users(fetched)
+        by_name = {user['username'].lower(): user for user in fetched}
+        not_found = {name.lower(): {} for name in batch if name.lower() not in by_name}
+        get_entity_cache().put_many('username', not_found)
+        users.update((name, by_name.get(name.lower(), {})) for name in batch)
+    return {name: user for name, user in users.items() if user}
+
+
+def page_media(response):
+    """缓存本页展开的媒体信息，返回本页推文引用的 {media_key: 媒体信息}"""
+    cache = get_entity_cache()
+    cache.put_many('media', {m['media_key']: m.data for m in response.includes.get('media', [])})
+    keys = [
+        key for tweet in response.data or []
+        for key in (tweet.data.get('attachments') or {}).get('media_keys', [])
+    ]
+    return cache.get_many('media', keys) if keys else {}
+
+
+def page_rows(response, users, media_map):
+    """把一页推文转换为输出记录；users / media_map 为 ID 到原始字段字典的映射"""
+    three_days_ago = datetime.now(timezone.utc) - timedelta(days=3)
+
+    rows = []
+    for tweet in response.data or []:
+        # X 返回的正文中 & < > 是转义过的
+        text = textnorm.normalize_text(tweet.text, None, html=False)
         created_time = tweet.created_at.replace(tzinfo=timezone.utc)
         # if created_time < three_days_ago:
         #     continue
 
-        author = users.get(tweet.author_id)
-        author_name = author.username if author else 'unknown'
-        is_priority = author_name in USER_WHITELIST
+        author = users.get(str(tweet.author_id))
+        author_name = author['username'] if author else 'unknown'
 
         date_fmt = format_datetime(created_time)
-        title = tweet.text[:50].replace('\n', ' ')
-        description = tweet.text.replace('\n', ' ')
+        title = text[:50]
+        description = text
         link = f"https://twitter.com/{author_name}/status/{tweet.id}"
 
         media_links = []
@@ -88,7 +167,7 @@ while tweet_count < MAX_TWEETS:
                 if media:
                     media_links.append(media.get('url') or media.get('preview_image_url'))
 
-        all_data.append({
+        rows.append({
             'Date': date_fmt,
             'Title': title,
             'Authors': author_name,
@@ -96,58 +175,227 @@ while tweet_count < MAX_TWEETS:
             'Description': description,
             'Link': link,
             'Media': ', '.join(media_links),
-            'is_priority_author': is_priority
         })
+    return rows
+
+
+def newest_id(*ids):
+    """推文 ID 按数值比较，返回最大的一个（字符串）"""
+    ids = [int(i) for i in ids if i]
+    return str(max(ids)) if ids else None
+
+
+def iter_pages(max_tweets=None, checkpoints=None, key=None):
+    """
+    按断点逐页拉取推文，每次产出一页记录。
+    消费方取下一页时（即上一页已经写出）才保存断点，中断后最多重抓一页。
+    """
+    client = get_client()
+    checkpoints = checkpoints or get_checkpoints()
+    key = key or checkpoint_key()
+    max_tweets = MAX_TWEETS if max_tweets is None else max_tweets
+    state = checkpoints.get(key) or {}
+    resuming = state.get("pending") is not None
+    if resuming:
+        print(f"♻️ 从上次中断的位置继续抓取（since_id={state['pending']['since_id']}）")
+    fetched = 0
 
-        tweet_count += 1
-        if tweet_count >= MAX_TWEETS:
+    while fetched < max_tweets:
+        cursor = state.get("pending") or {"since_id": state.get("since_id"), "next_token": None, "newest_id": None}
+        # 整页抓取，不在页中间截断，否则这一页剩下的推文会被 next_token 跳过
+        page_size = min(MAX_RESULTS_PER_PAGE, max(10, max_tweets - fetched))
+        with metrics.span("fetch", "x"):
+            response = client.search_recent_tweets(
+                query=QUERY,
+                tweet_fields=TWEET_FIELDS,
+                expansions=['attachments.media_keys'],
+                media_fields=MEDIA_FIELDS,
+                max_results=page_size,
+                since_id=cursor["since_id"],
+                next_token=cursor["next_token"]
+            )
+        metrics.incr("x.pages", 1, "x")
+
+        users = lookup_users(client, {tweet.author_id for tweet in response.data or []})
+        rows = page_rows(response, users, page_media(response))
+        fetched += len(rows)
+        yield rows
+
+        meta = response.meta or {}
+        cursor = dict(cursor, newest_id=newest_id(cursor["newest_id"], meta.get('newest_id')))
+        if rows and meta.get('next_token'):
+            state = {"since_id": state.get("since_id"), "pending": dict(cursor, next_token=meta['next_token'])}
+            checkpoints.save(key, state)
+            continue
+
+        # 这一轮已经翻完：高水位推进到本轮见过的最新推文
+        state = {"since_id": newest_id(state.get("since_id"), cursor["newest_id"]), "pending": None}
+        checkpoints.save(key, state)
+        if not resuming:
             break
+        # 续完上次的一轮后，如果还有额度，再从新的高水位开始抓最新的推文
+        resuming = False
+
+
+def iter_whitelist_pages(checkpoints=None):
+    """
+    快速通道：逐个拉取白名单作者时间线上的新推文（不含转推和回复），每人产出一页。
+    与 iter_pages 一样，消费方取下一页时才推进该作者的 since_id。
+    """
+    client = get_client()
+    checkpoints = checkpoints or get_checkpoints()
+    authors = lookup_usernames(client, sorted(USER_WHITELIST))
+    for username, user in authors.items():
+        key = whitelist_key(username)
+        since_id = (checkpoints.get(key) or {}).get("since_id")
+        with metrics.span("fetch.whitelist", "x"):
+            response = client.get_users_tweets(
+                user['id'],
+                tweet_fields=TWEET_FIELDS,
+                expansions=['attachments.media_keys'],
+                media_fields=MEDIA_FIELDS,
+                exclude=['retweets', 'replies'],
+                max_results=WHITELIST_MAX_RESULTS,
+                since_id=since_id
+            )
+        metrics.incr("x.pages", 1, "x")
+
+        yield page_rows(response, {user['id']: user}, page_media(response))
+
+        since_id = newest_id(since_id, (response.meta or {}).get('newest_id'))
+        checkpoints.save(key, {"since_id": since_id})
+
+
+def iter_csv(csv_path):
+    with open(csv_path, newline='', encoding='utf-8-sig') as csvfile:
+        yield from csv.DictReader(csvfile)
+
+
+def write_markdown(csv_path, md_path, date_str, trends=()):
+    """
+    从当天合并后的 CSV 生成 Markdown 摘要，白名单作者的推文排在前面。
+    分两遍读取 CSV，不把全天的推文载入内存。
+    """
+    def priority_rows():
+        for row in iter_csv(csv_path):
+            if row['Authors'] in USER_WHITELIST:
+                yield row
+
+    def other_rows():
+        for row in iter_csv(csv_path):
+            if row['Authors'] not in USER_WHITELIST:
+                yield row
+
+    with open(md_path, 'w', encoding='utf-8') as f:
+        f.write(f"# 推文摘要报告 - {date_str}\n\n")
+        if trends:
+            f.write(f"**热词**（当天次数 / 前 {TREND_DAYS} 天日均）: ")
+            f.write("，".join(f"{term} {count} / {mean:.1f}" for term, count, mean in trends))
+            f.write("\n\n---\n\n")
+        for rows in (priority_rows(), other_rows()):
+            for row in rows:
+                f.write(f"## {row['Title']}\n")
+                f.write(f"**作者**: {row['Authors']}  \n")
+                f.write(f"**时间**: {row['Date']}  \n")
+                f.write(f"**分类**: {row['Categories']}  \n")
+                f.write(f"**链接**: [{row['Link']}]({row['Link']})  \n")
+                if row['Media']:
+                    for link in row['Media'].split(','):
+                        f.write(f"![media]({link.strip()})  \n")
+                f.write(f"\n{row['Description']}\n\n---\n\n")
+
+
+def save_wordcloud(frequencies, wordcloud_path):
+    from wordcloud import WordCloud
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    wordcloud = WordCloud(width=1200, height=800, background_color='white').generate_from_frequencies(frequencies)
+    plt.figure(figsize=(12, 8))
+    plt.imshow(wordcloud, interpolation='bilinear')
+    plt.axis('off')
+    plt.tight_layout()
+    plt.savefig(wordcloud_path)
+    plt.close()
+
+
+def collect_texts(rows, texts):
+    """边产出记录边收集推文正文，写出后统一累加词频"""
+    for row in rows:
+        texts.append(row['Description'])
+        yield row
+
+
+def write_pages(pages, csv_path, incremental):
+    """把逐页产出的记录去重后追加到当天的 CSV、列式存储和当天的词频，返回写出条数"""
+    day = datetime.now().strftime('%Y%m%d')
+    total = 0
+    for rows in pages:
+        if incremental:
+            # 上一页写出后、断点保存前被中断时，重抓的这一页在这里去重
+            rows = get_index().iter_new('x', rows, ('Link',), ('Description',))
+        texts = []
+        rows = store.tee(collect_texts(rows, texts), 'x', 'x', store.tweet_record, day)
+        total += write_csv(rows, csv_path, CSV_COLUMNS, append=True, encoding='utf-8-sig')
+        wordfreq.add('x', day, texts)
+    return total
+
+
+def wordcloud_path(date_str, days):
+    suffix = '' if days == 1 else f'_{days}d'
+    return SAVE_DIR / f'x_{date_str}_wordcloud{suffix}.png'
+
+
+def main(reset=False, incremental=INCREMENTAL, whitelist_only=False):
+    date_str = datetime.now().strftime('%Y-%m-%d')
+    SAVE_DIR.mkdir(parents=True, exist_ok=True)
+    csv_path = SAVE_DIR / f'x_{date_str}.csv'
+    md_path = SAVE_DIR / f'x_{date_str}.md'
+    day = datetime.now().strftime('%Y%m%d')
+    if reset:
+        for key in [checkpoint_key(), *map(whitelist_key, USER_WHITELIST)]:
+            get_checkpoints().save(key, None)
+    if csv_path.exists() and not wordfreq.has_day('x', day):
+        # 当天的 CSV 早于词频文件生成：先从 CSV 补齐当天的词频
+        wordfreq.add('x', day, (row['Description'] for row in iter_csv(csv_path)))
+
+    # === Step 4: 逐页合并到当天的 CSV（先走白名单快速通道，再按关键词搜索） ===
+    with metrics.span("process", "x"):
+        tweet_total = write_pages(iter_whitelist_pages(), csv_path, incremental)
+        if not whitelist_only:
+            tweet_total += write_pages(iter_pages(), csv_path, incremental)
+    metrics.incr("items.written", tweet_total, "x")
+    if not csv_path.exists():
+        print("⚠️ 今天还没有抓到推文")
+        metrics.finish("x")
+        return 0
+
+    # === Step 5: 输出 Markdown 文件（覆盖当天的全部推文） ===
+    write_markdown(csv_path, md_path, date_str, wordfreq.trending('x', TREND_DAYS, day, TREND_TOP))
+
+    # === Step 6: 关键词词云生成（当天及多日窗口） ===
+    cloud_paths = []
+    previous = None
+    for days in WORDCLOUD_WINDOWS:
+        frequencies = wordfreq.window('x', days, day)
+        # 窗口内没有更早的数据时与上一个窗口相同，不再重复生成
+        if not frequencies or frequencies == previous:
+            continue
+        previous = frequencies
+        cloud_paths.append(wordcloud_path(date_str, days))
+        with metrics.span("wordcloud", "x"):
+            save_wordcloud(frequencies, cloud_paths[-1])
+
+    # === 完成提示 ===
+    print(f"✅ 完成！新增 {tweet_total} 条推文")
+    print(f"📄 CSV 文件保存于：{csv_path}")
+    print(f"📝 Markdown 文件保存于：{md_path}")
+    for path in cloud_paths:
+        print(f"🌥️ 词云图保存于：{path}")
+    metrics.finish("x")
+    return tweet_total
+
 
-    next_token = response.meta.get('next_token')
-    if not next_token:
-        break
-
-# === Step 4: 排序 & 输出 CSV ===
-df = pd.DataFrame(all_data)
-df = df.sort_values(by='is_priority_author', ascending=False).drop(columns='is_priority_author')
-df.to_csv(csv_path, index=False, encoding='utf-8-sig')
-
-# === Step 5: 输出 Markdown 文件 ===
-with open(md_path, 'w', encoding='utf-8') as f:
-    f.write(f"# 推文摘要报告 - {date_str}\n\n")
-    for _, row in df.iterrows():
-        f.write(f"## {row['Title']}\n")
-        f.write(f"**作者**: {row['Authors']}  \n")
-        f.write(f"**时间**: {row['Date']}  \n")
-        f.write(f"**分类**: {row['Categories']}  \n")
-        f.write(f"**链接**: [{row['Link']}]({row['Link']})  \n")
-        if row['Media']:
-            for link in row['Media'].split(','):
-                f.write(f"![media]({link.strip()})  \n")
-        f.write(f"\n{row['Description']}\n\n---\n\n")
-
-# === Step 6: 关键词词云生成 ===
-# 合并所有描述文本
-text_blob = ' '.join(df['Description'].tolist())
-
-# 简单文本清理
-tokens = [
-    word.lower() for word in text_blob.split()
-    if word.isalpha() and word.lower() not in stop_words
-]
-clean_text = ' '.join(tokens)
-
-# 生成词云图
-wordcloud = WordCloud(width=1200, height=800, background_color='white').generate(clean_text)
-plt.figure(figsize=(12, 8))
-plt.imshow(wordcloud, interpolation='bilinear')
-plt.axis('off')
-plt.tight_layout()
-plt.savefig(wordcloud_path)
-plt.close()
-
-# === 完成提示 ===
-print(f"✅ 完成！共抓取 {len(df)} 条推文")
-print(f"📄 CSV 文件保存于：{csv_path}")
-print(f"📝 Markdown 文件保存于：{md_path}")
-print(f"🌥️ 词云图保存于：{wordcloud_path}")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+'''
+增量词频：按「数据源 + 日期」维护词频，写出新条目时只统计新增的文本，
+多日窗口（7 / 30 天）和热词趋势直接合并每天的词频，不再重新处理历史文本。
+    tokenize(text)                    分词：去掉链接和 @提及，保留 #话题，过滤停用词
+    add(source, day, texts)           把新文本的词频累加到当天
+    window(source, days, end_day)     最近 days 天（含 end_day）合并后的词频
+    trending(source, days, end_day)   当天词频相对前 days 天日均值的增量
+每天的词频存为 <WORDFREQ_DIR>/<source>_<YYYYMMDD>.json.gz，结果可直接传给
+WordCloud.generate_from_frequencies。
+'''
+
+import gzip
+import json
+import os
+import re
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+
+from crawler import metrics
+from crawler.config import CACHE_DIR
+from crawler.stopwords import ENGLISH
+
+WORDFREQ_DIR = os.path.join(CACHE_DIR, "wordfreq")
+
+TOKEN_RE = re.compile(
+    r"(?P<url>https?://\S+|www\.\S+)"
+    r"|(?P<mention>@\w+)"
+    r"|(?P<tag>#[^\W\d_]\w*)"
+    r"|(?P<word>[^\W\d_][^\W_]*(?:['’-][^\W_]+)*)"
+)
+# 推文中常见的无意义词（HTML 实体残留、转推标记等）
+EXTRA_STOPWORDS = frozenset({"amp", "rt", "via", "gt", "lt"})
+STOPWORDS = ENGLISH | EXTRA_STOPWORDS
+MIN_TOKEN_LENGTH = 2
+
+_lock = threading.Lock()
+
+
+def tokenize(text):
+    """返回 text 中参与统计的词（小写）；#话题 保留井号，链接和 @提及 丢弃"""
+    tokens = []
+    for match in TOKEN_RE.finditer(text or ""):
+        kind = match.lastgroup
+        if kind == "tag":
+            tokens.append(match.group().lower())
+        elif kind == "word":
+            word = match.group().lower().replace("’", "'")
+            if len(word) >= MIN_TOKEN_LENGTH and word not in STOPWORDS:
+                tokens.append(word)
+    return tokens
+
+
+def _path(source, day):
+    return os.path.join(WORDFREQ_DIR, f"{source}_{day}.json.gz")
+
+
+def load_day(source, day):
+    try:
+        with gzip.open(_path(source, day), "rt", encoding="utf-8") as f:
+            return Counter(json.load(f))
+    except (OSError, ValueError):
+        return Counter()
+
+
+def has_day(source, day):
+    return os.path.exists(_path(source, day))
+
+
+def add(source, day, texts):
+    """统计 texts 的词频并累加到当天，返回本次新增的词频"""
+    with metrics.span("wordfreq", source):
+        added = Counter()
+        for text in texts:
+            added.update(tokenize(text))
+        with _lock:
+            if not added and has_day(source, day):
+                return added
+            counts = load_day(source, day)
+            counts.update(added)
+            os.makedirs(WORDFREQ_DIR, exist_ok=True)
+            path = _path(source, day)
+            tmp_path = f"{path}.tmp.{os.getpid()}"
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                json.dump(dict(counts.most_common()), f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, path)
+    return added
+
+
+def _days(days, end_day):
+    end = datetime.strptime(end_day, "%Y%m%d") if end_day else datetime.now()
+    return [(end - timedelta(days=i)).strftime("%Y%m%d") for i in range(days)]
+
+
+def window(source, days=7, end_day=None):
+    """最近 days 天（含 end_day，默认今天）合并后的词频"""
+    total = Counter()
+    for day in _days(days, end_day):
+        total.update(load_day(source, day))
+    return total
+
+
+def trending(source, days=7, end_day=None, top=20, min_count=3):
+    """
+    当天相对前 days 天日均值增长最多的词：[(词, 当天次数, 前期日均), ...]，按增量从大到小排列。
+    当天出现次数少于 min_count 的词不计。
+    """
+    today, *previous = _days(days + 1, end_day)
+    current = load_day(source, today)
+    baseline = window(source, days, previous[0]) if previous else Counter()
+    deltas = [
+        (term, count, baseline[term] / days)
+        for term, count in current.items() if count >= min_count
+    ]
+    deltas.sort(key=lambda item: item[1] - item[2], reverse=True)
+    return deltas[:top]
@@ -1,9 +1,6 @@
 #!/bin/bash
 cd "$(dirname "$0")"
 
-python ./crawler/arxiv_rss_parser.py
-python ./crawler/github_trends.py
-python ./crawler/qbitai_rss_parser.py
-python ./crawler/news/36kr.py
-python ./crawler/news/leiphone.py
-# python ./crawler/tweet.py
+# 所有数据源在同一进程内并发抓取
+python -m crawler crawl
+# python -m crawler tweets
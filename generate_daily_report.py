@@ -1,21 +1,32 @@
 import os
 import csv
+import json
 import datetime
-from markdown2 import markdown
-from google import genai
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FutureTimeout
+
+from crawler import dedup, metrics, prompt_builder, ranking, report_render, store
+from crawler.llm_cache import LLMCache, entries_key, prompt_key
 
 # === 配置 ===
 GENERATE_DOCS_DIR = "./generate_docs"
 REPORTS_DIR = "./reports"
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
-if not GEMINI_API_KEY:
-    raise EnvironmentError("请先设置 GEMINI_API_KEY 环境变量。")
-
-# 初始化 Gemini
-gemini_client = genai.Client(api_key=GEMINI_API_KEY)
+# Gemini 客户端在第一次真正调用模型时才创建（缓存全部命中时不需要导入 SDK）
+gemini_client = None
+_client_lock = threading.Lock()
 model_name = "gemini-2.0-flash"
 # model_name = "gemini-2.5-flash-preview-05-20"
+# 同时进行中的 Gemini 请求数上限
+MAX_CONCURRENT_REQUESTS = 4
+# 模型响应缓存：同一天重跑时未变化的类别/提示词直接复用
+llm_cache = LLMCache()
+# 模型阶段的总时限（秒）：超时或调用失败的类别改用本地排序的前 FALLBACK_PICKS 条，报告按时生成
+LLM_TIMEOUT = 180
+FALLBACK_PICKS = 5
+# 模型输出格式的版本，参与类别缓存键，格式变化后不会复用旧的缓存
+SELECTION_FORMAT = "json-v1"
 
 # === 获取当天日期字符串 ===
 today_str = datetime.datetime.today().strftime("%Y%m%d")
@@ -28,84 +39,223 @@ def find_csv_files(base_dir, date_str):
                 matched_files.append(os.path.join(root, file))
     return matched_files
 
-def classify_entries_by_type(file_paths):
+def csv_row_to_entry(file_name, row):
+    """把各数据源 CSV 的一行转换为列式存储的统一字段"""
+    if file_name.startswith("arxiv"):
+        return dict(store.feed_record(row, "Abstract"), kind="paper")
+    if file_name.startswith("github"):
+        return dict(store.github_record(row), kind="code")
+    if file_name.startswith("x_"):
+        return dict(store.feed_record(row, "Description"), kind="x")
+    return dict(store.feed_record(row, "Description"), kind="news")
+
+
+def split_by_kind(rows):
+    """按类别拆分为 (新闻, 论文, 代码)；推文（kind 为 x）有单独的 X 日报，不进入本报告"""
     news_entries, paper_entries, code_entries = [], [], []
+    for row in rows:
+        if row["kind"] == "paper":
+            paper_entries.append(row)
+        elif row["kind"] == "code":
+            code_entries.append(row)
+        elif row["kind"] == "x":
+            continue
+        else:
+            news_entries.append(row)
+    return news_entries, paper_entries, code_entries
 
+
+def classify_entries_by_type(file_paths):
+    rows = []
     for path in file_paths:
         file_name = os.path.basename(path)
-        with open(path, newline='', encoding='utf-8') as csvfile:
-            reader = csv.reader(csvfile)
-            header = next(reader, [])  # 可选：读取表头
-            for row in reader:
-                entry = ", ".join(row)
-                if file_name.startswith("arxiv"):
-                    paper_entries.append(entry)
-                elif file_name.startswith("github"):
-                    code_entries.append(entry)
-                else:
-                    news_entries.append(entry)
+        with open(path, newline='', encoding='utf-8-sig') as csvfile:
+            for row in csv.DictReader(csvfile):
+                rows.append(csv_row_to_entry(file_name, row))
+    return split_by_kind(rows)
 
-    return news_entries, paper_entries, code_entries
 
-def call_gemini_sdk(news_entries, paper_entries, code_entries):
-    prompt = (
-        "你是一名专业的信息分析助手，我将提供三类数据：新闻资讯、arXiv论文、GitHub代码仓，请你逐类分析并筛选推荐内容。"
-        "最终以中文输出，不同类别请分别用markdown表格展示，表格之间换行。\n\n"
+def load_entries_from_store(date_str):
+    """只读取当天分区中生成报告需要的列；当天没有分区时返回 None"""
+    if not store.list_partitions(dates=[date_str]):
+        return None
+    rows = store.read(
+        dates=[date_str],
+        columns=["kind", "published", "title", "authors", "categories", "description", "link", "stars"],
+    )
+    return split_by_kind(rows)
 
-        "【新闻资讯】\n"
-        "- 从以下新闻中选出你认为最重要的最多5条；\n"
-        "- 输出格式：标题、推荐理由、内容概述（100字以内）、类别、链接；\n\n"
-        + "\n".join(f"- {entry}" for entry in news_entries) + "\n\n"
 
-        "【arXiv论文】\n"
-        "- 从以下论文中筛选出最多5篇（如内容极其重要可略微超过），重点关注RAG、大模型、模型优化、知名作者或机构；\n"
-        "- 输出格式：论文标题（原标题）、论文标题（中文标题）、推荐原因、论文概述（不超过100字，中文）、论文链接；\n\n"
-        + "\n".join(f"- {entry}" for entry in paper_entries) + "\n\n"
+def get_client():
+    global gemini_client
+    with _client_lock:
+        if gemini_client is None:
+            if not GEMINI_API_KEY:
+                raise EnvironmentError("请先设置 GEMINI_API_KEY 环境变量。")
+            from google import genai
 
-        "【GitHub代码】\n"
-        "- 分析以下代码仓的功能，筛选不超过5个值得推荐的项目；重点关注RAG工具、模型工具相关内容；\n"
-        "- 输出格式：趋势、项目名、Star数、推荐理由、中文简要概述、项目链接；\n\n"
-        + "\n".join(f"- {entry}" for entry in code_entries) + "\n\n"
+            # 单个请求的 HTTP 超时（毫秒），超时后的后台请求不会拖住进程退出
+            gemini_client = genai.Client(api_key=GEMINI_API_KEY, http_options={"timeout": LLM_TIMEOUT * 1000})
+    return gemini_client
 
-        "请严格按顺序输出三个模块内容，全部使用中文，格式为美观的markdown表格，每类之间换行空行。\n"
-    )
 
-    response = gemini_client.models.generate_content(
-        model=model_name,
-        contents=prompt,
-    )
+def call_model(prompt):
+    client = get_client()
+    with metrics.span("llm.call", model_name):
+        response = client.models.generate_content(
+            model=model_name,
+            contents=prompt,
+            config={"response_mime_type": "application/json"},
+        )
+    metrics.incr("llm.prompt_chars", len(prompt), model_name)
+    metrics.incr("llm.response_chars", len(response.text or ""), model_name)
     return response.text
 
-def save_report(content_md, date_str):
-    os.makedirs(REPORTS_DIR, exist_ok=True)
-    md_path = os.path.join(REPORTS_DIR, f"report_{date_str}.md")
-    html_path = os.path.join(REPORTS_DIR, f"report_{date_str}.html")
 
-    # 保存 Markdown
-    with open(md_path, "w", encoding="utf-8") as f:
-        f.write(content_md)
-    print(f"✅ Markdown 报告已保存至: {md_path}")
+def select(kind, prompt, count):
+    """带缓存地请求一次模型，返回解析后的选择结果；只缓存合法的 JSON"""
+    key = prompt_key(model_name, prompt)
+    cached = llm_cache.get(key)
+    picks = prompt_builder.parse_selection(kind, cached, count) if cached is not None else None
+    if picks is None:
+        text = call_model(prompt)
+        picks = prompt_builder.parse_selection(kind, text, count)
+        if picks is None:
+            raise ValueError("模型返回的不是合法的 JSON")
+        llm_cache.put(key, text, model_name)
+    return picks
+
+
+def select_round(kind, rows, prompts, executor):
+    """并发执行一轮 map / reduce 请求，返回选中的记录（已合并模型给出的字段）"""
+    selections = executor.map(lambda prompt: select(kind, prompt, len(rows)), prompts)
+    return [dict(rows[index], **fields) for picks in selections for index, fields in picks]
+
+
+def summarize_category(kind, rows, executor):
+    """单个类别：记录集合未变化时直接复用缓存，否则按预算拆成 map 请求并发执行，再逐层 reduce"""
+    if not rows:
+        return []
+    key = entries_key(model_name, kind, rows, prompt_builder.PROMPT_TOKEN_BUDGET,
+                      prompt_builder.MAX_FIELD_TOKENS, SELECTION_FORMAT)
+    cached = llm_cache.get(key)
+    if cached is not None:
+        print(f"♻️ {prompt_builder.CATEGORY_LABELS[kind]}：记录未变化，复用缓存结果")
+        return json.loads(cached)
+
+    prompts = prompt_builder.build_map_prompts(kind, rows)
+    print(f"🧩 {prompt_builder.CATEGORY_LABELS[kind]}：{len(rows)} 条，拆分为 {len(prompts)} 个请求")
+    picks = select_round(kind, rows, prompts, executor)
+    while len(prompts) > 1 and picks:
+        reduce_prompts = prompt_builder.build_reduce_prompts(kind, picks)
+        if len(reduce_prompts) >= len(prompts):
+            # 候选没有收敛（单条记录过长等），保留当前候选中排在前面的
+            picks = picks[:prompt_builder.MAX_PICKS]
+            break
+        prompts = reduce_prompts
+        picks = select_round(kind, picks, prompts, executor)
+    llm_cache.put(key, json.dumps(picks, ensure_ascii=False, default=str), model_name)
+    return picks
+
+
+def timed_summarize(kind, rows, executor):
+    with metrics.span("llm", kind):
+        return summarize_category(kind, rows, executor)
+
+
+def local_picks(kind, rows):
+    """模型不可用时的兜底：本地排序的前 FALLBACK_PICKS 条，概述取截断后的描述"""
+    metrics.incr("llm.fallback", 1, kind)
+    return [
+        dict(row, reason="本地排序结果（未经模型筛选）",
+             summary=prompt_builder.truncate(row.get("description") or "", 100))
+        for row in rows[:FALLBACK_PICKS]
+    ]
+
+
+def call_gemini_sdk(news_entries, paper_entries, code_entries, timeout=LLM_TIMEOUT, date_str=None):
+    """
+    三个类别并发请求模型，每个类别的结果一到就交给渲染器并发渲染各格式。
+    超过 timeout 仍未完成或调用失败的类别改用本地排序结果。返回 ReportRenderer。
+    """
+    categories = {"news": news_entries, "paper": paper_entries, "code": code_entries}
+    renderer = report_render.ReportRenderer(date_str or today_str)
+    # 类别内的 map 请求共用同一个线程池
+    executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS)
+    category_executor = ThreadPoolExecutor(max_workers=len(categories))
+    futures = {
+        category_executor.submit(timed_summarize, kind, rows, executor): kind
+        for kind, rows in categories.items() if rows
+    }
+    pending = set(futures.values())
+    try:
+        for future in as_completed(futures, timeout=timeout):
+            kind = futures[future]
+            label = prompt_builder.CATEGORY_LABELS[kind]
+            try:
+                picks = future.result()
+            except Exception as e:
+                print(f"⚠️ {label}：模型调用失败（{e}），改用本地排序结果")
+                picks = local_picks(kind, categories[kind])
+            renderer.add_section(kind, picks)
+            pending.discard(kind)
+    except FutureTimeout:
+        for kind in pending:
+            print(f"⏰ {prompt_builder.CATEGORY_LABELS[kind]}：模型 {timeout} 秒内未返回，改用本地排序结果")
+            renderer.add_section(kind, local_picks(kind, categories[kind]))
+    finally:
+        # 不等待超时的请求，未开始的请求直接取消
+        executor.shutdown(wait=False, cancel_futures=True)
+        category_executor.shutdown(wait=False, cancel_futures=True)
+    return renderer
+
+def save_report(renderer, date_str):
+    for path in renderer.write(REPORTS_DIR, f"report_{date_str}"):
+        print(f"✅ 报告已保存至: {path}")
 
-    # 保存 HTML
-    html_content = markdown(content_md)
-    with open(html_path, "w", encoding="utf-8") as f:
-        f.write(html_content)
-    print(f"✅ HTML 报告已保存至: {html_path}")
+def main(date_str=None):
+    """生成 date_str（默认 today_str）的日报"""
+    date_str = date_str or today_str
+    with metrics.span("load"):
+        entries = load_entries_from_store(date_str)
+    if entries is not None:
+        print(f"📦 从列式存储读取 {date_str} 的数据")
+        news_entries, paper_entries, code_entries = entries
+    else:
+        # 兼容旧数据：当天没有列式存储分区时退回到扫描 CSV
+        csv_files = find_csv_files(GENERATE_DOCS_DIR, date_str)
+        if not csv_files:
+            print("⚠️ 未找到任何符合日期要求的CSV文件。")
+            return
 
-def main():
-    csv_files = find_csv_files(GENERATE_DOCS_DIR, today_str)
-    if not csv_files:
-        print("⚠️ 未找到任何符合日期要求的CSV文件。")
-        return
+        print(f"📄 共找到 {len(csv_files)} 个CSV文件：\n", csv_files)
+        with metrics.span("load.csv"):
+            news_entries, paper_entries, code_entries = classify_entries_by_type(csv_files)
 
-    print(f"📄 共找到 {len(csv_files)} 个CSV文件：\n", csv_files)
-    news_entries, paper_entries, code_entries = classify_entries_by_type(csv_files)
+    # 新闻跨来源聚合近似重复的记录，论文和代码按 arXiv ID / owner/repo 精确去重，
+    # 并去掉最近几天已经报道过的；然后本地打分预筛，每类只把得分最高的候选交给模型
+    dedup_index = dedup.DedupIndex()
+    selected = []
+    for kind, rows in (("news", news_entries), ("paper", paper_entries), ("code", code_entries)):
+        metrics.incr("items.loaded", len(rows), kind)
+        collapse = dedup.collapse if kind == "news" else dedup.collapse_by_key
+        with metrics.span("dedup", kind):
+            rows = collapse(rows, date_str, dedup_index, scope=kind)
+        with metrics.span("rank", kind):
+            rows = ranking.select_top(kind, rows)
+        metrics.incr("items.selected", len(rows), kind)
+        selected.append(rows)
+    dedup_index.close()
+    news_entries, paper_entries, code_entries = selected
+    print(f"🎯 预筛后：新闻 {len(news_entries)} 条，论文 {len(paper_entries)} 篇，代码 {len(code_entries)} 个")
 
     print("🔍 正在调用 Gemini 进行内容分析...")
-    summary_md = call_gemini_sdk(news_entries, paper_entries, code_entries)
+    renderer = call_gemini_sdk(news_entries, paper_entries, code_entries, date_str=date_str)
 
-    print("💾 正在保存报告为 Markdown 和 HTML...")
-    save_report(summary_md, today_str)
+    print("💾 正在保存报告为 Markdown、HTML、JSON Feed 和 RSS...")
+    with metrics.span("save"):
+        save_report(renderer, date_str)
+    metrics.finish("report")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,62 @@
+from crawler import archive_index, github_trends, seen_index
+
+REPO = "alice/llm-agent"
+
+
+def trending(stars):
+    return {"daily": [{
+        "repository": REPO,
+        "stars": stars,
+        "description": "An LLM agent framework",
+        "url": f"https://github.com/{REPO}",
+    }]}
+
+
+def test_star_history_covers_every_trending_day(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(archive_index, "_default_index", None)
+    monkeypatch.setattr(seen_index, "_default_index", None)
+
+    written = []
+    for day, stars in (("20250601", 100), ("20250602", 250), ("20250603", 400)):
+        written.append(github_trends.save_to_csv_md(trending(stars), date_str=day))
+
+    # CSV 只追加新上榜的项目，归档索引记录每一天的快照
+    assert written == [1, 0, 0]
+    history = archive_index.get_archive().star_history(REPO)
+    assert [(row["date"], row["stars"]) for row in history] == [
+        ("20250601", 100), ("20250602", 250), ("20250603", 400),
+    ]
+
+
+def test_backfill_reads_each_partition_once(tmp_path, monkeypatch):
+    from crawler import store
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(archive_index, "_default_index", None)
+    for stars in (100, 250, 400):
+        rows = [{"项目": REPO, "描述": "An LLM agent framework", "链接": f"https://github.com/{REPO}", "Stars": stars}]
+        list(store.tee(rows, "github_trends", "code", store.github_record, "20250601"))
+    assert len(store.list_partitions()) == 3
+
+    reads = []
+    read = store.read
+    monkeypatch.setattr(store, "read", lambda **kwargs: reads.append(kwargs) or read(**kwargs))
+    # 三个 part 文件共 3 行，只读一次分区
+    assert archive_index.backfill(archive_index.ArchiveIndex(str(tmp_path / "backfill.db"))) == 3
+    assert len(reads) == 1
+
+
+def test_store_writer_flushes_index_in_batches(tmp_path, monkeypatch):
+    from crawler import store
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(archive_index, "_default_index", None)
+    writer = store.StoreWriter("qbitai", "news", "20250601", batch_size=2)
+    for i in range(5):
+        writer.add({"title": f"t{i}", "link": f"https://example.com/{i}"})
+        # 索引缓冲不超过一批，已满的批次随行组一起写入索引
+        assert len(writer._indexed) < 2
+    assert len(archive_index.get_archive().search(source="qbitai")) == 4
+    writer.close()
+    assert len(archive_index.get_archive().search(source="qbitai")) == 5
@@ -0,0 +1,28 @@
+from crawler import dedup
+
+
+def repo(name, stars):
+    return {"title": name, "description": "An LLM agent framework", "link": f"https://github.com/{name}", "stars": stars}
+
+
+def test_code_is_keyed_on_owner_repo(tmp_path):
+    index = dedup.DedupIndex(str(tmp_path / "dedup.db"))
+    rows = [repo("alice/llm-agent", 100), repo("bob/agent-llm", 50), repo("alice/llm-agent", 120)]
+    result = dedup.collapse_by_key(rows, "20250601", index, scope="code")
+    # 名字相近的不同仓库不会合并；同一仓库的多次快照保留最新的一条
+    assert [(row["title"], row["stars"]) for row in result] == [("alice/llm-agent", 120), ("bob/agent-llm", 50)]
+
+    result = dedup.collapse_by_key([repo("Alice/LLM-Agent", 130)], "20250602", index, scope="code")
+    assert result == []
+    index.close()
+
+
+def test_papers_are_keyed_on_arxiv_id(tmp_path):
+    rows = [
+        {"title": "Agents", "description": "a", "link": "http://arxiv.org/abs/2506.08000v1"},
+        {"title": "Agents", "description": "a", "link": "https://arxiv.org/abs/2506.08000"},
+        {"title": "Agents", "description": "a", "link": "https://arxiv.org/abs/2506.08001"},
+    ]
+    result = dedup.collapse_by_key(rows, "20250601", scope="paper")
+    assert [row["link"] for row in result] == ["https://arxiv.org/abs/2506.08000", "https://arxiv.org/abs/2506.08001"]
+    assert result[0]["alternate_links"] == ["http://arxiv.org/abs/2506.08000v1"]
@@ -0,0 +1,45 @@
+import hashlib
+
+from benchmarks import fixture_server
+from crawler import http_cache
+
+
+def test_fetch_records_revalidates_with_etag(tmp_path, monkeypatch):
+    monkeypatch.setattr(http_cache, "_default_cache", http_cache.HttpCache(str(tmp_path / "http")))
+    monkeypatch.setattr(fixture_server.FixtureHandler, "cache", {})
+    conditions = []
+    do_get = fixture_server.FixtureHandler.do_GET
+
+    def recording_get(handler):
+        conditions.append(handler.headers.get("If-None-Match"))
+        do_get(handler)
+
+    monkeypatch.setattr(fixture_server.FixtureHandler, "do_GET", recording_get)
+    parsed = []
+
+    def parse(content):
+        parsed.append(content)
+        return [{"size": len(content)}]
+
+    server, base = fixture_server.start_server()
+    try:
+        url = f"{base}/feed/qbitai"
+        # 第一次：完整下载并解析，记录写入缓存
+        records, not_modified = http_cache.fetch_records(url, parse)
+        assert not not_modified and len(parsed) == 1 and conditions == [None]
+
+        # 第二次：带上 ETag，304 时直接返回缓存的记录，不再解析
+        again, not_modified = http_cache.fetch_records(url, parse)
+        assert not_modified and again == records and len(parsed) == 1
+        etag = fixture_server.FixtureHandler.cache[("qbitai", 1)][1]
+        assert conditions[-1] == etag
+
+        # 内容变化：服务端 ETag 随之改变，返回 200，重新解析
+        body = b"<rss><channel></channel></rss>"
+        fixture_server.FixtureHandler.cache[("qbitai", 1)] = (body, '"%s"' % hashlib.sha1(body).hexdigest())
+        changed, not_modified = http_cache.fetch_records(url, parse)
+        assert not not_modified and len(parsed) == 2
+        assert changed == [{"size": len(body)}]
+        assert http_cache.fetch_records(url, parse) == (changed, True) and len(parsed) == 2
+    finally:
+        server.shutdown()
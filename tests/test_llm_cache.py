@@ -0,0 +1,83 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import generate_daily_report as report
+from crawler.llm_cache import LLMCache
+
+ROWS = [
+    {"title": "alice/llm-agent", "description": "An LLM agent framework", "link": "https://github.com/alice/llm-agent", "stars": 100},
+    {"title": "bob/rag-kit", "description": "RAG toolkit", "link": "https://github.com/bob/rag-kit", "stars": 50},
+]
+
+
+class FakeClient:
+    """只实现 client.models.generate_content，记录每次请求的模型和提示词"""
+
+    def __init__(self):
+        self.calls = []
+        self.models = self
+
+    def generate_content(self, model, contents, config=None):
+        self.calls.append((model, contents))
+        text = json.dumps({"items": [{"id": 1, "reason": "相关", "summary": "概述"}]}, ensure_ascii=False)
+        return type("Response", (), {"text": text})()
+
+
+def setup(tmp_path, monkeypatch):
+    client = FakeClient()
+    cache = LLMCache(str(tmp_path / "llm"))
+    monkeypatch.setattr(report, "get_client", lambda: client)
+    monkeypatch.setattr(report, "llm_cache", cache)
+    return client, cache
+
+
+def test_select_hits_cache_until_prompt_or_model_changes(tmp_path, monkeypatch):
+    client, cache = setup(tmp_path, monkeypatch)
+
+    first = report.select("code", "选出最值得关注的项目\n1. alice/llm-agent", 2)
+    second = report.select("code", "选出最值得关注的项目\n1. alice/llm-agent", 2)
+    assert first == second
+    assert len(client.calls) == 1 and cache.hits == 1
+
+    report.select("code", "选出最值得关注的项目\n1. bob/rag-kit", 2)
+    assert len(client.calls) == 2
+
+    monkeypatch.setattr(report, "model_name", "another-model")
+    report.select("code", "选出最值得关注的项目\n1. alice/llm-agent", 2)
+    assert len(client.calls) == 3
+    assert client.calls[-1][0] == "another-model"
+
+
+def test_summarize_category_reuses_unchanged_rows(tmp_path, monkeypatch):
+    client, cache = setup(tmp_path, monkeypatch)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first = report.summarize_category("code", ROWS, executor)
+        calls = len(client.calls)
+        second = report.summarize_category("code", ROWS, executor)
+        assert calls >= 1 and len(client.calls) == calls
+        assert second == first
+
+        # 记录变化后重新请求模型
+        report.summarize_category("code", ROWS[:1], executor)
+        assert len(client.calls) > calls
+
+
+def test_eviction_by_age_and_size(tmp_path):
+    cache = LLMCache(str(tmp_path / "llm"), max_age=60, max_bytes=10 ** 6)
+    cache.put("old", "x")
+    past = os.path.getmtime(cache._path("old")) - 120
+    os.utime(cache._path("old"), (past, past))
+    assert cache.get("old") is None
+    assert not os.path.exists(cache._path("old"))
+
+    # 不按时间过期，只按总大小淘汰：每条约 150 字节，上限只容得下两条
+    cache = LLMCache(str(tmp_path / "small"), max_age=10 ** 10, max_bytes=350)
+    for i, key in enumerate(("a", "b")):
+        cache.put(key, "x" * 100)
+        os.utime(cache._path(key), (1000 + i, 1000 + i))
+    # 读取 a 刷新它的最近使用时间，写入 c 超出上限时淘汰最久未使用的 b
+    assert cache.get("a") == "x" * 100
+    cache.put("c", "x" * 100)
+    remaining = sorted(name for name in os.listdir(cache.cache_dir) if name.endswith(".json"))
+    assert remaining == ["a.json", "c.json"]